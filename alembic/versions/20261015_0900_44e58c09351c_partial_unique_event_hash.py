@@ -0,0 +1,76 @@
+"""make event_hash unique indexes partial
+
+Revision ID: 44e58c09351c
+Revises: da69304d8106
+Create Date: 2026-10-15 09:00:00.000000+00:00
+
+Replaces the ``uq_<table>_event_hash`` unique constraints on the four event
+tables with partial unique indexes ``WHERE event_hash IS NOT NULL``. Rows
+without a hash no longer occupy index entries, and real hashes remain
+unique for deduplication. Both SQLite and Postgres support partial indexes.
+
+On Postgres the indexes are built with ``CREATE INDEX CONCURRENTLY`` so the
+collector can keep writing to these (large, hot) tables during the upgrade.
+Any leftover non-unique ``ix_<table>_event_hash`` index from migration 003 is
+dropped so only the unique index is maintained on insert.
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "44e58c09351c"
+down_revision: Union[str, None] = "da69304d8106"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+EVENT_TABLES = ("messages", "advertisements", "trace_paths", "telemetry")
+
+
+def upgrade() -> None:
+    predicate = sa.text("event_hash IS NOT NULL")
+
+    # The unique index fully covers event_hash lookups; make sure no plain
+    # ix_<table>_event_hash from migration 003 survives alongside it and adds
+    # a second index write to every insert.
+    for table in EVENT_TABLES:
+        op.drop_index(f"ix_{table}_event_hash", table_name=table, if_exists=True)
+
+    if op.get_bind().dialect.name == "postgresql":
+        # Build the new indexes without blocking ingest writes. CONCURRENTLY
+        # cannot run inside a transaction, hence the autocommit block. The old
+        # constraints are only dropped once their replacements exist.
+        with op.get_context().autocommit_block():
+            for table in EVENT_TABLES:
+                op.create_index(
+                    f"ix_{table}_event_hash_unique",
+                    table,
+                    ["event_hash"],
+                    unique=True,
+                    postgresql_where=predicate,
+                    postgresql_concurrently=True,
+                    if_not_exists=True,
+                )
+        for table in EVENT_TABLES:
+            op.drop_constraint(f"uq_{table}_event_hash", table, type_="unique")
+        return
+
+    for table in EVENT_TABLES:
+        with op.batch_alter_table(table, schema=None) as batch_op:
+            batch_op.drop_constraint(f"uq_{table}_event_hash", type_="unique")
+        op.create_index(
+            f"ix_{table}_event_hash_unique",
+            table,
+            ["event_hash"],
+            unique=True,
+            sqlite_where=predicate,
+        )
+
+
+def downgrade() -> None:
+    for table in reversed(EVENT_TABLES):
+        op.drop_index(f"ix_{table}_event_hash_unique", table_name=table)
+        with op.batch_alter_table(table, schema=None) as batch_op:
+            batch_op.create_unique_constraint(f"uq_{table}_event_hash", ["event_hash"])
@@ -0,0 +1,35 @@
+"""add metric_snapshots
+
+Revision ID: 19480f42b023
+Revises: 44e58c09351c
+Create Date: 2026-10-15 10:00:00.000000+00:00
+
+Adds a small ``metric_snapshots`` key/value table. The collector refreshes
+the full-table counts exposed on ``/metrics`` (nodes, messages per type,
+advertisements, telemetry, trace paths) into it from a background scheduler,
+so API scrapes read one row per metric instead of scanning the event tables.
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "19480f42b023"
+down_revision: Union[str, None] = "44e58c09351c"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "metric_snapshots",
+        sa.Column("metric_name", sa.String(100), primary_key=True),
+        sa.Column("value", sa.Float, nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=False),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("metric_snapshots")
@@ -0,0 +1,49 @@
+"""index messages by (channel_idx, received_at)
+
+Revision ID: ffb98cb8d407
+Revises: 19480f42b023
+Create Date: 2026-10-15 11:00:00.000000+00:00
+
+Replaces the single-column ix_messages_channel_idx with a composite
+(channel_idx, received_at) index. The dashboard's latest-messages-per-
+channel lookups (WHERE channel_idx = ? ORDER BY received_at DESC LIMIT 5)
+and the per-channel counts can then be answered from the index alone. The
+composite index still serves every lookup by channel_idx.
+
+On Postgres the new index is built with CREATE INDEX CONCURRENTLY so
+ingest is not blocked on the (large) messages table.
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "ffb98cb8d407"
+down_revision: Union[str, None] = "19480f42b023"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name == "postgresql":
+        with op.get_context().autocommit_block():
+            op.create_index(
+                "ix_messages_channel_idx_received_at",
+                "messages",
+                ["channel_idx", "received_at"],
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+    else:
+        op.create_index(
+            "ix_messages_channel_idx_received_at",
+            "messages",
+            ["channel_idx", "received_at"],
+        )
+    op.drop_index("ix_messages_channel_idx", table_name="messages")
+
+
+def downgrade() -> None:
+    op.create_index("ix_messages_channel_idx", "messages", ["channel_idx"])
+    op.drop_index("ix_messages_channel_idx_received_at", table_name="messages")
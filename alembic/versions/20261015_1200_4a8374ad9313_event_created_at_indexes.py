@@ -0,0 +1,54 @@
+"""index event tables by created_at
+
+Revision ID: 4a8374ad9313
+Revises: ffb98cb8d407
+Create Date: 2026-10-15 12:00:00.000000+00:00
+
+Retention cleanup deletes rows with created_at < cutoff from every event
+table. Without an index on created_at each batch scans the table. Nodes
+need nothing new: cleanup_inactive_nodes filters on last_seen, which
+ix_nodes_last_seen already covers.
+
+On Postgres the indexes are built with CREATE INDEX CONCURRENTLY so ingest
+is not blocked on the (large) event tables.
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "4a8374ad9313"
+down_revision: Union[str, None] = "ffb98cb8d407"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TABLES = (
+    "advertisements",
+    "messages",
+    "telemetry",
+    "trace_paths",
+    "events_log",
+    "raw_packets",
+)
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name == "postgresql":
+        with op.get_context().autocommit_block():
+            for table in TABLES:
+                op.create_index(
+                    f"ix_{table}_created_at",
+                    table,
+                    ["created_at"],
+                    postgresql_concurrently=True,
+                    if_not_exists=True,
+                )
+    else:
+        for table in TABLES:
+            op.create_index(f"ix_{table}_created_at", table, ["created_at"])
+
+
+def downgrade() -> None:
+    for table in TABLES:
+        op.drop_index(f"ix_{table}_created_at", table_name=table)
@@ -248,8 +248,13 @@ def create_app(
 
     # Include Prometheus metrics endpoint
     if metrics_enabled:
+        from meshcore_hub.api.metrics import MetricsConfig
         from meshcore_hub.api.metrics import router as metrics_router
 
+        app.state.metrics_config = MetricsConfig(
+            cache_ttl=metrics_cache_ttl,
+            password=read_key.encode("utf-8") if read_key else None,
+        )
         app.include_router(metrics_router)
 
     # Health check endpoints
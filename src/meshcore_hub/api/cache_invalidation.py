@@ -126,7 +126,13 @@ def invalidate_dashboard(request: Request) -> None:
     ``message-activity`` use a ``key_builder`` (URL-path keys under
     ``/api/v1/dashboard``) while ``activity``, ``packet-activity``,
     ``packet-breakdown`` and ``node-count`` use endpoint-name keys under
-    ``dashboard``. Delete both prefixes to cover all of them.
+    ``dashboard``. Delete both prefixes to cover all of them, and clear this
+    worker's in-process ``/dashboard/stats`` memo.
     """
     _drop(request, "dashboard")
     _drop(request, "/api/v1/dashboard")
+
+    # /dashboard/stats also keeps a short-lived in-process memo.
+    from meshcore_hub.api.routes.dashboard import clear_stats_memo
+
+    clear_stats_memo()
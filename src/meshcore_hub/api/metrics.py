@@ -1,25 +1,37 @@
 """Prometheus metrics endpoint for MeshCore Hub API."""
 
+import asyncio
 import base64
+import hashlib
 import hmac
 import logging
+import math
 import time
-from typing import Any
+import weakref
+from datetime import datetime, timedelta, timezone
+from typing import Any, Iterable, NamedTuple
 
 from fastapi import APIRouter, Request, Response
 from fastapi.responses import PlainTextResponse
-from prometheus_client import CollectorRegistry, Gauge, generate_latest
-from sqlalchemy import func, select
-
+from sqlalchemy import case, func, inspect, select
+from sqlalchemy.engine import Engine
+
+from meshcore_hub import __version__
+from meshcore_hub.api.cache import _etag_matches
+from meshcore_hub.collector.metric_snapshots import (
+    MESSAGES_TOTAL_PREFIX,
+    SNAPSHOT_MAX_AGE_SECONDS,
+    count_metric_totals,
+)
+from meshcore_hub.collector.routes import effective_clear_threshold
 from meshcore_hub.common.models import (
     Advertisement,
     EventLog,
     Message,
+    MetricSnapshot,
     Node,
     Route,
     RouteResult,
-    Telemetry,
-    TracePath,
     UserProfile,
     UserProfileNode,
 )
@@ -28,11 +40,63 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+# Rolling windows reported by the windowed gauges, as (label, hours)
+WINDOWS: tuple[tuple[str, int], ...] = (
+    ("1h", 1),
+    ("24h", 24),
+    ("7d", 168),
+    ("30d", 720),
+)
+
+# Numeric encoding of route quality bands for meshcore_route_quality
+_QUALITY_VALUES = {
+    "clear": 0,
+    "marginal": 1,
+    "failing": 2,
+    "unknown": 3,
+}
+
+# Rows fetched per batch when streaming the per-node last-seen series
+_NODE_BATCH_SIZE = 1000
+
+# Escapes for label values in the text exposition format
+_LABEL_ESCAPES = str.maketrans({"\\": "\\\\", "\n": "\\n", '"': '\\"'})
+
+# Prometheus text exposition content type
+_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
 # Module-level cache
-_cache: dict[str, Any] = {"output": b"", "expires_at": 0.0}
+_cache: dict[str, Any] = {"output": b"", "etag": "", "expires_at": 0.0}
+
+# Engines known to have the metric_snapshots table. Only positive results are
+# remembered, so a migration applied while the API runs is still picked up.
+_snapshot_table_engines: "weakref.WeakSet[Engine]" = weakref.WeakSet()
 
+# Serialises cache refreshes so only one scrape hits the database at a time.
+# Created per event loop by _get_refresh_lock(): an asyncio.Lock binds to the
+# loop that first waits on it, and the app may be served from several loops
+# over its lifetime (test clients, restarts).
+_refresh_lock_state: dict[str, Any] = {"loop": None, "lock": None}
 
-def verify_basic_auth(request: Request) -> bool:
+
+def _get_refresh_lock() -> asyncio.Lock:
+    """Return the refresh lock for the running event loop."""
+    loop = asyncio.get_running_loop()
+    if _refresh_lock_state["loop"] is not loop:
+        _refresh_lock_state["loop"] = loop
+        _refresh_lock_state["lock"] = asyncio.Lock()
+    lock: asyncio.Lock = _refresh_lock_state["lock"]
+    return lock
+
+
+class MetricsConfig(NamedTuple):
+    """Settings for the metrics endpoint, bound to ``app.state`` at startup."""
+
+    cache_ttl: int
+    password: bytes | None  # Encoded read key; None means public access
+
+
+def verify_basic_auth(request: Request, password: bytes | None) -> bool:
     """Verify HTTP Basic Auth credentials for metrics endpoint.
 
     Uses username 'metrics' and the API read key as password.
@@ -40,14 +104,13 @@ def verify_basic_auth(request: Request) -> bool:
 
     Args:
         request: FastAPI request
+        password: Expected password (the encoded read key), or None
 
     Returns:
         True if authentication passes
     """
-    read_key = getattr(request.app.state, "read_key", None)
-
     # No read key configured = public access
-    if not read_key:
+    if not password:
         return True
 
     auth_header = request.headers.get("Authorization", "")
@@ -55,19 +118,124 @@ def verify_basic_auth(request: Request) -> bool:
         return False
 
     try:
-        decoded = base64.b64decode(auth_header[6:]).decode("utf-8")
-        username, password = decoded.split(":", 1)
-        return hmac.compare_digest(username, "metrics") and hmac.compare_digest(
-            password, read_key
-        )
-    except Exception:
+        decoded = base64.b64decode(auth_header[6:], validate=True)
+    except ValueError:
         return False
 
+    username, sep, supplied = decoded.partition(b":")
+    if not sep:
+        return False
+
+    # Compare both fields as bytes (compare_digest rejects non-ASCII str) and
+    # without short-circuiting, so timing does not reveal which one failed.
+    username_ok = hmac.compare_digest(username, b"metrics")
+    password_ok = hmac.compare_digest(supplied, password)
+    return username_ok and password_ok
+
+
+def _format_value(value: float) -> str:
+    """Format a sample value for the Prometheus text format.
+
+    Finite values use ``repr`` of the float (``1.0``, ``1749988800.0``);
+    this differs from ``prometheus_client`` for large values
+    (``1.7499888e+09``) but both are valid. Non-finite values use the
+    exposition spellings ``NaN``, ``+Inf`` and ``-Inf``.
+    """
+    value = float(value)
+    if math.isnan(value):
+        return "NaN"
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(value)
+
+
+def _emit(
+    buf: bytearray,
+    name: str,
+    help_text: str,
+    samples: Iterable[tuple[tuple[Any, ...], float]],
+    labels: tuple[str, ...] = (),
+) -> None:
+    """Append one gauge family in Prometheus text exposition format.
+
+    Label pairs are written in sorted label-name order to match the output of
+    ``prometheus_client.generate_latest``.
+
+    Args:
+        buf: Output buffer to append to
+        name: Metric name
+        help_text: HELP text (must not contain backslashes or newlines)
+        samples: ``(label_values, value)`` pairs, label values in ``labels`` order
+        labels: Label names for the family
+    """
+    buf += f"# HELP {name} {help_text}\n# TYPE {name} gauge\n".encode()
+    if not labels:
+        for _, value in samples:
+            buf += f"{name} {_format_value(value)}\n".encode()
+        return
+
+    order = sorted(range(len(labels)), key=labels.__getitem__)
+    for values, value in samples:
+        pairs = ",".join(
+            f'{labels[i]}="{str(values[i]).translate(_LABEL_ESCAPES)}"' for i in order
+        )
+        buf += f"{name}{{{pairs}}} {_format_value(value)}\n".encode()
+
+
+# The info gauge only carries the package version, so render it once at import
+# and seed every scrape's buffer with it.
+_INFO_BLOCK = bytearray()
+_emit(
+    _INFO_BLOCK,
+    "meshcore_info",
+    "MeshCore Hub application info",
+    [((__version__,), 1)],
+    ("version",),
+)
+
+
+def _read_metric_totals(session: Any) -> dict[str, float]:
+    """Return the full-table totals, preferring the collector's snapshots.
+
+    The collector refreshes ``metric_snapshots`` on its own tick. Before the
+    migration creating the table is applied, before the first refresh, and
+    once the newest row is older than ``SNAPSHOT_MAX_AGE_SECONDS`` (collector
+    stopped or refresh disabled), the totals are counted directly.
+
+    Args:
+        session: SQLAlchemy database session
+
+    Returns:
+        Mapping of snapshot metric name to value
+    """
+    engine = session.get_bind().engine
+    if engine not in _snapshot_table_engines:
+        if not inspect(session.connection()).has_table(MetricSnapshot.__tablename__):
+            return count_metric_totals(session)
+        _snapshot_table_engines.add(engine)
+
+    rows = session.execute(
+        select(
+            MetricSnapshot.metric_name,
+            MetricSnapshot.value,
+            MetricSnapshot.updated_at,
+        )
+    ).all()
+    if rows:
+        newest = max(row.updated_at for row in rows)
+        if newest.tzinfo is None:
+            newest = newest.replace(tzinfo=timezone.utc)
+        max_age = timedelta(seconds=SNAPSHOT_MAX_AGE_SECONDS)
+        if datetime.now(timezone.utc) - newest <= max_age:
+            return {row.metric_name: row.value for row in rows}
+    return count_metric_totals(session)
+
 
 def collect_metrics(session: Any) -> bytes:
     """Collect all metrics from the database and generate Prometheus output.
 
-    Creates a fresh CollectorRegistry per call to avoid global state issues.
+    Samples are serialised straight into a byte buffer from query results;
+    the ``prometheus_client`` metric objects and formatter are not used.
 
     Args:
         session: SQLAlchemy database session
@@ -75,67 +243,56 @@ def collect_metrics(session: Any) -> bytes:
     Returns:
         Prometheus text exposition format as bytes
     """
-    from meshcore_hub import __version__
+    buf = bytearray(_INFO_BLOCK)
 
-    registry = CollectorRegistry()
+    # Window cutoffs are computed once so every windowed aggregate below can
+    # bucket rows with conditional counts in a single scan.
+    now = time.time()
+    cutoffs = {
+        window: datetime.fromtimestamp(now - (hours * 3600), tz=timezone.utc)
+        for window, hours in WINDOWS
+    }
 
-    # -- Info gauge --
-    info_gauge = Gauge(
-        "meshcore_info",
-        "MeshCore Hub application info",
-        ["version"],
-        registry=registry,
-    )
-    info_gauge.labels(version=__version__).set(1)
+    totals = _read_metric_totals(session)
 
     # -- Nodes total --
-    nodes_total = Gauge(
+    _emit(
+        buf,
         "meshcore_nodes_total",
         "Total number of nodes",
-        registry=registry,
+        [((), totals.get("nodes_total", 0))],
     )
-    count = session.execute(select(func.count(Node.id))).scalar() or 0
-    nodes_total.set(count)
 
     # -- Nodes active by time window --
-    nodes_active = Gauge(
+    active_row = session.execute(
+        select(
+            *(
+                func.sum(case((Node.last_seen >= cutoff_dt, 1), else_=0))
+                for cutoff_dt in cutoffs.values()
+            )
+        ).where(Node.last_seen >= cutoffs["30d"])
+    ).one()
+    _emit(
+        buf,
         "meshcore_nodes_active",
         "Number of active nodes in time window",
-        ["window"],
-        registry=registry,
+        (((window,), count or 0) for window, count in zip(cutoffs, active_row)),
+        ("window",),
     )
-    for window, hours in [("1h", 1), ("24h", 24), ("7d", 168), ("30d", 720)]:
-        cutoff = time.time() - (hours * 3600)
-        from datetime import datetime, timezone
-
-        cutoff_dt = datetime.fromtimestamp(cutoff, tz=timezone.utc)
-        count = (
-            session.execute(
-                select(func.count(Node.id)).where(Node.last_seen >= cutoff_dt)
-            ).scalar()
-            or 0
-        )
-        nodes_active.labels(window=window).set(count)
 
     # -- Nodes by type --
-    nodes_by_type = Gauge(
-        "meshcore_nodes_by_type",
-        "Number of nodes by advertisement type",
-        ["adv_type"],
-        registry=registry,
-    )
     type_counts = session.execute(
         select(Node.adv_type, func.count(Node.id)).group_by(Node.adv_type)
     ).all()
-    for adv_type, count in type_counts:
-        nodes_by_type.labels(adv_type=adv_type or "unknown").set(count)
+    _emit(
+        buf,
+        "meshcore_nodes_by_type",
+        "Number of nodes by advertisement type",
+        (((adv_type or "unknown",), count) for adv_type, count in type_counts),
+        ("adv_type",),
+    )
 
     # -- Nodes with location --
-    nodes_with_location = Gauge(
-        "meshcore_nodes_with_location",
-        "Number of nodes with GPS coordinates",
-        registry=registry,
-    )
     count = (
         session.execute(
             select(func.count(Node.id)).where(
@@ -144,26 +301,25 @@ def collect_metrics(session: Any) -> bytes:
         ).scalar()
         or 0
     )
-    nodes_with_location.set(count)
+    _emit(
+        buf,
+        "meshcore_nodes_with_location",
+        "Number of nodes with GPS coordinates",
+        [((), count)],
+    )
 
     # -- Nodes adopted --
-    nodes_adopted = Gauge(
+    count = session.execute(select(func.count(UserProfileNode.node_id))).scalar() or 0
+    _emit(
+        buf,
         "meshcore_nodes_adopted",
         "Number of adopted nodes (nodes with an adoption record)",
-        registry=registry,
+        [((), count)],
     )
-    adopted_count = (
-        session.execute(select(func.count(UserProfileNode.node_id))).scalar() or 0
-    )
-    nodes_adopted.set(adopted_count)
 
     # -- Node last seen timestamp --
-    node_last_seen = Gauge(
-        "meshcore_node_last_seen_timestamp_seconds",
-        "Unix timestamp of when the node was last seen",
-        ["public_key", "node_name", "adv_type", "adopted"],
-        registry=registry,
-    )
+    # One series per node: stream the rows in batches rather than
+    # materialising the whole node table for every scrape.
     adopted_subq = select(UserProfileNode.node_id).subquery()
     nodes_with_last_seen = session.execute(
         select(
@@ -175,126 +331,133 @@ def collect_metrics(session: Any) -> bytes:
         )
         .outerjoin(adopted_subq, Node.id == adopted_subq.c.node_id)
         .where(Node.last_seen.isnot(None))
-    ).all()
-    for public_key, name, adv_type, last_seen, is_adopted in nodes_with_last_seen:
-        node_last_seen.labels(
-            public_key=public_key,
-            node_name=name or "",
-            adv_type=adv_type or "unknown",
-            adopted="true" if is_adopted else "false",
-        ).set(last_seen.timestamp())
+        .execution_options(yield_per=_NODE_BATCH_SIZE)
+    )
+    _emit(
+        buf,
+        "meshcore_node_last_seen_timestamp_seconds",
+        "Unix timestamp of when the node was last seen",
+        (
+            (
+                (
+                    public_key,
+                    name or "",
+                    adv_type or "unknown",
+                    "true" if is_adopted else "false",
+                ),
+                last_seen.timestamp(),
+            )
+            for public_key, name, adv_type, last_seen, is_adopted in (
+                nodes_with_last_seen
+            )
+        ),
+        ("public_key", "node_name", "adv_type", "adopted"),
+    )
 
     # -- Messages total by type --
-    messages_total = Gauge(
+    _emit(
+        buf,
         "meshcore_messages_total",
         "Total number of messages by type",
-        ["type"],
-        registry=registry,
+        (
+            ((name.removeprefix(MESSAGES_TOTAL_PREFIX),), value)
+            for name, value in sorted(totals.items())
+            if name.startswith(MESSAGES_TOTAL_PREFIX)
+        ),
+        ("type",),
     )
-    msg_type_counts = session.execute(
-        select(Message.message_type, func.count(Message.id)).group_by(
-            Message.message_type
-        )
-    ).all()
-    for msg_type, count in msg_type_counts:
-        messages_total.labels(type=msg_type).set(count)
 
     # -- Messages received by type and window --
-    messages_received = Gauge(
+    window_rows = session.execute(
+        select(
+            Message.message_type,
+            *(
+                func.sum(case((Message.received_at >= cutoff_dt, 1), else_=0))
+                for cutoff_dt in cutoffs.values()
+            ),
+        )
+        .where(Message.received_at >= cutoffs["30d"])
+        .group_by(Message.message_type)
+    ).all()
+    _emit(
+        buf,
         "meshcore_messages_received",
         "Messages received in time window by type",
-        ["type", "window"],
-        registry=registry,
+        (
+            ((msg_type, window), count)
+            for msg_type, *counts in window_rows
+            for window, count in zip(cutoffs, counts)
+            if count
+        ),
+        ("type", "window"),
     )
-    for window, hours in [("1h", 1), ("24h", 24), ("7d", 168), ("30d", 720)]:
-        cutoff = time.time() - (hours * 3600)
-        cutoff_dt = datetime.fromtimestamp(cutoff, tz=timezone.utc)
-        window_counts = session.execute(
-            select(Message.message_type, func.count(Message.id))
-            .where(Message.received_at >= cutoff_dt)
-            .group_by(Message.message_type)
-        ).all()
-        for msg_type, count in window_counts:
-            messages_received.labels(type=msg_type, window=window).set(count)
 
     # -- Advertisements total --
-    advertisements_total = Gauge(
+    _emit(
+        buf,
         "meshcore_advertisements_total",
         "Total number of advertisements",
-        registry=registry,
+        [((), totals.get("advertisements_total", 0))],
     )
-    count = session.execute(select(func.count(Advertisement.id))).scalar() or 0
-    advertisements_total.set(count)
 
     # -- Advertisements received by window --
-    advertisements_received = Gauge(
+    adv_row = session.execute(
+        select(
+            *(
+                func.sum(case((Advertisement.received_at >= cutoff_dt, 1), else_=0))
+                for cutoff_dt in cutoffs.values()
+            )
+        ).where(Advertisement.received_at >= cutoffs["30d"])
+    ).one()
+    _emit(
+        buf,
         "meshcore_advertisements_received",
         "Advertisements received in time window",
-        ["window"],
-        registry=registry,
+        (((window,), count or 0) for window, count in zip(cutoffs, adv_row)),
+        ("window",),
     )
-    for window, hours in [("1h", 1), ("24h", 24), ("7d", 168), ("30d", 720)]:
-        cutoff = time.time() - (hours * 3600)
-        cutoff_dt = datetime.fromtimestamp(cutoff, tz=timezone.utc)
-        count = (
-            session.execute(
-                select(func.count(Advertisement.id)).where(
-                    Advertisement.received_at >= cutoff_dt
-                )
-            ).scalar()
-            or 0
-        )
-        advertisements_received.labels(window=window).set(count)
 
     # -- Telemetry total --
-    telemetry_total = Gauge(
+    _emit(
+        buf,
         "meshcore_telemetry_total",
         "Total number of telemetry records",
-        registry=registry,
+        [((), totals.get("telemetry_total", 0))],
     )
-    count = session.execute(select(func.count(Telemetry.id))).scalar() or 0
-    telemetry_total.set(count)
 
     # -- Trace paths total --
-    trace_paths_total = Gauge(
+    _emit(
+        buf,
         "meshcore_trace_paths_total",
         "Total number of trace path records",
-        registry=registry,
+        [((), totals.get("trace_paths_total", 0))],
     )
-    count = session.execute(select(func.count(TracePath.id))).scalar() or 0
-    trace_paths_total.set(count)
 
     # -- Events by type --
-    events_total = Gauge(
-        "meshcore_events_total",
-        "Total events by type from event log",
-        ["event_type"],
-        registry=registry,
-    )
     event_counts = session.execute(
         select(EventLog.event_type, func.count(EventLog.id)).group_by(
             EventLog.event_type
         )
     ).all()
-    for event_type, count in event_counts:
-        events_total.labels(event_type=event_type).set(count)
+    _emit(
+        buf,
+        "meshcore_events_total",
+        "Total events by type from event log",
+        (((event_type,), count) for event_type, count in event_counts),
+        ("event_type",),
+    )
 
     # -- User profiles total --
-    user_profiles_total = Gauge(
+    count = session.execute(select(func.count(UserProfile.id))).scalar() or 0
+    _emit(
+        buf,
         "meshcore_user_profiles_total",
         "Total number of user profiles",
-        registry=registry,
+        [((), count)],
     )
-    count = session.execute(select(func.count(UserProfile.id))).scalar() or 0
-    user_profiles_total.set(count)
 
     # -- User profiles by role --
-    user_profiles_by_role = Gauge(
-        "meshcore_user_profiles_by_role",
-        "Number of user profiles by role",
-        ["role"],
-        registry=registry,
-    )
+    role_counts: dict[str, int] = {}
     role_rows = session.execute(
         select(UserProfile.roles, func.count(UserProfile.id)).group_by(
             UserProfile.roles
@@ -304,8 +467,8 @@ def collect_metrics(session: Any) -> bytes:
         if row_roles:
             for role in row_roles.split(","):
                 role = role.strip()
-                if role:
-                    role_count = (
+                if role and role not in role_counts:
+                    role_counts[role] = (
                         session.execute(
                             select(func.count(UserProfile.id)).where(
                                 UserProfile.roles.contains(role)
@@ -313,65 +476,103 @@ def collect_metrics(session: Any) -> bytes:
                         ).scalar()
                         or 0
                     )
-                    user_profiles_by_role.labels(role=role).set(role_count)
+    _emit(
+        buf,
+        "meshcore_user_profiles_by_role",
+        "Number of user profiles by role",
+        (((role,), role_count) for role, role_count in role_counts.items()),
+        ("role",),
+    )
 
     # -- Route health metrics --
-    _QUALITY_VALUES = {
-        "clear": 0,
-        "marginal": 1,
-        "failing": 2,
-        "unknown": 3,
-    }
-    route_healthy = Gauge(
+    route_rows = session.execute(
+        select(Route, RouteResult)
+        .outerjoin(RouteResult, RouteResult.route_id == Route.id)
+        .where(Route.enabled.is_(True))
+    ).all()
+    routes = [
+        (
+            (f"{route.from_label} -> {route.to_label}",),
+            route,
+            result,
+            result.quality if result else "unknown",
+        )
+        for route, result in route_rows
+    ]
+    _emit(
+        buf,
         "meshcore_route_healthy",
         "1 if route quality is clear or marginal, else 0",
-        ["route"],
-        registry=registry,
+        (
+            (name, 1 if quality in ("clear", "marginal") else 0)
+            for name, _, _, quality in routes
+        ),
+        ("route",),
     )
-    route_quality = Gauge(
+    _emit(
+        buf,
         "meshcore_route_quality",
         "Route quality band (0=clear, 1=marginal, 2=failing, 3=unknown)",
-        ["route"],
-        registry=registry,
+        ((name, _QUALITY_VALUES.get(quality, 3)) for name, _, _, quality in routes),
+        ("route",),
     )
-    route_matched = Gauge(
+    _emit(
+        buf,
         "meshcore_route_matched_packets",
         "Distinct matched packets in window (lower bound when clear)",
-        ["route"],
-        registry=registry,
+        (
+            (name, result.matched_count if result else 0)
+            for name, _, result, _ in routes
+        ),
+        ("route",),
     )
-    route_threshold = Gauge(
+    _emit(
+        buf,
         "meshcore_route_threshold",
         "Route packet count threshold",
-        ["route"],
-        registry=registry,
+        ((name, route.packet_count_threshold) for name, route, _, _ in routes),
+        ("route",),
     )
-    route_clear = Gauge(
+    _emit(
+        buf,
         "meshcore_route_clear_threshold",
         "Effective clear threshold (3x threshold when unset)",
-        ["route"],
-        registry=registry,
+        ((name, effective_clear_threshold(route)) for name, route, _, _ in routes),
+        ("route",),
     )
-    route_rows = session.execute(
-        select(Route, RouteResult)
-        .outerjoin(RouteResult, RouteResult.route_id == Route.id)
-        .where(Route.enabled.is_(True))
-    ).all()
-    for route, result in route_rows:
-        name = f"{route.from_label} -> {route.to_label}"
-        quality_str = result.quality if result else "unknown"
-        route_healthy.labels(route=name).set(
-            1 if quality_str in ("clear", "marginal") else 0
-        )
-        route_quality.labels(route=name).set(_QUALITY_VALUES.get(quality_str, 3))
-        route_matched.labels(route=name).set(result.matched_count if result else 0)
-        route_threshold.labels(route=name).set(route.packet_count_threshold)
-        from meshcore_hub.collector.routes import effective_clear_threshold
 
-        route_clear.labels(route=name).set(effective_clear_threshold(route))
+    return bytes(buf)
 
-    output: bytes = generate_latest(registry)
-    return output
+
+def _collect_sync(db_manager: Any) -> bytes:
+    """Open a session and collect metrics (runs in a worker thread).
+
+    Args:
+        db_manager: Database manager providing ``session_scope()``
+
+    Returns:
+        Prometheus text exposition format as bytes
+    """
+    with db_manager.session_scope() as session:
+        return collect_metrics(session)
+
+
+def _cached_response(request: Request) -> Response:
+    """Return the cached output, or 304 if the client already holds it.
+
+    Args:
+        request: FastAPI request (checked for ``If-None-Match``)
+
+    Returns:
+        200 response with the cached body, or an empty 304; both carry the ETag
+    """
+    etag = _cache["etag"]
+    if_none_match = request.headers.get("If-None-Match")
+    if if_none_match and _etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers={"ETag": etag})
+    return Response(
+        content=_cache["output"], media_type=_CONTENT_TYPE, headers={"ETag": etag}
+    )
 
 
 @router.get("/metrics")
@@ -382,8 +583,10 @@ async def metrics(request: Request) -> Response:
     Supports HTTP Basic Auth with username 'metrics' and API read key as password.
     Results are cached with a configurable TTL to reduce database load.
     """
+    config: MetricsConfig = request.app.state.metrics_config
+
     # Check authentication
-    if not verify_basic_auth(request):
+    if not verify_basic_auth(request, config.password):
         return PlainTextResponse(
             "Unauthorized",
             status_code=401,
@@ -391,35 +594,47 @@ async def metrics(request: Request) -> Response:
         )
 
     # Check cache
-    cache_ttl = getattr(request.app.state, "metrics_cache_ttl", 60)
+    cache_ttl = config.cache_ttl
     now = time.time()
 
     if _cache["output"] and now < _cache["expires_at"]:
-        return Response(
-            content=_cache["output"],
-            media_type="text/plain; version=0.0.4; charset=utf-8",
-        )
-
-    # Collect fresh metrics
-    try:
-        from meshcore_hub.api.app import get_db_manager
-
-        db_manager = get_db_manager()
-        with db_manager.session_scope() as session:
-            output = collect_metrics(session)
-
-        # Update cache
-        _cache["output"] = output
-        _cache["expires_at"] = now + cache_ttl
-
-        return Response(
-            content=output,
-            media_type="text/plain; version=0.0.4; charset=utf-8",
-        )
-    except Exception as e:
-        logger.exception("Failed to collect metrics: %s", e)
-        return PlainTextResponse(
-            f"# Error collecting metrics: {e}\n",
-            status_code=500,
-            media_type="text/plain; version=0.0.4; charset=utf-8",
-        )
+        return _cached_response(request)
+
+    # Single-flight refresh: while one request is collecting, serve output
+    # that expired less than one TTL ago instead of queueing every concurrent
+    # scrape onto the database.
+    refresh_lock = _get_refresh_lock()
+    if (
+        refresh_lock.locked()
+        and _cache["output"]
+        and now < _cache["expires_at"] + cache_ttl
+    ):
+        return _cached_response(request)
+
+    async with refresh_lock:
+        # Another request may have refreshed the cache while we waited
+        now = time.time()
+        if _cache["output"] and now < _cache["expires_at"]:
+            return _cached_response(request)
+
+        # Collect fresh metrics
+        try:
+            from meshcore_hub.api.app import get_db_manager
+
+            # The queries are synchronous; run them on the thread pool so a
+            # slow scrape does not stall other requests on the event loop.
+            output = await asyncio.to_thread(_collect_sync, get_db_manager())
+
+            # Update cache
+            _cache["output"] = output
+            _cache["etag"] = f'"{hashlib.blake2b(output, digest_size=16).hexdigest()}"'
+            _cache["expires_at"] = now + cache_ttl
+
+            return _cached_response(request)
+        except Exception as e:
+            logger.exception("Failed to collect metrics: %s", e)
+            return PlainTextResponse(
+                f"# Error collecting metrics: {e}\n",
+                status_code=500,
+                media_type=_CONTENT_TYPE,
+            )
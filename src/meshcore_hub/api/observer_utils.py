@@ -2,7 +2,7 @@
 
 from collections.abc import Iterable
 
-from sqlalchemy import ColumnElement, or_, select
+from sqlalchemy import ColumnElement, and_, or_, select
 from sqlalchemy.sql.expression import SQLColumnExpression
 
 from meshcore_hub.api.dependencies import DbSession
@@ -37,6 +37,35 @@ def observed_by_filter_clause(
     )
 
 
+def fetch_tag_values(
+    session: DbSession,
+    node_ids: Iterable[str],
+    key: str = "name",
+) -> dict[str, str]:
+    """Fetch a single tag's value for each of the given nodes.
+
+    Only the matching tag rows are loaded (served by the unique
+    ``(node_id, key)`` index), rather than every tag of every node.
+
+    Args:
+        session: Database session
+        node_ids: Node IDs to look up
+        key: Tag key to fetch
+
+    Returns:
+        Mapping of node ID to tag value, for nodes that have the tag
+    """
+    node_ids = list(node_ids)
+    if not node_ids:
+        return {}
+    rows = session.execute(
+        select(NodeTag.node_id, NodeTag.value).where(
+            NodeTag.node_id.in_(node_ids), NodeTag.key == key
+        )
+    ).all()
+    return {node_id: value for node_id, value in rows if value is not None}
+
+
 def fetch_observers_for_events(
     session: DbSession,
     event_type: str,
@@ -75,23 +104,14 @@ def fetch_observers_for_events(
 
     observers_by_hash: dict[str, list[ObserverInfo]] = {}
 
-    node_ids = [r.node_id for r in results]
-    tag_names: dict[str, str] = {}
-    if node_ids:
-        tag_query = (
-            select(NodeTag.node_id, NodeTag.value)
-            .where(NodeTag.node_id.in_(node_ids))
-            .where(NodeTag.key == "name")
-        )
-        for node_id, value in session.execute(tag_query).all():
-            tag_names[node_id] = value
+    tag_names = fetch_tag_values(session, {r.node_id for r in results})
 
     for row in results:
         if row.event_hash not in observers_by_hash:
             observers_by_hash[row.event_hash] = []
 
         observers_by_hash[row.event_hash].append(
-            ObserverInfo(
+            ObserverInfo.model_construct(
                 node_id=row.node_id,
                 public_key=row.public_key,
                 name=row.name,
@@ -105,6 +125,35 @@ def fetch_observers_for_events(
     return observers_by_hash
 
 
+_HEX_DIGITS = "0123456789abcdef"
+
+
+def _prefix_upper_bound(prefix: str) -> str | None:
+    """Return the exclusive upper bound of keys starting with ``prefix``.
+
+    Lower-case hex digits step to their hex successor (``9`` -> ``a``) and a
+    trailing ``f`` carries into the previous character, so the bound never
+    relies on punctuation such as ``:`` sorting between digits and letters.
+    Other characters are bumped by code point.
+
+    Args:
+        prefix: Lower-cased key prefix
+
+    Returns:
+        Upper bound string, or None if no bound exists (e.g. ``"fff"``)
+    """
+    chars = list(prefix)
+    while chars:
+        last = chars.pop()
+        if last == "f":
+            continue
+        index = _HEX_DIGITS.find(last)
+        if index >= 0:
+            return "".join(chars) + _HEX_DIGITS[index + 1]
+        return "".join(chars) + chr(ord(last) + 1)
+    return None
+
+
 def resolve_sender_names(
     session: DbSession,
     prefixes: Iterable[str],
@@ -112,12 +161,13 @@ def resolve_sender_names(
     """Resolve sender pubkey prefixes to node names and name-tag values.
 
     Messages store a leading slice of the sender's public key
-    (``pubkey_prefix``). This looks up the matching nodes and returns two
-    dicts, each keyed by the 12-char prefix: one of node names and one of
-    "name" tag values.
+    (``pubkey_prefix``, 8-12 hex characters, sometimes upper-case). This
+    looks up the matching nodes and returns two dicts, each keyed by the
+    prefix exactly as passed in: one of node names and one of "name" tag
+    values.
 
-    All prefixes are batched into a single pair of queries (one for names,
-    one for tags) rather than a lookup per prefix.
+    All prefixes are batched into a single query that returns each matching
+    node's name and "name" tag together, rather than a lookup per prefix.
 
     Args:
         session: Database session
@@ -129,27 +179,47 @@ def resolve_sender_names(
     names: dict[str, str] = {}
     tag_names: dict[str, str] = {}
 
-    unique = {p for p in prefixes if p}
-    if not unique:
+    # Stored public keys are lower-case (see Node.__init__).
+    by_lowered: dict[str, list[str]] = {}
+    for prefix in {p for p in prefixes if p}:
+        by_lowered.setdefault(prefix.lower(), []).append(prefix)
+    if not by_lowered:
         return names, tag_names
 
-    # One indexable LIKE 'prefix%' term per prefix, ORed together. Tolerates
-    # variable-length prefixes (unlike substr(...) IN), preserving the
-    # per-prefix startswith semantics this replaces.
-    clause = or_(*[Node.public_key.startswith(p) for p in unique])
-
-    name_query = select(Node.public_key, Node.name).where(clause)
-    for public_key, name in session.execute(name_query).all():
-        if name:
-            names[public_key[:12]] = name
-
-    tag_query = (
-        select(Node.public_key, NodeTag.value)
-        .join(NodeTag, Node.id == NodeTag.node_id)
+    # Each prefix becomes a range on the unique public_key index: every key
+    # starting with ``p`` sorts in [p, hex successor of p). Unlike LIKE 'p%',
+    # ranges stay index-driven on SQLite (case-insensitive LIKE), and they
+    # tolerate variable-length prefixes, which a substr(public_key, 1, 12)
+    # IN (...) lookup would not. The comparison is pinned to byte order
+    # (SQLite's default BINARY, COLLATE "C" on Postgres) so the bounds do not
+    # depend on the database locale. The range may over-match; the loop
+    # below keeps only true prefix matches.
+    key_col: SQLColumnExpression[str] = Node.public_key
+    if session.get_bind().dialect.name == "postgresql":
+        key_col = Node.public_key.collate("C")
+    ranges = []
+    for p in by_lowered:
+        upper = _prefix_upper_bound(p)
+        if upper is None:
+            ranges.append(key_col >= p)
+        else:
+            ranges.append(and_(key_col >= p, key_col < upper))
+    clause = or_(*ranges)
+    lengths = {len(p) for p in by_lowered}
+
+    # (node_id, key) is unique in node_tags, so the outer join yields at most
+    # one row per node.
+    query = (
+        select(Node.public_key, Node.name, NodeTag.value)
+        .outerjoin(NodeTag, and_(NodeTag.node_id == Node.id, NodeTag.key == "name"))
         .where(clause)
-        .where(NodeTag.key == "name")
     )
-    for public_key, value in session.execute(tag_query).all():
-        tag_names[public_key[:12]] = value
+    for public_key, name, tag_value in session.execute(query).all():
+        for length in lengths:
+            for prefix in by_lowered.get(public_key[:length], ()):
+                if name:
+                    names[prefix] = name
+                if tag_value is not None:
+                    tag_names[prefix] = tag_value
 
     return names, tag_names
@@ -1,11 +1,11 @@
 """Advertisement API routes."""
 
 from datetime import datetime
-from typing import Optional
+from typing import Any, Optional
 
 from fastapi import APIRouter, HTTPException, Query, Request
-from sqlalchemy import func, or_, select
-from sqlalchemy.orm import aliased, selectinload
+from sqlalchemy import and_, func, or_, select
+from sqlalchemy.orm import aliased
 
 from meshcore_hub.api.auth import RequireRead
 from meshcore_hub.api.cache import cached
@@ -27,24 +27,77 @@ DEFAULT_FLOOD_ROUTE_TYPES = {"flood", "transport_flood"}
 DISABLE_FILTER_VALUES = {"all", "none", ""}
 
 
-def _get_tag_name(node: Optional[Node]) -> Optional[str]:
-    """Extract name tag from a node's tags."""
-    if not node or not node.tags:
-        return None
-    for tag in node.tags:
-        if tag.key == "name":
-            return tag.value
-    return None
+# Node/tag aliases for the advertisement list and detail queries
+_ObserverNode = aliased(Node, name="observer_node")
+_SourceNode = aliased(Node, name="source_node")
+_ObserverNameTag = aliased(NodeTag, name="observer_name_tag")
+_SourceNameTag = aliased(NodeTag, name="source_name_tag")
+_SourceDescriptionTag = aliased(NodeTag, name="source_description_tag")
+
+# Advertisement select with node and tag columns joined in, built once at
+# import. Select objects are immutable (``.where()``/``.order_by()`` return
+# copies), so requests only add their criteria on top of this shared base,
+# and its stable shape keeps the compiled-SQL cache hit rate high.
+#
+# Observer/source nodes and their ``name``/``description`` tags are outer
+# joined so a page of results is built from a single query. Every join is
+# to-one (tags are unique per ``(node_id, key)``), so row counts match the
+# advertisements table.
+_ADVERTISEMENT_QUERY = (
+    select(
+        Advertisement,
+        _ObserverNode.public_key.label("observer_pk"),
+        _ObserverNode.name.label("observer_name"),
+        _ObserverNameTag.value.label("observer_tag_name"),
+        _SourceNode.name.label("source_name"),
+        _SourceNode.adv_type.label("source_adv_type"),
+        _SourceNameTag.value.label("source_tag_name"),
+        _SourceDescriptionTag.value.label("source_tag_description"),
+    )
+    .outerjoin(_ObserverNode, Advertisement.observer_node_id == _ObserverNode.id)
+    .outerjoin(_SourceNode, Advertisement.node_id == _SourceNode.id)
+    .outerjoin(
+        _ObserverNameTag,
+        and_(
+            _ObserverNameTag.node_id == _ObserverNode.id,
+            _ObserverNameTag.key == "name",
+        ),
+    )
+    .outerjoin(
+        _SourceNameTag,
+        and_(_SourceNameTag.node_id == _SourceNode.id, _SourceNameTag.key == "name"),
+    )
+    .outerjoin(
+        _SourceDescriptionTag,
+        and_(
+            _SourceDescriptionTag.node_id == _SourceNode.id,
+            _SourceDescriptionTag.key == "description",
+        ),
+    )
+)
 
 
-def _get_tag_description(node: Optional[Node]) -> Optional[str]:
-    """Extract description tag from a node's tags."""
-    if not node or not node.tags:
-        return None
-    for tag in node.tags:
-        if tag.key == "description":
-            return tag.value
-    return None
+def _row_to_read(row: Any, observers: list[Any]) -> AdvertisementRead:
+    """Build an AdvertisementRead from an ``_ADVERTISEMENT_QUERY`` row."""
+    adv = row[0]
+    return AdvertisementRead(
+        observed_by=row.observer_pk,
+        observer_name=row.observer_name,
+        observer_tag_name=row.observer_tag_name,
+        public_key=adv.public_key,
+        name=adv.name,
+        node_name=row.source_name,
+        node_tag_name=row.source_tag_name,
+        node_tag_description=row.source_tag_description,
+        adv_type=adv.adv_type or row.source_adv_type,
+        flags=adv.flags,
+        route_type=adv.route_type,
+        advert_timestamp=adv.advert_timestamp,
+        received_at=adv.received_at,
+        created_at=adv.created_at,
+        packet_hash=adv.packet_hash,
+        observers=observers,
+    )
 
 
 @router.get("", response_model=AdvertisementList)
@@ -77,34 +130,23 @@ def list_advertisements(
     offset: int = Query(0, ge=0, description="Page offset"),
 ) -> AdvertisementList:
     """List advertisements with filtering and pagination."""
-    # Aliases for node joins
-    ObserverNode = aliased(Node)
-    SourceNode = aliased(Node)
-
-    # Build query with both receiver and source node joins
-    query = (
-        select(
-            Advertisement,
-            ObserverNode.public_key.label("observer_pk"),
-            ObserverNode.name.label("observer_name"),
-            ObserverNode.id.label("observer_id"),
-            SourceNode.name.label("source_name"),
-            SourceNode.id.label("source_id"),
-            SourceNode.adv_type.label("source_adv_type"),
-        )
-        .outerjoin(ObserverNode, Advertisement.observer_node_id == ObserverNode.id)
-        .outerjoin(SourceNode, Advertisement.node_id == SourceNode.id)
-    )
+    query = _ADVERTISEMENT_QUERY
+
+    # Filters only reference Advertisement columns so the count below can run
+    # against the advertisements table alone, without the node joins.
+    filters = []
 
     if search:
         # Search in public key, advertisement name, node name, or name tag
         search_pattern = f"%{search}%"
-        query = query.where(
+        filters.append(
             or_(
                 Advertisement.public_key.ilike(search_pattern),
                 Advertisement.name.ilike(search_pattern),
-                SourceNode.name.ilike(search_pattern),
-                SourceNode.id.in_(
+                Advertisement.node_id.in_(
+                    select(Node.id).where(Node.name.ilike(search_pattern))
+                ),
+                Advertisement.node_id.in_(
                     select(NodeTag.node_id).where(
                         NodeTag.key == "name", NodeTag.value.ilike(search_pattern)
                     )
@@ -113,18 +155,18 @@ def list_advertisements(
         )
 
     if public_key:
-        query = query.where(Advertisement.public_key == public_key)
+        filters.append(Advertisement.public_key == public_key)
 
     if observed_by:
-        query = query.where(
+        filters.append(
             observed_by_filter_clause(
                 "advertisement", Advertisement.event_hash, observed_by
             )
         )
 
     if adopted_by:
-        query = query.where(
-            SourceNode.id.in_(
+        filters.append(
+            Advertisement.node_id.in_(
                 select(UserProfileNode.node_id).where(
                     UserProfileNode.user_profile_id == adopted_by
                 )
@@ -136,7 +178,7 @@ def list_advertisements(
             t.strip().lower() for t in route_type.split(",") if t.strip()
         }
         if requested_types:
-            query = query.where(
+            filters.append(
                 or_(
                     Advertisement.route_type.in_(requested_types),
                     Advertisement.route_type.is_(None),
@@ -144,32 +186,25 @@ def list_advertisements(
             )
 
     if since:
-        query = query.where(Advertisement.received_at >= since)
+        filters.append(Advertisement.received_at >= since)
 
     if until:
-        query = query.where(Advertisement.received_at <= until)
+        filters.append(Advertisement.received_at <= until)
+
+    query = query.where(*filters)
 
-    # Get total count
-    count_query = select(func.count()).select_from(query.subquery())
+    # Get total count (both joins are to-one, so they never change it)
+    count_query = select(func.count(Advertisement.id)).where(*filters)
     total = session.execute(count_query).scalar() or 0
 
     # Resolve sort column and direction
     sort = sort if sort in VALID_AD_SORT_COLUMNS else "time"
     order = order if order in ("asc", "desc") else "desc"
 
-    SourceNodeNameTag = aliased(NodeTag)
-    name_tag_subq = (
-        select(SourceNodeNameTag.value)
-        .where(
-            SourceNodeNameTag.node_id == SourceNode.id,
-            SourceNodeNameTag.key == "name",
-        )
-        .correlate(SourceNode)
-        .scalar_subquery()
-    )
-
     if sort == "node_name":
-        _col = func.coalesce(name_tag_subq, SourceNode.name, Advertisement.public_key)
+        _col = func.coalesce(
+            _SourceNameTag.value, _SourceNode.name, Advertisement.public_key
+        )
         query = query.order_by(_col.desc() if order == "desc" else _col.asc())
     elif sort == "public_key":
         query = query.order_by(
@@ -190,23 +225,6 @@ def list_advertisements(
     # Execute
     results = session.execute(query).all()
 
-    # Collect node IDs to fetch tags
-    node_ids = set()
-    for row in results:
-        if row.observer_id:
-            node_ids.add(row.observer_id)
-        if row.source_id:
-            node_ids.add(row.source_id)
-
-    # Fetch nodes with tags
-    nodes_by_id: dict[str, Node] = {}
-    if node_ids:
-        nodes_query = (
-            select(Node).where(Node.id.in_(node_ids)).options(selectinload(Node.tags))
-        )
-        nodes = session.execute(nodes_query).scalars().all()
-        nodes_by_id = {n.id: n for n in nodes}
-
     # Fetch all observers for these advertisements
     event_hashes = [r[0].event_hash for r in results if r[0].event_hash]
     observers_by_hash = fetch_observers_for_events(
@@ -214,33 +232,13 @@ def list_advertisements(
     )
 
     # Build response with node details
-    items = []
-    for row in results:
-        adv = row[0]
-        observer_node = nodes_by_id.get(row.observer_id) if row.observer_id else None
-        source_node = nodes_by_id.get(row.source_id) if row.source_id else None
-
-        data = {
-            "observed_by": row.observer_pk,
-            "observer_name": row.observer_name,
-            "observer_tag_name": _get_tag_name(observer_node),
-            "public_key": adv.public_key,
-            "name": adv.name,
-            "node_name": row.source_name,
-            "node_tag_name": _get_tag_name(source_node),
-            "node_tag_description": _get_tag_description(source_node),
-            "adv_type": adv.adv_type or row.source_adv_type,
-            "flags": adv.flags,
-            "route_type": adv.route_type,
-            "advert_timestamp": adv.advert_timestamp,
-            "received_at": adv.received_at,
-            "created_at": adv.created_at,
-            "packet_hash": adv.packet_hash,
-            "observers": (
-                observers_by_hash.get(adv.event_hash, []) if adv.event_hash else []
-            ),
-        }
-        items.append(AdvertisementRead(**data))
+    items = [
+        _row_to_read(
+            row,
+            observers_by_hash.get(row[0].event_hash, []) if row[0].event_hash else [],
+        )
+        for row in results
+    ]
 
     return AdvertisementList(
         items=items,
@@ -257,47 +255,15 @@ def get_advertisement(
     advertisement_id: str,
 ) -> AdvertisementRead:
     """Get a single advertisement by ID."""
-    ObserverNode = aliased(Node)
-    SourceNode = aliased(Node)
-    query = (
-        select(
-            Advertisement,
-            ObserverNode.public_key.label("observer_pk"),
-            ObserverNode.name.label("observer_name"),
-            ObserverNode.id.label("observer_id"),
-            SourceNode.name.label("source_name"),
-            SourceNode.id.label("source_id"),
-            SourceNode.adv_type.label("source_adv_type"),
-        )
-        .outerjoin(ObserverNode, Advertisement.observer_node_id == ObserverNode.id)
-        .outerjoin(SourceNode, Advertisement.node_id == SourceNode.id)
-        .where(Advertisement.id == advertisement_id)
-    )
-    result = session.execute(query).one_or_none()
+    result = session.execute(
+        _ADVERTISEMENT_QUERY.where(Advertisement.id == advertisement_id)
+    ).one_or_none()
 
     if not result:
         raise HTTPException(status_code=404, detail="Advertisement not found")
 
     adv = result[0]
 
-    # Fetch nodes with tags for friendly names
-    node_ids = []
-    if result.observer_id:
-        node_ids.append(result.observer_id)
-    if result.source_id:
-        node_ids.append(result.source_id)
-
-    nodes_by_id: dict[str, Node] = {}
-    if node_ids:
-        nodes_query = (
-            select(Node).where(Node.id.in_(node_ids)).options(selectinload(Node.tags))
-        )
-        nodes = session.execute(nodes_query).scalars().all()
-        nodes_by_id = {n.id: n for n in nodes}
-
-    observer_node = nodes_by_id.get(result.observer_id) if result.observer_id else None
-    source_node = nodes_by_id.get(result.source_id) if result.source_id else None
-
     # Fetch observers for this advertisement
     observers = []
     if adv.event_hash:
@@ -306,22 +272,4 @@ def get_advertisement(
         )
         observers = observers_by_hash.get(adv.event_hash, [])
 
-    data = {
-        "observed_by": result.observer_pk,
-        "observer_name": result.observer_name,
-        "observer_tag_name": _get_tag_name(observer_node),
-        "public_key": adv.public_key,
-        "name": adv.name,
-        "node_name": result.source_name,
-        "node_tag_name": _get_tag_name(source_node),
-        "node_tag_description": _get_tag_description(source_node),
-        "adv_type": adv.adv_type or result.source_adv_type,
-        "flags": adv.flags,
-        "route_type": adv.route_type,
-        "advert_timestamp": adv.advert_timestamp,
-        "received_at": adv.received_at,
-        "created_at": adv.created_at,
-        "packet_hash": adv.packet_hash,
-        "observers": observers,
-    }
-    return AdvertisementRead(**data)
+    return _row_to_read(result, observers)
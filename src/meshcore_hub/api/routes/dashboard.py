@@ -1,10 +1,12 @@
 """Dashboard API routes."""
 
+import threading
+import time
 from datetime import date, datetime, timedelta, timezone
-from typing import Sequence
+from typing import Any, Sequence
 
 from fastapi import APIRouter, Request
-from sqlalchemy import and_, case, func, or_, select
+from sqlalchemy import Select, and_, bindparam, case, func, or_, select, true, union_all
 from sqlalchemy.sql.elements import ColumnElement
 
 from meshcore_hub.api.auth import RequireRead
@@ -53,6 +55,34 @@ router = APIRouter()
 
 _FLOOD_ROUTE_TYPES = {"flood", "transport_flood"}
 
+# In-process memo for GET /dashboard/stats, keyed like the Redis cache entry
+# (per role). An entry is reused while it is younger than the TTL and no
+# message or advertisement has arrived since it was computed, so concurrent
+# dashboard viewers share one set of aggregates even with Redis disabled.
+# Simultaneous misses for the same key coalesce on a per-key lock; misses
+# for different roles compute in parallel. _stats_memo_lock only guards the
+# dicts and the generation, which clear_stats_memo() bumps so a computation
+# already in flight does not store a result from before the invalidation.
+_STATS_MEMO_TTL = 10.0
+_stats_memo: dict[str, tuple[float, tuple[Any, ...], DashboardStats]] = {}
+_stats_memo_key_locks: dict[str, threading.Lock] = {}
+_stats_memo_lock = threading.Lock()
+_stats_memo_generation = 0
+
+
+def clear_stats_memo() -> None:
+    """Drop every memoized ``/dashboard/stats`` result in this process."""
+    global _stats_memo_generation
+    with _stats_memo_lock:
+        _stats_memo.clear()
+        _stats_memo_generation += 1
+
+
+def _stats_memo_key_lock(memo_key: str) -> threading.Lock:
+    """Return the lock serializing ``/dashboard/stats`` misses for a key."""
+    with _stats_memo_lock:
+        return _stats_memo_key_locks.setdefault(memo_key, threading.Lock())
+
 
 def _dashboard_stats_key_builder(request: Request) -> str:
     role = resolve_user_role(request) or "anonymous"
@@ -98,6 +128,101 @@ def _flood_only_filter(
     )
 
 
+# Aggregate statements are built once at import with bind parameters for the
+# per-request values (window bounds, cutoffs, visible channels), so a request
+# only binds values instead of rebuilding the expression tree.
+_VISIBLE_MESSAGE_FILTER = or_(
+    Message.message_type != "channel",
+    Message.channel_idx.is_(None),
+    Message.channel_idx.in_(bindparam("visible_indices", expanding=True)),
+)
+
+_NODE_COUNTS = (
+    select(
+        func.count().label("total_nodes"),
+        func.sum(case((Node.last_seen >= bindparam("yesterday"), 1), else_=0)).label(
+            "active_nodes"
+        ),
+    )
+    .select_from(Node)
+    .subquery()
+)
+
+_MESSAGE_COUNTS = (
+    select(
+        func.count().label("total_messages"),
+        func.sum(
+            case((Message.received_at >= bindparam("today_start"), 1), else_=0)
+        ).label("messages_today"),
+        func.sum(
+            case((Message.received_at >= bindparam("seven_days_ago"), 1), else_=0)
+        ).label("messages_7d"),
+    )
+    .select_from(Message)
+    .where(_VISIBLE_MESSAGE_FILTER)
+    .subquery()
+)
+
+_ADVERTISEMENT_COUNTS = (
+    select(
+        func.count().label("total_advertisements"),
+        func.sum(
+            case((Advertisement.received_at >= bindparam("yesterday"), 1), else_=0)
+        ).label("advertisements_24h"),
+        func.sum(
+            case(
+                (Advertisement.received_at >= bindparam("seven_days_ago"), 1),
+                else_=0,
+            )
+        ).label("advertisements_7d"),
+    )
+    .select_from(Advertisement)
+    .where(_flood_only_filter(Advertisement))
+    .subquery()
+)
+
+_PACKET_COUNTS = (
+    select(
+        func.count(RawPacket.id).label("total_packets"),
+        func.sum(
+            case((RawPacket.received_at >= bindparam("seven_days_ago"), 1), else_=0)
+        ).label("packets_7d"),
+    )
+    .select_from(RawPacket)
+    .subquery()
+)
+
+# Each aggregate above yields exactly one row, so joining them on TRUE
+# returns every headline count in a single row and a single round trip.
+_STATS_COUNTS_QUERY = select(
+    _NODE_COUNTS, _MESSAGE_COUNTS, _ADVERTISEMENT_COUNTS, _PACKET_COUNTS
+).select_from(
+    _NODE_COUNTS.join(_MESSAGE_COUNTS, true())
+    .join(_ADVERTISEMENT_COUNTS, true())
+    .join(_PACKET_COUNTS, true())
+)
+
+
+def _daily_counts_query(received_at: Any, *criteria: Any) -> Select:
+    """Build a per-day COUNT over ``[:start, :end)`` on ``received_at``."""
+    date_expr = func.date(received_at)
+    return (
+        select(date_expr.label("date"), func.count().label("count"))
+        .where(received_at >= bindparam("start"))
+        .where(received_at < bindparam("end"))
+        .where(*criteria)
+        .group_by(date_expr)
+        .order_by(date_expr)
+    )
+
+
+_ADVERTISEMENT_DAILY_QUERY = _daily_counts_query(
+    Advertisement.received_at, _flood_only_filter(Advertisement)
+)
+_PACKET_DAILY_QUERY = _daily_counts_query(RawPacket.received_at)
+_MESSAGE_DAILY_QUERY = _daily_counts_query(Message.received_at, _VISIBLE_MESSAGE_FILTER)
+
+
 def _date_bucket_key(value: str | date | None) -> str | None:
     """Coerce a DB-returned date bucket key to a canonical ``%Y-%m-%d`` string.
 
@@ -113,6 +238,27 @@ def _date_bucket_key(value: str | date | None) -> str | None:
     return value
 
 
+def _activity_window(days: int) -> tuple[int, datetime, datetime]:
+    """Clamp ``days`` to 90 and return ``(days, start, end)`` for a day series.
+
+    The window ends at the start of today (UTC) so today's incomplete data is
+    excluded, and ``now`` is read once per request.
+    """
+    days = min(days, 90)
+    end = datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
+    return days, end - timedelta(days=days), end
+
+
+def _date_range_keys(start: datetime, days: int) -> list[str]:
+    """Return ``days`` consecutive ``%Y-%m-%d`` keys starting at ``start``.
+
+    Walks date ordinals and uses ``isoformat()``, which yields the same
+    strings as ``strftime("%Y-%m-%d")`` without the format-string parsing.
+    """
+    base = start.date().toordinal()
+    return [date.fromordinal(base + i).isoformat() for i in range(days)]
+
+
 @router.get("/stats", response_model=DashboardStats)
 @cached(
     "dashboard/stats",
@@ -125,6 +271,37 @@ def get_stats(
     request: Request,
 ) -> DashboardStats:
     """Get dashboard statistics."""
+    memo_key = _dashboard_stats_key_builder(request)
+    # Both MAX() lookups are served from the received_at indexes.
+    watermark = tuple(
+        session.execute(
+            select(
+                select(func.max(Message.received_at)).scalar_subquery(),
+                select(func.max(Advertisement.received_at)).scalar_subquery(),
+            )
+        ).one()
+    )
+
+    with _stats_memo_key_lock(memo_key):
+        with _stats_memo_lock:
+            entry = _stats_memo.get(memo_key)
+            generation = _stats_memo_generation
+        if entry is not None and entry[0] > time.monotonic() and entry[1] == watermark:
+            return entry[2]
+
+        stats = _compute_stats(session, request)
+        with _stats_memo_lock:
+            if generation == _stats_memo_generation:
+                _stats_memo[memo_key] = (
+                    time.monotonic() + _STATS_MEMO_TTL,
+                    watermark,
+                    stats,
+                )
+        return stats
+
+
+def _compute_stats(session: DbSession, request: Request) -> DashboardStats:
+    """Run the aggregate queries behind ``GET /dashboard/stats``."""
     now = datetime.now(timezone.utc)
     today_start = now.replace(hour=0, minute=0, second=0, microsecond=0)
     yesterday = now - timedelta(days=1)
@@ -135,68 +312,20 @@ def get_stats(
     max_level = get_max_visibility_level(role)
     visible_indices = get_visible_channel_indices(session, max_level)
 
-    # Build channel message visibility filter
-    def _channel_visible_filter(
-        model: type[Message] = Message,
-    ) -> ColumnElement[bool]:
-        return or_(
-            model.message_type != "channel",
-            model.channel_idx.is_(None),
-            model.channel_idx.in_(visible_indices),
-        )
-
-    # Node counts (total + active in the last 24h) in a single pass.
-    node_row = session.execute(
-        select(
-            func.count(),
-            func.sum(case((Node.last_seen >= yesterday, 1), else_=0)),
-        ).select_from(Node)
-    ).one()
-    total_nodes = node_row[0] or 0
-    active_nodes = node_row[1] or 0
-
-    # Message counts (total + today + last 7 days), channel-visible only,
-    # via conditional aggregation so it's one query instead of three.
-    msg_row = session.execute(
-        select(
-            func.count(),
-            func.sum(case((Message.received_at >= today_start, 1), else_=0)),
-            func.sum(case((Message.received_at >= seven_days_ago, 1), else_=0)),
-        )
-        .select_from(Message)
-        .where(_channel_visible_filter())
-    ).one()
-    total_messages = msg_row[0] or 0
-    messages_today = msg_row[1] or 0
-    messages_7d = msg_row[2] or 0
-
-    # Advertisement counts (total + last 24h + last 7 days), flood-only,
-    # again folded into one query.
-    adv_row = session.execute(
-        select(
-            func.count(),
-            func.sum(case((Advertisement.received_at >= yesterday, 1), else_=0)),
-            func.sum(case((Advertisement.received_at >= seven_days_ago, 1), else_=0)),
-        )
-        .select_from(Advertisement)
-        .where(_flood_only_filter(Advertisement))
-    ).one()
-    total_advertisements = adv_row[0] or 0
-    advertisements_24h = adv_row[1] or 0
-    advertisements_7d = adv_row[2] or 0
-
-    # Raw-packet counts (total + last 7 days), observer-level volume metric
-    # with no role/channel filter (payload redaction lives on list/detail only).
-    packet_row = session.execute(
-        select(
-            func.count(RawPacket.id).label("total_packets"),
-            func.sum(case((RawPacket.received_at >= seven_days_ago, 1), else_=0)).label(
-                "packets_7d"
-            ),
-        ).select_from(RawPacket)
+    # Node (total + active 24h), channel-visible message (total + today +
+    # 7d), flood-only advertisement (total + 24h + 7d) and raw-packet
+    # (total + 7d) counts, all from one statement. Raw packets are an
+    # observer-level volume metric with no role/channel filter (payload
+    # redaction lives on list/detail only).
+    counts = session.execute(
+        _STATS_COUNTS_QUERY,
+        {
+            "yesterday": yesterday,
+            "today_start": today_start,
+            "seven_days_ago": seven_days_ago,
+            "visible_indices": sorted(visible_indices),
+        },
     ).one()
-    total_packets = packet_row[0] or 0
-    packets_7d = packet_row[1] or 0
 
     # Channel message counts (only visible channels). The recent messages
     # themselves live on /dashboard/recent-activity so they can carry a
@@ -239,19 +368,19 @@ def get_stats(
     total_members = profile_row[1] or 0
 
     return DashboardStats(
-        total_nodes=total_nodes,
-        active_nodes=active_nodes,
-        total_messages=total_messages,
-        messages_today=messages_today,
-        messages_7d=messages_7d,
-        total_advertisements=total_advertisements,
-        advertisements_24h=advertisements_24h,
-        advertisements_7d=advertisements_7d,
+        total_nodes=counts.total_nodes or 0,
+        active_nodes=counts.active_nodes or 0,
+        total_messages=counts.total_messages or 0,
+        messages_today=counts.messages_today or 0,
+        messages_7d=counts.messages_7d or 0,
+        total_advertisements=counts.total_advertisements or 0,
+        advertisements_24h=counts.advertisements_24h or 0,
+        advertisements_7d=counts.advertisements_7d or 0,
         channel_message_counts=channel_message_counts,
         total_operators=total_operators,
         total_members=total_members,
-        total_packets=total_packets,
-        packets_7d=packets_7d,
+        total_packets=counts.total_packets or 0,
+        packets_7d=counts.packets_7d or 0,
     )
 
 
@@ -359,37 +488,54 @@ def get_recent_activity(
     # Channel messages for each visible channel (up to 5 latest each).
     # The per-channel counts stay on /dashboard/stats (they're aggregate
     # counts, not a "recent" list); only the message bodies live here.
+    # Each channel's latest 5 come from its own ORDER BY ... LIMIT branch so
+    # it can stop after five rows, but the branches run as one UNION ALL
+    # statement and the senders are resolved in one batch for all channels.
     channel_messages: dict[int, list[ChannelMessage]] = {}
-    for channel_idx in visible_indices:
-        messages_query = (
-            select(Message)
-            .where(Message.message_type == "channel")
-            .where(Message.channel_idx == channel_idx)
-            .order_by(Message.received_at.desc())
-            .limit(5)
-        )
-        channel_msgs = session.execute(messages_query).scalars().all()
-        if not channel_msgs:
-            continue
+    if visible_indices:
+        latest_per_channel = [
+            select(
+                select(
+                    Message.channel_idx,
+                    Message.text,
+                    Message.pubkey_prefix,
+                    Message.received_at,
+                )
+                .where(Message.message_type == "channel")
+                .where(Message.channel_idx == channel_idx)
+                .order_by(Message.received_at.desc())
+                .limit(5)
+                .subquery()
+            )
+            for channel_idx in sorted(visible_indices)
+        ]
+        channel_query = union_all(*latest_per_channel)
+        channel_msgs = session.execute(
+            channel_query.order_by(
+                channel_query.selected_columns.channel_idx,
+                channel_query.selected_columns.received_at.desc(),
+            )
+        ).all()
 
-        # Look up sender names for these messages
         msg_prefixes = [m.pubkey_prefix for m in channel_msgs if m.pubkey_prefix]
         msg_sender_names, msg_tag_names = resolve_sender_names(session, msg_prefixes)
 
-        channel_messages[int(channel_idx)] = [
-            ChannelMessage(
-                text=m.text,
-                sender_name=(
-                    msg_sender_names.get(m.pubkey_prefix) if m.pubkey_prefix else None
-                ),
-                sender_tag_name=(
-                    msg_tag_names.get(m.pubkey_prefix) if m.pubkey_prefix else None
-                ),
-                pubkey_prefix=m.pubkey_prefix,
-                received_at=m.received_at,
+        for m in channel_msgs:
+            channel_messages.setdefault(int(m.channel_idx), []).append(
+                ChannelMessage(
+                    text=m.text,
+                    sender_name=(
+                        msg_sender_names.get(m.pubkey_prefix)
+                        if m.pubkey_prefix
+                        else None
+                    ),
+                    sender_tag_name=(
+                        msg_tag_names.get(m.pubkey_prefix) if m.pubkey_prefix else None
+                    ),
+                    pubkey_prefix=m.pubkey_prefix,
+                    received_at=m.received_at,
+                )
             )
-            for m in channel_msgs
-        ]
 
     return RecentActivity(
         recent_advertisements=recent_advertisements,
@@ -413,43 +559,22 @@ def get_activity(
     Returns:
         Daily advertisement counts for each day in the period (excluding today)
     """
-    # Limit to max 90 days
-    days = min(days, 90)
-
-    now = datetime.now(timezone.utc)
-    # End at start of today (exclude today's incomplete data)
-    end_date = now.replace(hour=0, minute=0, second=0, microsecond=0)
-    start_date = end_date - timedelta(days=days)
-
-    # Query advertisement counts grouped by date
-    # Use SQLite's date() function for grouping (returns string 'YYYY-MM-DD')
-    date_expr = func.date(Advertisement.received_at)
-
-    query = (
-        select(
-            date_expr.label("date"),
-            func.count().label("count"),
-        )
-        .where(Advertisement.received_at >= start_date)
-        .where(Advertisement.received_at < end_date)
-        .where(_flood_only_filter(Advertisement))
-        .group_by(date_expr)
-        .order_by(date_expr)
-    )
+    days, start_date, end_date = _activity_window(days)
 
-    results = session.execute(query).all()
+    # Advertisement counts grouped by date
+    results = session.execute(
+        _ADVERTISEMENT_DAILY_QUERY, {"start": start_date, "end": end_date}
+    ).all()
 
     # Build a dict of date -> count, normalizing the key to a string so it
     # works on both SQLite (func.date() returns str) and Postgres (returns date).
     counts_by_date = {_date_bucket_key(row.date): row.count for row in results}
 
     # Generate all dates in the range, filling in zeros for missing days
-    data = []
-    for i in range(days):
-        date = start_date + timedelta(days=i)
-        date_str = date.strftime("%Y-%m-%d")
-        count = counts_by_date.get(date_str, 0)
-        data.append(DailyActivityPoint(date=date_str, count=count))
+    data = [
+        DailyActivityPoint(date=day, count=counts_by_date.get(day, 0))
+        for day in _date_range_keys(start_date, days)
+    ]
 
     return DailyActivity(days=days, data=data)
 
@@ -470,34 +595,17 @@ def get_packet_activity(
     Returns:
         Daily raw-packet counts for each day in the period (excluding today)
     """
-    days = min(days, 90)
-
-    now = datetime.now(timezone.utc)
-    end_date = now.replace(hour=0, minute=0, second=0, microsecond=0)
-    start_date = end_date - timedelta(days=days)
-
-    date_expr = func.date(RawPacket.received_at)
-
-    query = (
-        select(
-            date_expr.label("date"),
-            func.count().label("count"),
-        )
-        .where(RawPacket.received_at >= start_date)
-        .where(RawPacket.received_at < end_date)
-        .group_by(date_expr)
-        .order_by(date_expr)
-    )
+    days, start_date, end_date = _activity_window(days)
 
-    results = session.execute(query).all()
+    results = session.execute(
+        _PACKET_DAILY_QUERY, {"start": start_date, "end": end_date}
+    ).all()
     counts_by_date = {_date_bucket_key(row.date): row.count for row in results}
 
-    data = []
-    for i in range(days):
-        date = start_date + timedelta(days=i)
-        date_str = date.strftime("%Y-%m-%d")
-        count = counts_by_date.get(date_str, 0)
-        data.append(DailyActivityPoint(date=date_str, count=count))
+    data = [
+        DailyActivityPoint(date=day, count=counts_by_date.get(day, 0))
+        for day in _date_range_keys(start_date, days)
+    ]
 
     return DailyActivity(days=days, data=data)
 
@@ -524,11 +632,7 @@ def get_packet_breakdown(
         Counts bucketed by event type (top 6 + "other") and by path-hash
         byte width (1b/2b/3b, NULL excluded) for the period (excluding today).
     """
-    days = min(days, 90)
-
-    now = datetime.now(timezone.utc)
-    end_date = now.replace(hour=0, minute=0, second=0, microsecond=0)
-    start_date = end_date - timedelta(days=days)
+    days, start_date, end_date = _activity_window(days)
 
     window_clauses = (
         RawPacket.received_at >= start_date,
@@ -598,46 +702,27 @@ def get_message_activity(
     Returns:
         Daily message counts for each day in the period (excluding today)
     """
-    days = min(days, 90)
-
-    now = datetime.now(timezone.utc)
-    end_date = now.replace(hour=0, minute=0, second=0, microsecond=0)
-    start_date = end_date - timedelta(days=days)
+    days, start_date, end_date = _activity_window(days)
 
     role = resolve_user_role(request)
     max_level = get_max_visibility_level(role)
     visible_indices = get_visible_channel_indices(session, max_level)
 
-    date_expr = func.date(Message.received_at)
-
-    query = (
-        select(
-            date_expr.label("date"),
-            func.count().label("count"),
-        )
-        .where(Message.received_at >= start_date)
-        .where(Message.received_at < end_date)
-        .where(
-            or_(
-                Message.message_type != "channel",
-                Message.channel_idx.is_(None),
-                Message.channel_idx.in_(visible_indices),
-            )
-        )
-        .group_by(date_expr)
-        .order_by(date_expr)
-    )
-
-    results = session.execute(query).all()
+    results = session.execute(
+        _MESSAGE_DAILY_QUERY,
+        {
+            "start": start_date,
+            "end": end_date,
+            "visible_indices": sorted(visible_indices),
+        },
+    ).all()
     counts_by_date = {_date_bucket_key(row.date): row.count for row in results}
 
     # Generate all dates in the range, filling in zeros for missing days
-    data = []
-    for i in range(days):
-        date = start_date + timedelta(days=i)
-        date_str = date.strftime("%Y-%m-%d")
-        count = counts_by_date.get(date_str, 0)
-        data.append(DailyActivityPoint(date=date_str, count=count))
+    data = [
+        DailyActivityPoint(date=day, count=counts_by_date.get(day, 0))
+        for day in _date_range_keys(start_date, days)
+    ]
 
     return MessageActivity(days=days, data=data)
 
@@ -661,44 +746,32 @@ def get_node_count_history(
     Returns:
         Cumulative node count for each day in the period (excluding today)
     """
-    days = min(days, 90)
-
-    now = datetime.now(timezone.utc)
-    # End at start of today (exclude today's incomplete data)
-    end_date = now.replace(hour=0, minute=0, second=0, microsecond=0)
-    start_date = end_date - timedelta(days=days)
+    days, start_date, end_date = _activity_window(days)
 
     # Cumulative count: seed the running total with every node that already
     # existed before the window, then add each day's new nodes as we walk it.
-    # This replaces a per-day COUNT(*) loop (up to 90 full scans) with two
-    # queries.
-    baseline = (
-        session.execute(
-            select(func.count()).select_from(Node).where(Node.created_at < start_date)
-        ).scalar()
-        or 0
-    )
-
-    # New nodes per calendar day within the window.
+    # Pre-window nodes fall into a NULL bucket of the same GROUP BY, so the
+    # baseline and the per-day counts come back from a single query.
     date_expr = func.date(Node.created_at)
+    bucket_expr = case((Node.created_at < start_date, None), else_=date_expr)
     per_day_query = (
-        select(date_expr.label("date"), func.count().label("count"))
-        .where(Node.created_at >= start_date)
+        select(bucket_expr.label("date"), func.count().label("count"))
         .where(Node.created_at < end_date)
-        .group_by(date_expr)
+        .group_by(bucket_expr)
     )
-    new_by_date = {
-        _date_bucket_key(row.date): row._mapping["count"]
-        for row in session.execute(per_day_query).all()
-    }
+    baseline = 0
+    new_by_date: dict[str | None, int] = {}
+    for row in session.execute(per_day_query).all():
+        if row.date is None:
+            baseline = row._mapping["count"]
+        else:
+            new_by_date[_date_bucket_key(row.date)] = row._mapping["count"]
 
     data = []
     running = baseline
-    for i in range(days):
-        date = start_date + timedelta(days=i)
-        date_str = date.strftime("%Y-%m-%d")
-        running += new_by_date.get(date_str, 0)
-        data.append(DailyActivityPoint(date=date_str, count=running))
+    for day in _date_range_keys(start_date, days):
+        running += new_by_date.get(day, 0)
+        data.append(DailyActivityPoint(date=day, count=running))
 
     return NodeCountHistory(days=days, data=data)
 
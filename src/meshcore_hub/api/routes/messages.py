@@ -5,7 +5,7 @@ from typing import Optional
 
 from fastapi import APIRouter, HTTPException, Query, Request
 from sqlalchemy import func, or_, select
-from sqlalchemy.orm import aliased, selectinload
+from sqlalchemy.orm import aliased
 
 from meshcore_hub.api.auth import RequireRead
 from meshcore_hub.api.cache import cached, sorted_query_string
@@ -17,6 +17,7 @@ from meshcore_hub.api.channel_visibility import (
 from meshcore_hub.api.dependencies import DbSession
 from meshcore_hub.api.observer_utils import (
     fetch_observers_for_events,
+    fetch_tag_values,
     observed_by_filter_clause,
     resolve_sender_names,
 )
@@ -33,16 +34,6 @@ def _messages_key_builder(request: Request) -> str:
     return f"{request.url.path}:role={role}:{sorted_query_string(request)}"
 
 
-def _get_tag_name(node: Optional[Node]) -> Optional[str]:
-    """Extract name tag from a node's tags."""
-    if not node or not node.tags:
-        return None
-    for tag in node.tags:
-        if tag.key == "name":
-            return tag.value
-    return None
-
-
 @router.get("", response_model=MessageList)
 @cached("messages", key_builder=_messages_key_builder)
 def list_messages(
@@ -126,10 +117,6 @@ def list_messages(
         )
     )
 
-    # Get total count
-    count_query = select(func.count()).select_from(query.subquery())
-    total = session.execute(count_query).scalar() or 0
-
     # Resolve sort column and direction
     sort = sort if sort in VALID_MSG_SORT_COLUMNS else "time"
     order = order if order in ("asc", "desc") else "desc"
@@ -155,77 +142,70 @@ def list_messages(
             Message.received_at.desc() if order == "desc" else Message.received_at.asc()
         )
 
-    # Apply pagination
-    query = query.offset(offset).limit(limit)
-
-    # Execute
-    results = session.execute(query).all()
+    # Apply pagination, carrying the filtered total on every row so the
+    # filter runs once instead of again under a separate COUNT(*)
+    query = query.add_columns(func.count().over().label("total"))
+    results = session.execute(query.offset(offset).limit(limit)).all()
+    if results:
+        total = results[0].total
+    elif offset:
+        # Paged past the end: no row to read the total from
+        count_query = select(func.count()).select_from(query.subquery())
+        total = session.execute(count_query).scalar() or 0
+    else:
+        total = 0
 
     # Look up sender names and tag names for senders with pubkey_prefix
     pubkey_prefixes = [r[0].pubkey_prefix for r in results if r[0].pubkey_prefix]
     sender_names, sender_tag_names = resolve_sender_names(session, pubkey_prefixes)
 
-    # Collect receiver node IDs to fetch tags
-    observer_ids = set()
-    for row in results:
-        if row.receiver_id:
-            observer_ids.add(row.receiver_id)
-
-    # Fetch receiver nodes with tags
-    observers_by_id: dict[str, Node] = {}
-    if observer_ids:
-        observers_query = (
-            select(Node)
-            .where(Node.id.in_(observer_ids))
-            .options(selectinload(Node.tags))
-        )
-        observers = session.execute(observers_query).scalars().all()
-        observers_by_id = {n.id: n for n in observers}
+    # Fetch receiver name tags
+    observer_tag_names = fetch_tag_values(
+        session, {row.receiver_id for row in results if row.receiver_id}
+    )
 
     # Fetch all observers for these messages
     event_hashes = [r[0].event_hash for r in results if r[0].event_hash]
     observers_by_hash = fetch_observers_for_events(session, "message", event_hashes)
 
-    # Build response with sender info and observed_by
+    # Build response with sender info and observed_by. Every value comes
+    # straight from typed ORM columns, so skip per-field validation.
     items = []
     for row in results:
         m = row[0]
         observer_pk = row.observer_pk
         observer_name = row.observer_name
-        observer_node = (
-            observers_by_id.get(row.receiver_id) if row.receiver_id else None
-        )
 
-        msg_dict = {
-            "id": m.id,
-            "observer_node_id": m.observer_node_id,
-            "observed_by": observer_pk,
-            "observer_name": observer_name,
-            "observer_tag_name": _get_tag_name(observer_node),
-            "message_type": m.message_type,
-            "pubkey_prefix": m.pubkey_prefix,
-            "sender_name": (
+        msg = MessageRead.model_construct(
+            id=m.id,
+            observer_node_id=m.observer_node_id,
+            observed_by=observer_pk,
+            observer_name=observer_name,
+            observer_tag_name=(
+                observer_tag_names.get(row.receiver_id) if row.receiver_id else None
+            ),
+            message_type=m.message_type,
+            pubkey_prefix=m.pubkey_prefix,
+            sender_name=(
                 sender_names.get(m.pubkey_prefix) if m.pubkey_prefix else None
             ),
-            "sender_tag_name": (
+            sender_tag_name=(
                 sender_tag_names.get(m.pubkey_prefix) if m.pubkey_prefix else None
             ),
-            "channel_idx": m.channel_idx,
-            "text": m.text,
-            "path_len": m.path_len,
-            "txt_type": m.txt_type,
-            "signature": m.signature,
-            "snr": m.snr,
-            "sender_timestamp": m.sender_timestamp,
-            "received_at": m.received_at,
-            "created_at": m.created_at,
-            "packet_hash": m.packet_hash,
-            "spam_score": m.spam_score,
-            "observers": (
-                observers_by_hash.get(m.event_hash, []) if m.event_hash else []
-            ),
-        }
-        items.append(MessageRead(**msg_dict))
+            channel_idx=m.channel_idx,
+            text=m.text,
+            path_len=m.path_len,
+            txt_type=m.txt_type,
+            signature=m.signature,
+            snr=m.snr,
+            sender_timestamp=m.sender_timestamp,
+            received_at=m.received_at,
+            created_at=m.created_at,
+            packet_hash=m.packet_hash,
+            spam_score=m.spam_score,
+            observers=observers_by_hash.get(m.event_hash, []) if m.event_hash else [],
+        )
+        items.append(msg)
 
     return MessageList(
         items=items,
@@ -5,7 +5,7 @@ from typing import Any, Optional
 
 from fastapi import APIRouter, HTTPException, Query, Request
 from sqlalchemy import asc, desc, func, or_, select
-from sqlalchemy.orm import aliased, selectinload
+from sqlalchemy.orm import aliased
 
 from meshcore_hub.api.auth import RequireRead
 from meshcore_hub.api.cache import cached, sorted_query_string
@@ -15,6 +15,7 @@ from meshcore_hub.api.channel_visibility import (
     resolve_user_role,
 )
 from meshcore_hub.api.dependencies import DbSession
+from meshcore_hub.api.observer_utils import fetch_tag_values
 from meshcore_hub.common.models import Node, PacketPathHop, RawPacket
 from meshcore_hub.common.schemas.raw_packets import (
     GroupedPacketList,
@@ -33,15 +34,6 @@ def _group_key_builder(request: Request) -> str:
     return f"packet_groups:role={role}:{sorted_query_string(request)}"
 
 
-def _get_tag_name(node: Optional[Node]) -> Optional[str]:
-    if not node or not node.tags:
-        return None
-    for tag in node.tags:
-        if tag.key == "name":
-            return tag.value
-    return None
-
-
 @router.get("", response_model=GroupedPacketList)
 @cached("packet_groups", key_builder=_group_key_builder)
 def list_packet_groups(
@@ -241,19 +233,9 @@ def get_packet_group(
     max_level = get_max_visibility_level(role)
     visible_indices = get_visible_channel_indices(session, max_level)
 
-    observer_ids = {row.observer_id for row in rows if row.observer_id}
-    nodes_by_id: dict[str, Node] = {}
-    if observer_ids:
-        nodes = (
-            session.execute(
-                select(Node)
-                .where(Node.id.in_(observer_ids))
-                .options(selectinload(Node.tags))
-            )
-            .scalars()
-            .all()
-        )
-        nodes_by_id = {n.id: n for n in nodes}
+    tag_names = fetch_tag_values(
+        session, {row.observer_id for row in rows if row.observer_id}
+    )
 
     # Batch-fetch path hashes from the hop table (one query for all receptions)
     packet_ids = [row[0].id for row in rows]
@@ -276,13 +258,14 @@ def get_packet_group(
         is_redacted = (
             packet.channel_idx is not None and packet.channel_idx not in visible_indices
         )
-        observer_node = nodes_by_id.get(row.observer_id) if row.observer_id else None
         receptions.append(
             PacketReceptionInfo(
                 packet_id=packet.id,
                 observed_by=row.observer_pk,
                 observer_name=row.observer_name,
-                observer_tag_name=_get_tag_name(observer_node),
+                observer_tag_name=(
+                    tag_names.get(row.observer_id) if row.observer_id else None
+                ),
                 snr=packet.snr,
                 path_len=packet.path_len,
                 path_hashes=(None if is_redacted else hops_by_packet.get(packet.id)),
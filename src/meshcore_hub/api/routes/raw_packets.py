@@ -5,7 +5,7 @@ from typing import Optional
 
 from fastapi import APIRouter, HTTPException, Query, Request
 from sqlalchemy import String, cast, func, or_, select
-from sqlalchemy.orm import aliased, selectinload
+from sqlalchemy.orm import aliased
 
 from meshcore_hub.api.auth import RequireRead
 from meshcore_hub.api.cache import cached, sorted_query_string
@@ -15,6 +15,7 @@ from meshcore_hub.api.channel_visibility import (
     resolve_user_role,
 )
 from meshcore_hub.api.dependencies import DbSession
+from meshcore_hub.api.observer_utils import fetch_tag_values
 from meshcore_hub.common.models import Node, RawPacket
 from meshcore_hub.common.schemas.raw_packets import RawPacketList, RawPacketRead
 
@@ -35,16 +36,6 @@ def _packets_key_builder(request: Request) -> str:
     return f"packets:role={role}:{sorted_query_string(request)}"
 
 
-def _get_tag_name(node: Optional[Node]) -> Optional[str]:
-    """Extract name tag from a node's tags."""
-    if not node or not node.tags:
-        return None
-    for tag in node.tags:
-        if tag.key == "name":
-            return tag.value
-    return None
-
-
 def _csv_set(value: Optional[str]) -> set[str]:
     """Split a comma-separated filter value into a normalized set."""
     if not value:
@@ -211,26 +202,18 @@ def list_raw_packets(
     results = session.execute(query).all()
 
     # Hydrate observer tags
-    observer_ids = {row.observer_id for row in results if row.observer_id}
-    nodes_by_id: dict[str, Node] = {}
-    if observer_ids:
-        nodes = (
-            session.execute(
-                select(Node)
-                .where(Node.id.in_(observer_ids))
-                .options(selectinload(Node.tags))
-            )
-            .scalars()
-            .all()
-        )
-        nodes_by_id = {n.id: n for n in nodes}
+    tag_names = fetch_tag_values(
+        session, {row.observer_id for row in results if row.observer_id}
+    )
 
     items = [
         _build_read(
             row[0],
             observer_pk=row.observer_pk,
             observer_name=row.observer_name,
-            observer_node=nodes_by_id.get(row.observer_id) if row.observer_id else None,
+            observer_tag_name=(
+                tag_names.get(row.observer_id) if row.observer_id else None
+            ),
             visible_indices=visible_indices,
         )
         for row in results
@@ -243,7 +226,7 @@ def _build_read(
     packet: RawPacket,
     observer_pk: Optional[str],
     observer_name: Optional[str],
-    observer_node: Optional[Node],
+    observer_tag_name: Optional[str],
     visible_indices: set[int],
 ) -> RawPacketRead:
     """Build a RawPacketRead, applying channel-visibility redaction."""
@@ -254,7 +237,7 @@ def _build_read(
         id=packet.id,
         observed_by=observer_pk,
         observer_name=observer_name,
-        observer_tag_name=_get_tag_name(observer_node),
+        observer_tag_name=observer_tag_name,
         packet_hash=packet.packet_hash,
         raw_hex=None if redacted else packet.raw_hex,
         packet_type=packet.packet_type,
@@ -299,22 +282,16 @@ def get_raw_packet(
     max_level = get_max_visibility_level(role)
     visible_indices = get_visible_channel_indices(session, max_level)
 
-    observer_node = None
+    observer_tag_name = None
     if result.observer_id:
-        observer_node = (
-            session.execute(
-                select(Node)
-                .where(Node.id == result.observer_id)
-                .options(selectinload(Node.tags))
-            )
-            .scalars()
-            .one_or_none()
+        observer_tag_name = fetch_tag_values(session, [result.observer_id]).get(
+            result.observer_id
         )
 
     return _build_read(
         result[0],
         observer_pk=result.observer_pk,
         observer_name=result.observer_name,
-        observer_node=observer_node,
+        observer_tag_name=observer_tag_name,
         visible_indices=visible_indices,
     )
@@ -4,11 +4,29 @@ This module provides functionality to delete old event data and inactive nodes
 based on configured retention policies.
 """
 
+import asyncio
+import json
 import logging
+import threading
+from contextlib import AbstractAsyncContextManager, asynccontextmanager
 from datetime import datetime, timedelta, timezone
-
-from sqlalchemy import CompoundSelect, delete, func, select, union, update
-from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Any, AsyncIterator, Callable
+
+from sqlalchemy import (
+    CompoundSelect,
+    Select,
+    and_,
+    delete,
+    func,
+    select,
+    union,
+    update,
+)
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.base import Executable
+from sqlalchemy.sql.compiler import SQLCompiler
+from sqlalchemy.sql.elements import ClauseElement, ColumnElement
 
 from meshcore_hub.common.models import (
     Advertisement,
@@ -25,6 +43,16 @@ from meshcore_hub.common.models.user_profile_node import UserProfileNode
 
 logger = logging.getLogger(__name__)
 
+# Rows removed per DELETE statement. Each batch is committed on its own so a
+# large backlog never becomes one long write transaction holding the database
+# lock (and growing the WAL) for minutes.
+DEFAULT_CLEANUP_CHUNK_SIZE = 10_000
+
+# Upper bound on per-table cleanups running at once when a session factory is
+# supplied. Limits how many large chunked DELETEs hit the database together,
+# so a retention sweep cannot saturate its I/O and write lock.
+MAX_CONCURRENT_TABLE_CLEANUPS = 4
+
 
 class CleanupStats:
     """Statistics from a cleanup operation."""
@@ -54,11 +82,67 @@ class CleanupStats:
         )
 
 
+# Guards a whole cleanup run. The threading lock covers callers in this
+# process (the scheduler thread runs its own event loop, so an asyncio.Lock
+# cannot be shared); the Postgres advisory lock covers other collector
+# processes and a manual ``collector cleanup`` against the same database.
+_cleanup_run_lock = threading.Lock()
+_CLEANUP_ADVISORY_LOCK_NAME = "meshcore_hub_cleanup"
+
+
+@asynccontextmanager
+async def exclusive_cleanup(db: AsyncSession) -> AsyncIterator[bool]:
+    """Claim the right to run cleanup without waiting for it.
+
+    Yields True when the caller holds the lock and should run cleanup, or
+    False when another run (in this process or, on Postgres, any process
+    sharing the database) is already in progress.
+
+    Example:
+        async with exclusive_cleanup(session) as acquired:
+            if acquired:
+                await cleanup_old_data(session, retention_days)
+    """
+    if not _cleanup_run_lock.acquire(blocking=False):
+        yield False
+        return
+    try:
+        if db.get_bind().dialect.name != "postgresql":
+            yield True
+            return
+
+        # Session-level advisory locks belong to a connection, so hold a
+        # dedicated one for the run rather than the session's, which goes
+        # back to the pool on every batch commit. Commit straight after
+        # locking so the connection does not sit idle in a transaction.
+        engine = db.bind
+        assert isinstance(engine, AsyncEngine)
+        lock_key = func.hashtext(_CLEANUP_ADVISORY_LOCK_NAME)
+        async with engine.connect() as conn:
+            acquired = bool(
+                await conn.scalar(select(func.pg_try_advisory_lock(lock_key)))
+            )
+            await conn.commit()
+            try:
+                yield acquired
+            finally:
+                if acquired:
+                    await conn.execute(select(func.pg_advisory_unlock(lock_key)))
+                    await conn.commit()
+    finally:
+        _cleanup_run_lock.release()
+
+
 async def cleanup_old_data(
     db: AsyncSession,
     retention_days: int,
     dry_run: bool = False,
     raw_packet_retention_days: int | None = None,
+    chunk_size: int = DEFAULT_CLEANUP_CHUNK_SIZE,
+    max_batches: int | None = None,
+    session_factory: (
+        Callable[[], AbstractAsyncContextManager[AsyncSession]] | None
+    ) = None,
 ) -> CleanupStats:
     """Delete event data older than the retention period.
 
@@ -69,6 +153,13 @@ async def cleanup_old_data(
         raw_packet_retention_days: Days to retain raw packets (falls back to
             ``retention_days`` when None). Raw-packet cleanup runs whenever data
             cleanup runs, independent of whether capture is currently enabled.
+        chunk_size: Maximum rows deleted (and committed) per batch
+        max_batches: Stop each table after this many batches; the rest is
+            picked up by the next run. None means no limit.
+        session_factory: Opens a new session (e.g.
+            ``DatabaseManager.async_session``). When given on a backend with
+            concurrent writers, each table is cleaned in its own session in
+            parallel; otherwise tables are cleaned one after another on ``db``.
 
     Returns:
         CleanupStats object with deletion counts
@@ -90,35 +181,56 @@ async def cleanup_old_data(
         cutoff_date.isoformat(),
     )
 
-    # Clean up advertisements
-    stats.advertisements_deleted = await _cleanup_table(
-        db, Advertisement, cutoff_date, "advertisements", dry_run
-    )
-
-    # Clean up messages
-    stats.messages_deleted = await _cleanup_table(
-        db, Message, cutoff_date, "messages", dry_run
-    )
-
-    # Clean up telemetry
-    stats.telemetry_deleted = await _cleanup_table(
-        db, Telemetry, cutoff_date, "telemetry", dry_run
-    )
-
-    # Clean up trace paths
-    stats.trace_paths_deleted = await _cleanup_table(
-        db, TracePath, cutoff_date, "trace_paths", dry_run
-    )
-
-    # Clean up event logs
-    stats.event_logs_deleted = await _cleanup_table(
-        db, EventLog, cutoff_date, "event_logs", dry_run
-    )
+    # (model, cutoff, table name) per event table; raw packets have their own
+    # retention window.
+    tables: list[tuple[type, datetime, str]] = [
+        (Advertisement, cutoff_date, "advertisements"),
+        (Message, cutoff_date, "messages"),
+        (Telemetry, cutoff_date, "telemetry"),
+        (TracePath, cutoff_date, "trace_paths"),
+        (EventLog, cutoff_date, "event_logs"),
+        (RawPacket, raw_packet_cutoff, "raw_packets"),
+    ]
 
-    # Clean up raw packets (independent retention window)
-    stats.raw_packets_deleted = await _cleanup_table(
-        db, RawPacket, raw_packet_cutoff, "raw_packets", dry_run
-    )
+    if session_factory is not None and _supports_concurrent_cleanup(db):
+        # Each table is an independent DELETE, so give each its own session
+        # (and connection) and run them side by side, capped so cleanup never
+        # takes over the whole pool.
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_TABLE_CLEANUPS)
+
+        async def cleanup_in_own_session(
+            model: type, cutoff: datetime, table_name: str
+        ) -> int:
+            async with semaphore, session_factory() as session:
+                return await _cleanup_table(
+                    session,
+                    model,
+                    cutoff,
+                    table_name,
+                    dry_run,
+                    chunk_size,
+                    max_batches,
+                )
+
+        counts = list(
+            await asyncio.gather(*(cleanup_in_own_session(*table) for table in tables))
+        )
+    else:
+        counts = [
+            await _cleanup_table(
+                db, model, cutoff, table_name, dry_run, chunk_size, max_batches
+            )
+            for model, cutoff, table_name in tables
+        ]
+
+    (
+        stats.advertisements_deleted,
+        stats.messages_deleted,
+        stats.telemetry_deleted,
+        stats.trace_paths_deleted,
+        stats.event_logs_deleted,
+        stats.raw_packets_deleted,
+    ) = counts
 
     stats.total_deleted = (
         stats.advertisements_deleted
@@ -141,6 +253,15 @@ async def cleanup_old_data(
     return stats
 
 
+def _supports_concurrent_cleanup(db: AsyncSession) -> bool:
+    """Whether per-table DELETEs can usefully run in parallel on this backend.
+
+    SQLite allows a single writer at a time, so parallel DELETEs would only
+    queue on the database lock (and risk ``database is locked``).
+    """
+    return db.get_bind().dialect.name != "sqlite"
+
+
 def _observer_node_id_union() -> CompoundSelect:
     """Union of observer_node_id across every event source (excluding NULLs)."""
     return union(
@@ -191,6 +312,7 @@ async def recompute_observer_flags(db: AsyncSession, dry_run: bool = False) -> i
             update(Node)
             .where(Node.is_observer.is_(True), stale)
             .values(is_observer=False)
+            .execution_options(synchronize_session=False)
         )
         result = await db.execute(upd)
         count = result.rowcount or 0  # type: ignore[attr-defined]
@@ -205,12 +327,118 @@ async def recompute_observer_flags(db: AsyncSession, dry_run: bool = False) -> i
     return count
 
 
+class _ExplainJson(Executable, ClauseElement):
+    """``EXPLAIN (FORMAT JSON)`` wrapper around a SELECT (Postgres only)."""
+
+    inherit_cache = False
+
+    def __init__(self, statement: Select) -> None:
+        self.statement = statement
+
+
+@compiles(_ExplainJson, "postgresql")
+def _compile_explain_json(
+    element: _ExplainJson, compiler: SQLCompiler, **kw: Any
+) -> str:
+    return "EXPLAIN (FORMAT JSON) " + compiler.process(element.statement, **kw)
+
+
+def _plan_rows(plan: Any) -> int:
+    """Extract the top node's ``Plan Rows`` from EXPLAIN (FORMAT JSON) output.
+
+    psycopg decodes the json column; asyncpg hands it back as a string.
+    """
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+async def _estimate_rows(
+    db: AsyncSession,
+    model: type,
+    criteria: ColumnElement[bool],
+) -> tuple[int, bool]:
+    """Count rows matching ``criteria`` for a dry run.
+
+    On Postgres this reads the planner's row estimate instead of running
+    COUNT(*), which on a large event table costs as much as the DELETE it
+    previews. Other backends get an exact COUNT(*).
+
+    Returns:
+        Tuple of (row count, whether the count is a planner estimate)
+    """
+    if db.get_bind().dialect.name == "postgresql":
+        stmt = select(model.id).where(criteria)  # type: ignore[attr-defined]
+        result = await db.execute(_ExplainJson(stmt))
+        return _plan_rows(result.scalar()), True
+
+    result = await db.execute(select(func.count()).select_from(model).where(criteria))
+    return result.scalar() or 0, False
+
+
+async def _has_rows(
+    db: AsyncSession,
+    model: type,
+    criteria: ColumnElement[bool],
+) -> bool:
+    """Return whether any row matches ``criteria``.
+
+    A ``LIMIT 1`` probe stops at the first match on the created_at index,
+    so checking an up-to-date table costs a single index lookup.
+    """
+    stmt = select(model.id).where(criteria).limit(1)  # type: ignore[attr-defined]
+    result = await db.execute(stmt)
+    return result.first() is not None
+
+
+async def _delete_in_chunks(
+    db: AsyncSession,
+    model: type,
+    criteria: ColumnElement[bool],
+    chunk_size: int,
+    max_batches: int | None,
+) -> int:
+    """Delete rows matching ``criteria`` in committed batches of ``chunk_size``.
+
+    Each batch deletes ``id IN (SELECT id ... LIMIT chunk_size)``, which both
+    SQLite and Postgres accept, and is committed before the next one starts.
+
+    The DELETE skips identity-map synchronization (``synchronize_session=
+    False``): otherwise SQLAlchemy would fetch the matched ids just to evict
+    objects this session never loaded. Any deleted row already loaded into
+    ``db`` stays in the session, looking present, until the commit expires it.
+
+    Returns:
+        Total number of rows deleted
+    """
+    ids = select(model.id).where(criteria).limit(chunk_size)  # type: ignore[attr-defined]
+    stmt = (
+        delete(model)
+        .where(model.id.in_(ids))  # type: ignore[attr-defined]
+        .execution_options(synchronize_session=False)
+    )
+
+    total = 0
+    batches = 0
+    while max_batches is None or batches < max_batches:
+        result = await db.execute(stmt)
+        await db.commit()
+        count = result.rowcount or 0  # type: ignore[attr-defined]
+        total += count
+        batches += 1
+        if count < chunk_size:
+            break
+    return total
+
+
 async def _cleanup_table(
     db: AsyncSession,
     model: type,
     cutoff_date: datetime,
     table_name: str,
     dry_run: bool,
+    chunk_size: int = DEFAULT_CLEANUP_CHUNK_SIZE,
+    max_batches: int | None = None,
 ) -> int:
     """Delete old records from a specific table.
 
@@ -220,23 +448,28 @@ async def _cleanup_table(
         cutoff_date: Delete records older than this date
         table_name: Name of table for logging
         dry_run: If True, only count without deleting
+        chunk_size: Maximum rows deleted (and committed) per batch
+        max_batches: Stop after this many batches (None means no limit)
 
     Returns:
         Number of records deleted (or would be deleted in dry_run)
     """
-    from sqlalchemy import select
+    expired = model.created_at < cutoff_date  # type: ignore[attr-defined]
 
-    if dry_run:
-        # Count records that would be deleted
-        stmt = (
-            select(func.count())
-            .select_from(model)
-            .where(model.created_at < cutoff_date)  # type: ignore[attr-defined]
+    # Frequent runs usually find nothing expired: skip the count/estimate
+    # and the (committed) DELETE batch entirely in that case.
+    if not await _has_rows(db, model, expired):
+        logger.debug(
+            "No records in %s older than %s", table_name, cutoff_date.isoformat()
         )
-        result = await db.execute(stmt)
-        count = result.scalar() or 0
+        return 0
+
+    if dry_run:
+        # Count (or, on Postgres, estimate) records that would be deleted
+        count, estimated = await _estimate_rows(db, model, expired)
         logger.debug(
-            "[DRY RUN] Would delete %d records from %s older than %s",
+            "[DRY RUN] Would delete %s%d records from %s older than %s",
+            "~" if estimated else "",
             count,
             table_name,
             cutoff_date.isoformat(),
@@ -244,8 +477,7 @@ async def _cleanup_table(
         return count
     else:
         # Delete old records
-        result = await db.execute(delete(model).where(model.created_at < cutoff_date))  # type: ignore[attr-defined]
-        count = result.rowcount or 0  # type: ignore[attr-defined]
+        count = await _delete_in_chunks(db, model, expired, chunk_size, max_batches)
         logger.debug(
             "Deleted %d records from %s older than %s",
             count,
@@ -259,16 +491,24 @@ async def cleanup_inactive_nodes(
     db: AsyncSession,
     inactivity_days: int,
     dry_run: bool = False,
+    chunk_size: int = DEFAULT_CLEANUP_CHUNK_SIZE,
+    max_batches: int | None = None,
 ) -> int:
     """Delete nodes that haven't been seen for the specified number of days.
 
     Only deletes nodes where last_seen is older than the cutoff date.
     Nodes with last_seen=NULL are NOT deleted (never seen on network).
 
+    Dependent rows are handled by the foreign keys in the same DELETE: tags,
+    profile adoptions, event observers and route memberships cascade away,
+    while event rows keep their history with the node reference set to NULL.
+
     Args:
         db: Database session
         inactivity_days: Delete nodes not seen for this many days
         dry_run: If True, only count without deleting
+        chunk_size: Maximum nodes deleted (and committed) per batch
+        max_batches: Stop after this many batches (None means no limit)
 
     Returns:
         Number of nodes deleted (or would be deleted in dry_run)
@@ -283,18 +523,14 @@ async def cleanup_inactive_nodes(
     )
 
     if dry_run:
-        # Count nodes that would be deleted
+        # Count (or, on Postgres, estimate) nodes that would be deleted
         # Only count nodes with last_seen < cutoff (excludes NULL last_seen)
-        stmt = (
-            select(func.count())
-            .select_from(Node)
-            .where(Node.last_seen < cutoff_date)
-            .where(Node.last_seen.isnot(None))
+        count, estimated = await _estimate_rows(
+            db, Node, and_(Node.last_seen < cutoff_date, Node.last_seen.isnot(None))
         )
-        result = await db.execute(stmt)
-        count = result.scalar() or 0
         logger.info(
-            "[DRY RUN] Would delete %d nodes not seen since %s",
+            "[DRY RUN] Would delete %s%d nodes not seen since %s",
+            "~" if estimated else "",
             count,
             cutoff_date.isoformat(),
         )
@@ -302,13 +538,13 @@ async def cleanup_inactive_nodes(
     else:
         # Delete inactive nodes
         # Only delete nodes with last_seen < cutoff (excludes NULL last_seen)
-        result = await db.execute(
-            delete(Node)
-            .where(Node.last_seen < cutoff_date)
-            .where(Node.last_seen.isnot(None))
+        count = await _delete_in_chunks(
+            db,
+            Node,
+            and_(Node.last_seen < cutoff_date, Node.last_seen.isnot(None)),
+            chunk_size,
+            max_batches,
         )
-        await db.commit()
-        count = result.rowcount or 0  # type: ignore[attr-defined]
         logger.info(
             "Deleted %d nodes not seen since %s",
             count,
@@ -348,7 +584,11 @@ async def cleanup_orphaned_node_relations(
             result = await db.execute(count_stmt)
             count = result.scalar() or 0
         else:
-            del_stmt = delete(model).where(~subq.exists())
+            del_stmt = (
+                delete(model)
+                .where(~subq.exists())
+                .execution_options(synchronize_session=False)
+            )
             result = await db.execute(del_stmt)
             count = result.rowcount or 0  # type: ignore[attr-defined]
 
@@ -1039,58 +1039,69 @@ def cleanup_cmd(
         cleanup_old_data,
         cleanup_inactive_nodes,
         cleanup_orphaned_node_relations,
+        exclusive_cleanup,
     )
 
     # Initialize database
     db = DatabaseManager(ctx.obj["database_url"])
 
     # Run cleanup
-    async def run_cleanup() -> None:
+    async def run_cleanup() -> bool:
         async with db.async_session() as session:
-            stats = await cleanup_old_data(
-                session,
-                retention_days,
-                dry_run=dry_run,
-            )
-
-            click.echo("")
-            click.echo("Cleanup results:")
-            click.echo(f"  Advertisements: {stats.advertisements_deleted}")
-            click.echo(f"  Messages: {stats.messages_deleted}")
-            click.echo(f"  Telemetry: {stats.telemetry_deleted}")
-            click.echo(f"  Trace paths: {stats.trace_paths_deleted}")
-            click.echo(f"  Event logs: {stats.event_logs_deleted}")
-            click.echo(f"  Total: {stats.total_deleted}")
-
-            if node_cleanup:
-                click.echo("")
-                nodes_deleted = await cleanup_inactive_nodes(
-                    session,
-                    node_cleanup_days,
-                    dry_run=dry_run,
-                )
-                mode = "would be" if dry_run else "were"
-                click.echo(
-                    f"  Inactive nodes {mode} deleted: {nodes_deleted}"
-                    f" (older than {node_cleanup_days} days)"
-                )
+            async with exclusive_cleanup(session) as acquired:
+                if not acquired:
+                    return False
 
-                orphan_counts = await cleanup_orphaned_node_relations(
+                stats = await cleanup_old_data(
                     session,
+                    retention_days,
                     dry_run=dry_run,
+                    session_factory=db.async_session,
                 )
-                if any(orphan_counts.values()):
-                    click.echo("  Orphaned relations:")
-                    for table_name, count in orphan_counts.items():
-                        if count > 0:
-                            click.echo(f"    {table_name}: {count}")
 
-            if dry_run:
                 click.echo("")
-                click.echo("(Dry run - no data was actually deleted)")
+                click.echo("Cleanup results:")
+                click.echo(f"  Advertisements: {stats.advertisements_deleted}")
+                click.echo(f"  Messages: {stats.messages_deleted}")
+                click.echo(f"  Telemetry: {stats.telemetry_deleted}")
+                click.echo(f"  Trace paths: {stats.trace_paths_deleted}")
+                click.echo(f"  Event logs: {stats.event_logs_deleted}")
+                click.echo(f"  Total: {stats.total_deleted}")
+
+                if node_cleanup:
+                    click.echo("")
+                    nodes_deleted = await cleanup_inactive_nodes(
+                        session,
+                        node_cleanup_days,
+                        dry_run=dry_run,
+                    )
+                    mode = "would be" if dry_run else "were"
+                    click.echo(
+                        f"  Inactive nodes {mode} deleted: {nodes_deleted}"
+                        f" (older than {node_cleanup_days} days)"
+                    )
+
+                    orphan_counts = await cleanup_orphaned_node_relations(
+                        session,
+                        dry_run=dry_run,
+                    )
+                    if any(orphan_counts.values()):
+                        click.echo("  Orphaned relations:")
+                        for table_name, count in orphan_counts.items():
+                            if count > 0:
+                                click.echo(f"    {table_name}: {count}")
+
+                if dry_run:
+                    click.echo("")
+                    click.echo("(Dry run - no data was actually deleted)")
 
-    asyncio.run(run_cleanup())
+                return True
+
+    completed = asyncio.run(run_cleanup())
     db.dispose()
+    if not completed:
+        click.echo("Error: another cleanup run is in progress.", err=True)
+        return
     click.echo("")
     click.echo("Cleanup complete." if not dry_run else "Dry run complete.")
 
@@ -5,11 +5,16 @@ from datetime import datetime, timedelta, timezone
 from typing import Any, Optional
 
 from sqlalchemy import select
-from sqlalchemy.exc import IntegrityError
 
 from meshcore_hub.common.database import DatabaseManager
 from meshcore_hub.common.hash_utils import compute_advertisement_hash
-from meshcore_hub.common.models import Advertisement, Node, add_event_observer
+from meshcore_hub.common.models import (
+    Advertisement,
+    Node,
+    add_event_observer,
+    insert_event,
+    touch_node,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -111,57 +116,11 @@ def handle_advertisement(
 
     with db.session_scope() as session:
         # Find or create receiver node first (needed for both new and duplicate events)
-        receiver_node = None
-        if public_key:
-            receiver_query = select(Node).where(Node.public_key == public_key)
-            receiver_node = session.execute(receiver_query).scalar_one_or_none()
-
-            if not receiver_node:
-                receiver_node = Node(
-                    public_key=public_key,
-                    first_seen=now,
-                    last_seen=now,
-                )
-                session.add(receiver_node)
-                session.flush()
-            else:
-                receiver_node.last_seen = now
-
-        # Check if advertisement with same hash already exists
-        existing = session.execute(
-            select(Advertisement.id).where(Advertisement.event_hash == event_hash)
-        ).scalar_one_or_none()
-
-        if existing:
-            # Still update advertised node's last_seen even for duplicate advertisements
-            node_query = select(Node).where(Node.public_key == adv_public_key)
-            node = session.execute(node_query).scalar_one_or_none()
-            if node:
-                if lat is not None:
-                    node.lat = lat
-                if lon is not None:
-                    node.lon = lon
-                node.last_seen = now
-
-            # Add this receiver to the junction table
-            if receiver_node:
-                added = add_event_observer(
-                    session=session,
-                    event_type="advertisement",
-                    event_hash=event_hash,
-                    observer_node_id=receiver_node.id,
-                    snr=snr,
-                    path_len=path_len,
-                    observed_at=now,
-                )
-                if added:
-                    logger.debug(
-                        f"Added receiver {public_key[:12]}... to advertisement "
-                        f"(hash={event_hash[:8]}...)"
-                    )
-            return event_hash
+        receiver_id = touch_node(session, public_key, now) if public_key else None
 
-        # Find or create advertised node
+        # Find or create advertised node. Duplicates carry the same name, type
+        # and flags (they are part of the hash), so refreshing them is harmless
+        # and keeps last_seen/location current for every observation.
         node_query = select(Node).where(Node.public_key == adv_public_key)
         node = session.execute(node_query).scalar_one_or_none()
 
@@ -193,55 +152,44 @@ def handle_advertisement(
             session.add(node)
             session.flush()
 
-        # Create advertisement record
-        advertisement = Advertisement(
-            observer_node_id=receiver_node.id if receiver_node else None,
-            node_id=node.id,
-            public_key=adv_public_key,
-            name=name,
-            adv_type=adv_type,
-            flags=flags,
-            received_at=now,
-            event_hash=event_hash,
-            packet_hash=packet_hash,
-            route_type=route_type,
-            advert_timestamp=advert_timestamp_dt,
+        # Insert the advertisement; an existing row with the same hash is kept
+        inserted = insert_event(
+            session,
+            Advertisement,
+            {
+                "observer_node_id": receiver_id,
+                "node_id": node.id,
+                "public_key": adv_public_key,
+                "name": name,
+                "adv_type": adv_type,
+                "flags": flags,
+                "received_at": now,
+                "event_hash": event_hash,
+                "packet_hash": packet_hash,
+                "route_type": route_type,
+                "advert_timestamp": advert_timestamp_dt,
+            },
         )
-        session.add(advertisement)
 
-        # Add first receiver to junction table
-        if receiver_node:
-            add_event_observer(
+        # Record this receiver in the junction table for new and duplicate events
+        if receiver_id:
+            added = add_event_observer(
                 session=session,
                 event_type="advertisement",
                 event_hash=event_hash,
-                observer_node_id=receiver_node.id,
+                observer_node_id=receiver_id,
                 snr=snr,
                 path_len=path_len,
                 observed_at=now,
             )
-
-        # Flush to check for duplicate constraint violation (race condition)
-        try:
-            session.flush()
-        except IntegrityError:
-            # Race condition: another request inserted the same event_hash
-            session.rollback()
-            logger.debug(
-                f"Duplicate advertisement skipped (race condition, "
-                f"hash={event_hash[:8]}...)"
-            )
-            # Re-add receiver to existing event in a new transaction
-            if receiver_node:
-                add_event_observer(
-                    session=session,
-                    event_type="advertisement",
-                    event_hash=event_hash,
-                    observer_node_id=receiver_node.id,
-                    snr=snr,
-                    path_len=path_len,
-                    observed_at=now,
+            if added and not inserted:
+                logger.debug(
+                    "Added receiver %.12s... to advertisement (hash=%.8s...)",
+                    public_key,
+                    event_hash,
                 )
+
+        if not inserted:
             return event_hash
 
     logger.info(
@@ -4,10 +4,8 @@ import logging
 from datetime import datetime, timezone
 from typing import Any
 
-from sqlalchemy import select
-
 from meshcore_hub.common.database import DatabaseManager
-from meshcore_hub.common.models import EventLog, Node
+from meshcore_hub.common.models import EventLog, touch_node
 
 logger = logging.getLogger(__name__)
 
@@ -33,29 +31,15 @@ def handle_event_log(
 
     with db.session_scope() as session:
         # Find receiver node
-        receiver_node = None
-        if public_key:
-            receiver_query = select(Node).where(Node.public_key == public_key)
-            receiver_node = session.execute(receiver_query).scalar_one_or_none()
-
-            if not receiver_node:
-                receiver_node = Node(
-                    public_key=public_key,
-                    first_seen=now,
-                    last_seen=now,
-                )
-                session.add(receiver_node)
-                session.flush()
-            else:
-                receiver_node.last_seen = now
+        receiver_id = touch_node(session, public_key, now) if public_key else None
 
         # Create event log record
         event_log = EventLog(
-            observer_node_id=receiver_node.id if receiver_node else None,
+            observer_node_id=receiver_id,
             event_type=event_type,
             payload=payload,
             received_at=now,
         )
         session.add(event_log)
 
-    logger.debug(f"Logged event: {event_type}")
+    logger.debug("Logged event: %s", event_type)
@@ -5,11 +5,15 @@ from datetime import datetime, timezone
 from typing import Any, Optional
 
 from sqlalchemy import select
-from sqlalchemy.exc import IntegrityError
 
 from meshcore_hub.common.database import DatabaseManager
 from meshcore_hub.common.hash_utils import compute_message_hash
-from meshcore_hub.common.models import Message, Node, add_event_observer
+from meshcore_hub.common.models import (
+    Message,
+    add_event_observer,
+    insert_event,
+    touch_node,
+)
 from meshcore_hub.collector.spam import (
     compute_path_prefix,
     get_spam_config,
@@ -118,57 +122,28 @@ def _handle_message(
 
     with db.session_scope() as session:
         # Find or create receiver node first (needed for both new and duplicate events)
-        receiver_node = None
-        if public_key:
-            receiver_query = select(Node).where(Node.public_key == public_key)
-            receiver_node = session.execute(receiver_query).scalar_one_or_none()
-
-            if not receiver_node:
-                receiver_node = Node(
-                    public_key=public_key,
-                    first_seen=now,
-                    last_seen=now,
-                )
-                session.add(receiver_node)
-                session.flush()
-            else:
-                receiver_node.last_seen = now
-
-        # Check if message with same hash already exists
-        existing = session.execute(
-            select(Message.id).where(Message.event_hash == event_hash)
-        ).scalar_one_or_none()
-
-        if existing:
-            # Event already exists - just add this receiver to the junction table
-            if receiver_node:
-                added = add_event_observer(
-                    session=session,
-                    event_type="message",
-                    event_hash=event_hash,
-                    observer_node_id=receiver_node.id,
-                    snr=snr,
-                    path_len=path_len,
-                    observed_at=now,
-                )
-                if added:
-                    logger.debug(
-                        f"Added receiver {public_key[:12]}... to message "
-                        f"(hash={event_hash[:8]}...)"
-                    )
-            return event_hash
+        receiver_id = touch_node(session, public_key, now) if public_key else None
 
         # Spam scoring (online): only on the first insert of an event_hash, and
         # only when the feature is switched on. When off, the columns stay null
         # exactly as before. Counts existing rows (priors), so the leading edge
         # of a burst scores low until the background re-scoring sweep catches it.
+        # Scoring is the one step worth skipping for duplicates, so only then is
+        # the hash checked up front; otherwise the insert alone deduplicates.
         cfg = get_spam_config()
+        duplicate = (
+            cfg.enabled
+            and session.execute(
+                select(Message.id).where(Message.event_hash == event_hash).limit(1)
+            ).first()
+            is not None
+        )
         spam_score: float | None = None
         path_prefix: str | None = None
         sender_normalized: str | None = None
         spam_path_count = 0
         spam_name_count = 0
-        if cfg.enabled:
+        if cfg.enabled and not duplicate:
             sender_normalized = normalize_sender(payload.get("sender_name"))
             if path_len is not None and path_len >= cfg.min_path_hops:
                 path_prefix = compute_path_prefix(
@@ -186,59 +161,49 @@ def _handle_message(
             spam_path_count = result.path_count
             spam_name_count = result.name_count
 
-        # Create message record
-        message = Message(
-            observer_node_id=receiver_node.id if receiver_node else None,
-            message_type=message_type,
-            pubkey_prefix=pubkey_prefix,
-            channel_idx=channel_idx,
-            text=text,
-            path_len=path_len,
-            txt_type=txt_type,
-            signature=signature,
-            snr=snr,
-            sender_timestamp=sender_timestamp,
-            received_at=now,
-            event_hash=event_hash,
-            packet_hash=packet_hash,
-            path_prefix=path_prefix,
-            sender_normalized=sender_normalized,
-            spam_score=spam_score,
+        # Insert the message; an existing row with the same hash is left untouched
+        inserted = not duplicate and insert_event(
+            session,
+            Message,
+            {
+                "observer_node_id": receiver_id,
+                "message_type": message_type,
+                "pubkey_prefix": pubkey_prefix,
+                "channel_idx": channel_idx,
+                "text": text,
+                "path_len": path_len,
+                "txt_type": txt_type,
+                "signature": signature,
+                "snr": snr,
+                "sender_timestamp": sender_timestamp,
+                "received_at": now,
+                "event_hash": event_hash,
+                "packet_hash": packet_hash,
+                "path_prefix": path_prefix,
+                "sender_normalized": sender_normalized,
+                "spam_score": spam_score,
+            },
         )
-        session.add(message)
 
-        # Add first receiver to junction table
-        if receiver_node:
-            add_event_observer(
+        # Record this receiver in the junction table for new and duplicate events
+        if receiver_id:
+            added = add_event_observer(
                 session=session,
                 event_type="message",
                 event_hash=event_hash,
-                observer_node_id=receiver_node.id,
+                observer_node_id=receiver_id,
                 snr=snr,
                 path_len=path_len,
                 observed_at=now,
             )
-
-        # Flush to check for duplicate constraint violation (race condition)
-        try:
-            session.flush()
-        except IntegrityError:
-            # Race condition: another request inserted the same event_hash
-            session.rollback()
-            logger.debug(
-                f"Duplicate message skipped (race condition, hash={event_hash[:8]}...)"
-            )
-            # Re-add receiver to existing event in a new transaction
-            if receiver_node:
-                add_event_observer(
-                    session=session,
-                    event_type="message",
-                    event_hash=event_hash,
-                    observer_node_id=receiver_node.id,
-                    snr=snr,
-                    path_len=path_len,
-                    observed_at=now,
+            if added and not inserted:
+                logger.debug(
+                    "Added receiver %.12s... to message (hash=%.8s...)",
+                    public_key,
+                    event_hash,
                 )
+
+        if not inserted:
             return event_hash
 
     # Surface the spam score (and the signals that drove it) in the log so it is
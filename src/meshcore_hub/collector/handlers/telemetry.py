@@ -5,11 +5,16 @@ from datetime import datetime, timezone
 from typing import Any, Optional
 
 from sqlalchemy import select
-from sqlalchemy.exc import IntegrityError
 
 from meshcore_hub.common.database import DatabaseManager
 from meshcore_hub.common.hash_utils import compute_telemetry_hash
-from meshcore_hub.common.models import Node, Telemetry, add_event_observer
+from meshcore_hub.common.models import (
+    Node,
+    Telemetry,
+    add_event_observer,
+    insert_event,
+    touch_node,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -66,45 +71,7 @@ def handle_telemetry(
 
     with db.session_scope() as session:
         # Find or create receiver node first (needed for both new and duplicate events)
-        receiver_node = None
-        if public_key:
-            receiver_query = select(Node).where(Node.public_key == public_key)
-            receiver_node = session.execute(receiver_query).scalar_one_or_none()
-
-            if not receiver_node:
-                receiver_node = Node(
-                    public_key=public_key,
-                    first_seen=now,
-                    last_seen=now,
-                )
-                session.add(receiver_node)
-                session.flush()
-            else:
-                receiver_node.last_seen = now
-
-        # Check if telemetry with same hash already exists
-        existing = session.execute(
-            select(Telemetry.id).where(Telemetry.event_hash == event_hash)
-        ).scalar_one_or_none()
-
-        if existing:
-            # Event already exists - just add this receiver to the junction table
-            if receiver_node:
-                added = add_event_observer(
-                    session=session,
-                    event_type="telemetry",
-                    event_hash=event_hash,
-                    observer_node_id=receiver_node.id,
-                    snr=snr,
-                    path_len=path_len,
-                    observed_at=now,
-                )
-                if added:
-                    logger.debug(
-                        f"Added receiver {public_key[:12]}... to telemetry "
-                        f"(node={node_public_key[:12]}...)"
-                    )
-            return event_hash
+        receiver_id = touch_node(session, public_key, now) if public_key else None
 
         # Find or create reporting node
         reporting_node = None
@@ -123,51 +90,40 @@ def handle_telemetry(
             else:
                 reporting_node.last_seen = now
 
-        # Create telemetry record
-        telemetry = Telemetry(
-            observer_node_id=receiver_node.id if receiver_node else None,
-            node_id=reporting_node.id if reporting_node else None,
-            node_public_key=node_public_key,
-            lpp_data=lpp_bytes,
-            parsed_data=parsed_data,
-            received_at=now,
-            event_hash=event_hash,
+        # Insert the telemetry; an existing row with the same hash is left untouched
+        inserted = insert_event(
+            session,
+            Telemetry,
+            {
+                "observer_node_id": receiver_id,
+                "node_id": reporting_node.id if reporting_node else None,
+                "node_public_key": node_public_key,
+                "lpp_data": lpp_bytes,
+                "parsed_data": parsed_data,
+                "received_at": now,
+                "event_hash": event_hash,
+            },
         )
-        session.add(telemetry)
 
-        # Add first receiver to junction table
-        if receiver_node:
-            add_event_observer(
+        # Record this receiver in the junction table for new and duplicate events
+        if receiver_id:
+            added = add_event_observer(
                 session=session,
                 event_type="telemetry",
                 event_hash=event_hash,
-                observer_node_id=receiver_node.id,
+                observer_node_id=receiver_id,
                 snr=snr,
                 path_len=path_len,
                 observed_at=now,
             )
-
-        # Flush to check for duplicate constraint violation (race condition)
-        try:
-            session.flush()
-        except IntegrityError:
-            # Race condition: another request inserted the same event_hash
-            session.rollback()
-            logger.debug(
-                f"Duplicate telemetry skipped (race condition, "
-                f"node={node_public_key[:12]}...)"
-            )
-            # Re-add receiver to existing event in a new transaction
-            if receiver_node:
-                add_event_observer(
-                    session=session,
-                    event_type="telemetry",
-                    event_hash=event_hash,
-                    observer_node_id=receiver_node.id,
-                    snr=snr,
-                    path_len=path_len,
-                    observed_at=now,
+            if added and not inserted:
+                logger.debug(
+                    "Added receiver %.12s... to telemetry (node=%.12s...)",
+                    public_key,
+                    node_public_key,
                 )
+
+        if not inserted:
             return event_hash
 
     # Log telemetry values
@@ -1,18 +1,59 @@
 """Handler for trace data events."""
 
 import logging
+import threading
+import time
+from collections import OrderedDict
 from datetime import datetime, timezone
 from typing import Any, Optional
 
-from sqlalchemy import select
-from sqlalchemy.exc import IntegrityError
-
 from meshcore_hub.common.database import DatabaseManager
 from meshcore_hub.common.hash_utils import compute_trace_hash
-from meshcore_hub.common.models import Node, TracePath, add_event_observer
+from meshcore_hub.common.models import (
+    TracePath,
+    add_event_observer,
+    insert_event,
+    touch_node,
+)
 
 logger = logging.getLogger(__name__)
 
+# Hashes of traces stored in the last few minutes. Every receiver that hears a
+# trace reports it, so most trace events are duplicates; a hit here skips the
+# INSERT attempt and goes straight to recording the extra observer. The
+# partial unique index on event_hash remains the source of truth.
+_RECENT_TRACE_TTL = 300.0
+_RECENT_TRACE_MAXSIZE = 10_000
+_recent_trace_hashes: OrderedDict[str, float] = OrderedDict()
+_recent_trace_lock = threading.Lock()
+
+
+def _trace_seen_recently(event_hash: str) -> bool:
+    """Return True if ``event_hash`` was stored within the TTL."""
+    with _recent_trace_lock:
+        expires_at = _recent_trace_hashes.get(event_hash)
+        if expires_at is None:
+            return False
+        if expires_at < time.monotonic():
+            del _recent_trace_hashes[event_hash]
+            return False
+        return True
+
+
+def _remember_trace(event_hash: str) -> None:
+    """Record ``event_hash`` as stored, evicting the oldest past the size cap."""
+    with _recent_trace_lock:
+        _recent_trace_hashes[event_hash] = time.monotonic() + _RECENT_TRACE_TTL
+        _recent_trace_hashes.move_to_end(event_hash)
+        while len(_recent_trace_hashes) > _RECENT_TRACE_MAXSIZE:
+            _recent_trace_hashes.popitem(last=False)
+
+
+def clear_recent_traces() -> None:
+    """Forget all remembered trace hashes (used by tests)."""
+    with _recent_trace_lock:
+        _recent_trace_hashes.clear()
+
 
 def handle_trace_data(
     public_key: str,
@@ -52,94 +93,48 @@ def handle_trace_data(
 
     with db.session_scope() as session:
         # Find or create receiver node first (needed for both new and duplicate events)
-        receiver_node = None
-        if public_key:
-            receiver_query = select(Node).where(Node.public_key == public_key)
-            receiver_node = session.execute(receiver_query).scalar_one_or_none()
-
-            if not receiver_node:
-                receiver_node = Node(
-                    public_key=public_key,
-                    first_seen=now,
-                    last_seen=now,
-                )
-                session.add(receiver_node)
-                session.flush()
-            else:
-                receiver_node.last_seen = now
-
-        # Check if trace with same hash already exists
-        existing = session.execute(
-            select(TracePath.id).where(TracePath.event_hash == event_hash)
-        ).scalar_one_or_none()
-
-        if existing:
-            # Event already exists - just add this receiver to the junction table
-            if receiver_node:
-                added = add_event_observer(
-                    session=session,
-                    event_type="trace",
-                    event_hash=event_hash,
-                    observer_node_id=receiver_node.id,
-                    snr=snr,
-                    path_len=path_len,
-                    observed_at=now,
-                )
-                if added:
-                    logger.debug(
-                        f"Added receiver {public_key[:12]}... to trace "
-                        f"(tag={initiator_tag})"
-                    )
-            return event_hash
-
-        # Create trace path record
-        trace_path = TracePath(
-            observer_node_id=receiver_node.id if receiver_node else None,
-            initiator_tag=initiator_tag,
-            path_len=path_len,
-            flags=flags,
-            auth=auth,
-            path_hashes=path_hashes,
-            snr_values=snr_values,
-            hop_count=hop_count,
-            received_at=now,
-            event_hash=event_hash,
+        receiver_id = touch_node(session, public_key, now) if public_key else None
+
+        # Insert the trace; an existing row with the same hash is left untouched
+        inserted = not _trace_seen_recently(event_hash) and insert_event(
+            session,
+            TracePath,
+            {
+                "observer_node_id": receiver_id,
+                "initiator_tag": initiator_tag,
+                "path_len": path_len,
+                "flags": flags,
+                "auth": auth,
+                "path_hashes": path_hashes,
+                "snr_values": snr_values,
+                "hop_count": hop_count,
+                "received_at": now,
+                "event_hash": event_hash,
+            },
         )
-        session.add(trace_path)
 
-        # Add first receiver to junction table
-        if receiver_node:
-            add_event_observer(
+        # Record this receiver in the junction table for new and duplicate events
+        if receiver_id:
+            added = add_event_observer(
                 session=session,
                 event_type="trace",
                 event_hash=event_hash,
-                observer_node_id=receiver_node.id,
+                observer_node_id=receiver_id,
                 snr=snr,
                 path_len=path_len,
                 observed_at=now,
             )
-
-        # Flush to check for duplicate constraint violation (race condition)
-        try:
-            session.flush()
-        except IntegrityError:
-            # Race condition: another request inserted the same event_hash
-            session.rollback()
-            logger.debug(
-                f"Duplicate trace skipped (race condition, tag={initiator_tag})"
-            )
-            # Re-add receiver to existing event in a new transaction
-            if receiver_node:
-                add_event_observer(
-                    session=session,
-                    event_type="trace",
-                    event_hash=event_hash,
-                    observer_node_id=receiver_node.id,
-                    snr=snr,
-                    path_len=path_len,
-                    observed_at=now,
+            if added and not inserted:
+                logger.debug(
+                    "Added receiver %.12s... to trace (tag=%s)",
+                    public_key,
+                    initiator_tag,
                 )
-            return event_hash
+
+    # Only remember the hash once the row is committed
+    _remember_trace(event_hash)
+    if not inserted:
+        return event_hash
 
     logger.info(f"Stored trace data: tag={initiator_tag}, hops={hop_count}")
     return event_hash
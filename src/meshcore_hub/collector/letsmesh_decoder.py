@@ -9,8 +9,9 @@ from __future__ import annotations
 
 import hashlib
 import logging
-import string
+import re
 import threading
+from collections import OrderedDict
 from typing import Any, NamedTuple
 
 from meshcoredecoder import MeshCoreDecoder
@@ -19,6 +20,8 @@ from meshcoredecoder.types import DecryptionOptions
 
 logger = logging.getLogger(__name__)
 
+_HEX_RE = re.compile(r"[0-9a-fA-F]+")
+
 
 class LetsMeshPacketDecoder:
     """Decode LetsMesh packet payloads with the native Python meshcore-decoder."""
@@ -50,7 +53,10 @@ class LetsMeshPacketDecoder:
             for info in self._channel_key_infos
             if info.label
         }
-        self._decode_cache: dict[str, dict[str, Any] | None] = {}
+        # LRU of decode results keyed by a 16-byte digest of the packet hex,
+        # so the cache holds fixed-size keys rather than full packet strings.
+        self._decode_cache: OrderedDict[bytes, dict[str, Any] | None] = OrderedDict()
+        self._decode_cache_lock = threading.Lock()
         self._decode_cache_maxsize = 2048
         self._key_store = self._build_key_store()
         logger.debug(
@@ -168,12 +174,17 @@ class LetsMeshPacketDecoder:
     @staticmethod
     def _is_hex(value: str) -> bool:
         """Return True if string contains only hex digits."""
-        return bool(value) and all(char in string.hexdigits for char in value)
+        return _HEX_RE.fullmatch(value) is not None
 
     @staticmethod
     def _compute_channel_hash(key_hex: str) -> str:
         """Compute channel hash (first byte of SHA-256 of channel key)."""
-        return hashlib.sha256(bytes.fromhex(key_hex)).digest()[:1].hex().upper()
+        return (
+            hashlib.sha256(bytes.fromhex(key_hex), usedforsecurity=False)
+            .digest()[:1]
+            .hex()
+            .upper()
+        )
 
     def channel_name_from_decoded(
         self,
@@ -224,17 +235,24 @@ class LetsMeshPacketDecoder:
         clean_hex = raw_hex.strip()
         if not clean_hex:
             return None
-        if not self._is_hex(clean_hex):
+        # bytes.fromhex validates the payload in C and normalizes case, so the
+        # digest of the bytes is a case-insensitive cache key.
+        try:
+            raw_bytes = bytes.fromhex(clean_hex)
+        except ValueError:
             logger.debug("LetsMesh decoder skipped non-hex raw payload")
             return None
-        cached = self._decode_cache.get(clean_hex)
-        if clean_hex in self._decode_cache:
-            return cached
+        cache_key = hashlib.blake2b(raw_bytes, digest_size=16).digest()
+        with self._decode_cache_lock:
+            if cache_key in self._decode_cache:
+                self._decode_cache.move_to_end(cache_key)
+                return self._decode_cache[cache_key]
 
         decoded = self._decode_raw(clean_hex)
-        self._decode_cache[clean_hex] = decoded
-        if len(self._decode_cache) > self._decode_cache_maxsize:
-            self._decode_cache.pop(next(iter(self._decode_cache)))
+        with self._decode_cache_lock:
+            self._decode_cache[cache_key] = decoded
+            if len(self._decode_cache) > self._decode_cache_maxsize:
+                self._decode_cache.popitem(last=False)
         return decoded
 
     def _decode_raw(self, raw_hex: str) -> dict[str, Any] | None:
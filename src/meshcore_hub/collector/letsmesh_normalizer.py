@@ -11,6 +11,45 @@ from meshcore_hub.collector.letsmesh_decoder import LetsMeshPacketDecoder
 
 logger = logging.getLogger(__name__)
 
+_UPPER_HEX_RE = re.compile(r"[0-9A-F]+")
+_HEX_RE = re.compile(r"[0-9A-Fa-f]+")
+_PUBLIC_KEY_HEX_RE = re.compile(r"([0-9A-Fa-f]{64})")
+_TEXT_KEYS = ("text", "message", "msg", "body", "content")
+# Upload payload fields that may carry the sender key, in priority order.
+_SENDER_KEYS = (
+    "pubkey_prefix",
+    "sourceHash",
+    "source_hash",
+    "source",
+    "sender",
+    "from",
+    "src",
+)
+# Status fields inspected for the node type, most specific first.
+_ADV_TYPE_KEYS = (
+    "adv_type",
+    "type",
+    "node_type",
+    "role",
+    "mode",
+    "status",
+    "origin",
+    "name",
+    "model",
+)
+# (substring, adv_type) pairs in precedence order. "room" also covers
+# "room server" and "roomserver".
+_ADV_TYPE_TOKENS = (
+    ("room", "room"),
+    ("repeater", "repeater"),
+    ("relay", "repeater"),
+    ("companion", "companion"),
+    ("observer", "companion"),
+    ("chat", "chat"),
+)
+# Numeric LetsMesh node types; 0 (none) and unknown values map to None.
+_NODE_TYPES = {1: "chat", 2: "repeater", 3: "room", 4: "companion"}
+
 
 class LetsMeshNormalizer:
     """Normalize LetsMesh upload topics/payloads into collector event payloads."""
@@ -84,29 +123,37 @@ class LetsMeshNormalizer:
 
         return None
 
+    # Packet types that carry chat text, and the collector event they map to.
+    _MESSAGE_EVENT_TYPES: dict[int | None, str] = {
+        1: "contact_msg_recv",  # PAYLOAD_TYPE_RESPONSE
+        2: "contact_msg_recv",  # PAYLOAD_TYPE_TXT_MSG
+        5: "channel_msg_recv",  # PAYLOAD_TYPE_GRP_TXT
+        7: "contact_msg_recv",  # PAYLOAD_TYPE_ANON_REQ
+    }
+
     def _build_letsmesh_message_payload(
         self,
         payload: dict[str, Any],
-        decoded_packet: dict[str, Any] | None = None,
+        decoded_packet: dict[str, Any] | None,
     ) -> tuple[str, dict[str, Any]] | None:
-        """Build a message payload from LetsMesh packet data when possible."""
+        """Build a message payload from LetsMesh packet data when possible.
+
+        ``decoded_packet`` is the caller's ``decode_payload`` result; None
+        means the packet did not decode and is not retried here.
+        """
         packet_type = self._resolve_letsmesh_packet_type(payload, decoded_packet)
-        if packet_type == 5:
-            event_type = "channel_msg_recv"
-        elif packet_type in {1, 2, 7}:
-            event_type = "contact_msg_recv"
-        else:
+        event_type = self._MESSAGE_EVENT_TYPES.get(packet_type)
+        if event_type is None:
             return None
 
         normalized_payload = dict(payload)
         packet_hash = payload.get("hash")
         packet_hash_text = packet_hash if isinstance(packet_hash, str) else None
-        if decoded_packet is None:
-            decoded_packet = self._letsmesh_decoder.decode_payload(payload)
+
+        channel_hash = self._extract_letsmesh_decoder_channel_hash(decoded_packet)
 
         # Filter test channel messages when not explicitly included.
         if packet_type == 5 and not self._include_test_channel:
-            channel_hash = self._extract_letsmesh_decoder_channel_hash(decoded_packet)
             if (
                 channel_hash
                 and channel_hash.upper() == LetsMeshPacketDecoder.TEST_CHANNEL_HASH
@@ -121,19 +168,21 @@ class LetsMeshNormalizer:
         # In LetsMesh compatibility mode, only show messages that decrypt.
         text = self._extract_letsmesh_decoder_text(decoded_packet)
         if not text:
-            channel_hash = self._extract_letsmesh_decoder_channel_hash(decoded_packet)
-            logger.debug(
-                "Skipping LetsMesh packet %s (type=%s): no decryptable text payload "
-                "(channel_hash=%s, decoded_keys=%s)",
-                packet_hash_text or "unknown",
-                packet_type,
-                channel_hash or "N/A",
-                (
-                    list(decoded_packet.keys())
-                    if isinstance(decoded_packet, dict)
-                    else "N/A"
-                ),
-            )
+            # Undecryptable packets are common; only gather the diagnostics
+            # when they will actually be logged.
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(
+                    "Skipping LetsMesh packet %s (type=%s): no decryptable text "
+                    "payload (channel_hash=%s, decoded_keys=%s)",
+                    packet_hash_text or "unknown",
+                    packet_type,
+                    channel_hash or "N/A",
+                    (
+                        list(decoded_packet.keys())
+                        if isinstance(decoded_packet, dict)
+                        else "N/A"
+                    ),
+                )
             return None
 
         txt_type = self._parse_int(payload.get("txt_type"))
@@ -180,26 +229,20 @@ class LetsMeshNormalizer:
         if sender_name:
             normalized_payload["sender_name"] = sender_name
 
-        if decoded_sender and not normalized_payload.get("pubkey_prefix"):
-            normalized_prefix = self._normalize_pubkey_prefix(decoded_sender)
-            if normalized_prefix:
-                normalized_payload["pubkey_prefix"] = normalized_prefix
-
-        if not normalized_payload.get("pubkey_prefix"):
-            fallback_sender = self._extract_letsmesh_sender_from_payload(payload)
-            if fallback_sender:
-                normalized_payload["pubkey_prefix"] = fallback_sender
-
-        sender_prefix = self._normalize_pubkey_prefix(
-            normalized_payload.get("pubkey_prefix")
-        )
+        # Sender prefix: the uploader's own field, else the decoded sender,
+        # else any sender-like payload field.
+        sender_prefix = payload.get("pubkey_prefix")
+        if not sender_prefix and decoded_sender:
+            sender_prefix = self._normalize_pubkey_prefix(decoded_sender)
+        if not sender_prefix:
+            sender_prefix = self._extract_letsmesh_sender_from_payload(payload)
+        sender_prefix = self._normalize_pubkey_prefix(sender_prefix)
         if sender_prefix:
             normalized_payload["pubkey_prefix"] = sender_prefix
         else:
             normalized_payload.pop("pubkey_prefix", None)
 
         channel_idx = self._parse_int(payload.get("channel_idx"))
-        channel_hash = self._extract_letsmesh_decoder_channel_hash(decoded_packet)
         if channel_idx is None and channel_hash:
             channel_idx = self._parse_channel_hash_idx(channel_hash)
         if channel_idx is not None:
@@ -216,22 +259,17 @@ class LetsMeshNormalizer:
             )
             if channel_label:
                 normalized_payload["channel_name"] = channel_label
-            normalized_payload["text"] = self._prefix_sender_name(
-                text,
-                normalized_payload.get("sender_name"),
-            )
-        else:
-            normalized_payload["text"] = self._prefix_sender_name(
-                text,
-                normalized_payload.get("sender_name"),
-            )
+        normalized_payload["text"] = self._prefix_sender_name(
+            text,
+            sender_name or payload.get("sender_name"),
+        )
 
         return event_type, normalized_payload
 
     def _build_letsmesh_structured_event_payload(
         self,
         payload: dict[str, Any],
-        decoded_packet: dict[str, Any] | None = None,
+        decoded_packet: dict[str, Any] | None,
     ) -> tuple[str, dict[str, Any]] | None:
         """Map LetsMesh packet payloads to native collector event types."""
         packet_type = self._resolve_letsmesh_packet_type(payload, decoded_packet)
@@ -602,11 +640,9 @@ class LetsMeshNormalizer:
     def _build_letsmesh_advertisement_payload(
         self,
         payload: dict[str, Any],
-        decoded_packet: dict[str, Any] | None = None,
+        decoded_packet: dict[str, Any] | None,
     ) -> dict[str, Any] | None:
         """Map decoded LetsMesh packet payloads to advertisement events."""
-        if decoded_packet is None:
-            decoded_packet = self._letsmesh_decoder.decode_payload(payload)
         if not isinstance(decoded_packet, dict):
             return None
 
@@ -712,21 +748,30 @@ class LetsMeshNormalizer:
         payload: dict[str, Any],
         depth: int = 3,
     ) -> str | None:
-        """Extract text from possible LetsMesh packet payload fields."""
+        """Extract text from possible LetsMesh packet payload fields.
+
+        Nested dicts are searched depth-first, up to ``depth`` levels below
+        ``payload``, with an explicit stack rather than recursion.
+        """
         if depth < 0:
             return None
 
-        for key in ("text", "message", "msg", "body", "content"):
-            value = payload.get(key)
-            if isinstance(value, str) and value.strip():
-                return value.strip()
-
-        for nested in payload.values():
-            if not isinstance(nested, dict):
-                continue
-            text = cls._extract_letsmesh_text(nested, depth=depth - 1)
-            if text:
-                return text
+        stack: list[tuple[dict[str, Any], int]] = [(payload, depth)]
+        while stack:
+            current, remaining = stack.pop()
+            for key in _TEXT_KEYS:
+                value = current.get(key)
+                if isinstance(value, str):
+                    text = value.strip()
+                    if text:
+                        return text
+            if remaining:
+                # Reversed so the first nested dict is searched first.
+                stack.extend(
+                    (nested, remaining - 1)
+                    for nested in reversed(current.values())
+                    if isinstance(nested, dict)
+                )
 
         return None
 
@@ -736,10 +781,8 @@ class LetsMeshNormalizer:
         decoded_packet: dict[str, Any] | None,
     ) -> str | None:
         """Extract human-readable text from decoder JSON output."""
-        if not isinstance(decoded_packet, dict):
-            return None
-        payload = decoded_packet.get("payload")
-        if not isinstance(payload, dict):
+        payload = cls._nested_dict(decoded_packet, "payload")
+        if payload is None:
             return None
         return cls._extract_letsmesh_text(payload)
 
@@ -749,16 +792,8 @@ class LetsMeshNormalizer:
         decoded_packet: dict[str, Any] | None,
     ) -> int | None:
         """Extract sender timestamp from decoder JSON output."""
-        if not isinstance(decoded_packet, dict):
-            return None
-        payload = decoded_packet.get("payload")
-        if not isinstance(payload, dict):
-            return None
-        decoded = payload.get("decoded")
-        if not isinstance(decoded, dict):
-            return None
-        decrypted = decoded.get("decrypted")
-        if not isinstance(decrypted, dict):
+        decrypted = cls._nested_dict(decoded_packet, "payload", "decoded", "decrypted")
+        if decrypted is None:
             return None
         return cls._parse_int(decrypted.get("timestamp"))
 
@@ -769,16 +804,11 @@ class LetsMeshNormalizer:
         packet_type: int | None = None,
     ) -> str | None:
         """Extract sender identifier from decoder JSON output."""
-        if not isinstance(decoded_packet, dict):
-            return None
-        payload = decoded_packet.get("payload")
-        if not isinstance(payload, dict):
-            return None
-        decoded = payload.get("decoded")
-        if not isinstance(decoded, dict):
+        decoded = cls._extract_letsmesh_decoder_payload(decoded_packet)
+        if decoded is None:
             return None
-        decrypted = decoded.get("decrypted")
-        if not isinstance(decrypted, dict):
+        decrypted = cls._nested_dict(decoded, "decrypted")
+        if decrypted is None:
             return None
         sender = decrypted.get("sender")
         if isinstance(sender, str) and sender.strip():
@@ -790,17 +820,27 @@ class LetsMeshNormalizer:
         return None
 
     @staticmethod
+    def _nested_dict(value: Any, *path: str) -> dict[str, Any] | None:
+        """Return the dict found by following ``path`` keys through ``value``.
+
+        Returns None as soon as ``value`` or any step along the path is not
+        a dict, so decoder output of any shape can be probed safely.
+        """
+        if not isinstance(value, dict):
+            return None
+        for key in path:
+            value = value.get(key)
+            if not isinstance(value, dict):
+                return None
+        return value
+
+    @classmethod
     def _extract_letsmesh_decoder_payload(
+        cls,
         decoded_packet: dict[str, Any] | None,
     ) -> dict[str, Any] | None:
         """Extract decoded packet payload object."""
-        if not isinstance(decoded_packet, dict):
-            return None
-        payload = decoded_packet.get("payload")
-        if not isinstance(payload, dict):
-            return None
-        decoded = payload.get("decoded")
-        return decoded if isinstance(decoded, dict) else None
+        return cls._nested_dict(decoded_packet, "payload", "decoded")
 
     @staticmethod
     def _extract_response_content_data(value: Any) -> dict[str, Any] | None:
@@ -839,8 +879,9 @@ class LetsMeshNormalizer:
         hashes = self._normalize_hash_list(decoded_packet.get("path"))
         if hashes:
             return hashes
-        payload = decoded_packet.get("payload") or {}
-        inner = payload.get("decoded") or {}
+        inner = self._extract_letsmesh_decoder_payload(decoded_packet)
+        if inner is None:
+            return None
         return self._normalize_hash_list(inner.get("pathHashes"))
 
     @staticmethod
@@ -861,7 +902,7 @@ class LetsMeshNormalizer:
             token = item.strip().upper()
             if len(token) < 2 or len(token) % 2 != 0:
                 continue
-            if any(ch not in "0123456789ABCDEF" for ch in token):
+            if not _UPPER_HEX_RE.fullmatch(token):
                 continue
             normalized.append(token)
         return normalized or None
@@ -881,7 +922,7 @@ class LetsMeshNormalizer:
     @staticmethod
     def _extract_public_key_from_hex(value: str) -> str | None:
         """Extract the first 64-char hex segment from a payload string."""
-        match = re.search(r"([0-9A-Fa-f]{64})", value)
+        match = _PUBLIC_KEY_HEX_RE.search(value)
         if not match:
             return None
         return match.group(1).lower()
@@ -897,7 +938,7 @@ class LetsMeshNormalizer:
         token = value.strip().removeprefix("0x").removeprefix("0X")
         if not token:
             return None
-        if any(ch not in "0123456789ABCDEFabcdef" for ch in token):
+        if not _HEX_RE.fullmatch(token):
             return None
         try:
             return int(token, 16)
@@ -935,18 +976,12 @@ class LetsMeshNormalizer:
     @staticmethod
     def _extract_letsmesh_sender_from_payload(payload: dict[str, Any]) -> str | None:
         """Extract sender-like identifiers from LetsMesh upload payload fields."""
-        for key in (
-            "pubkey_prefix",
-            "sourceHash",
-            "source_hash",
-            "source",
-            "sender",
-            "from",
-            "src",
-        ):
+        for key in _SENDER_KEYS:
             value = payload.get(key)
-            if isinstance(value, str) and value.strip():
-                return value.strip()
+            if isinstance(value, str):
+                value = value.strip()
+                if value:
+                    return value
         return None
 
     @classmethod
@@ -975,33 +1010,28 @@ class LetsMeshNormalizer:
         decoded_packet: dict[str, Any] | None,
     ) -> str | None:
         """Extract channel hash (1-byte hex) from decoder output."""
-        if not isinstance(decoded_packet, dict):
-            return None
-        payload = decoded_packet.get("payload")
-        if not isinstance(payload, dict):
-            return None
-        decoded = payload.get("decoded")
-        if not isinstance(decoded, dict):
+        decoded = cls._extract_letsmesh_decoder_payload(decoded_packet)
+        if decoded is None:
             return None
         channel_hash = decoded.get("channelHash")
         if not isinstance(channel_hash, str):
             return None
-        normalized = channel_hash.strip().upper()
+        normalized = channel_hash.strip()
         if len(normalized) != 2:
             return None
-        if any(ch not in "0123456789ABCDEF" for ch in normalized):
+        try:
+            return bytes.fromhex(normalized).hex().upper()
+        except ValueError:
             return None
-        return normalized
 
     @staticmethod
     def _normalize_full_public_key(value: Any) -> str | None:
         """Normalize full node public key (64 hex chars)."""
         if not isinstance(value, str):
             return None
-        normalized = value.strip().removeprefix("0x").removeprefix("0X").upper()
-        if len(normalized) != 64:
-            return None
-        if any(ch not in "0123456789ABCDEF" for ch in normalized):
+        # Validate before case-folding so only the returned string is allocated.
+        normalized = value.strip().removeprefix("0x").removeprefix("0X")
+        if len(normalized) != 64 or not _HEX_RE.fullmatch(normalized):
             return None
         return normalized.lower()
 
@@ -1010,24 +1040,21 @@ class LetsMeshNormalizer:
         """Normalize sender key/prefix to 12 uppercase hex characters."""
         if not isinstance(value, str):
             return None
-        normalized = value.strip().removeprefix("0x").removeprefix("0X").upper()
-        if not normalized:
-            return None
-        if any(ch not in "0123456789ABCDEF" for ch in normalized):
-            return None
-        if len(normalized) < 8:
+        normalized = value.strip().removeprefix("0x").removeprefix("0X")
+        if len(normalized) < 8 or not _HEX_RE.fullmatch(normalized):
             return None
-        return normalized[:12]
+        return normalized[:12].upper()
 
     @staticmethod
     def _parse_channel_hash_idx(channel_hash: str) -> int | None:
         """Convert 1-byte channel hash hex string into a stable numeric index."""
-        normalized = channel_hash.strip().upper()
+        normalized = channel_hash.strip()
         if len(normalized) != 2:
             return None
-        if any(ch not in "0123456789ABCDEF" for ch in normalized):
+        try:
+            return bytes.fromhex(normalized)[0]
+        except ValueError:
             return None
-        return int(normalized, 16)
 
     @staticmethod
     def _format_channel_label(
@@ -1080,38 +1107,30 @@ class LetsMeshNormalizer:
             return text
         return f"{sender}: {text}"
 
-    @staticmethod
-    def _normalize_letsmesh_adv_type(payload: dict[str, Any]) -> str | None:
+    @classmethod
+    def _normalize_letsmesh_adv_type(cls, payload: dict[str, Any]) -> str | None:
         """Map LetsMesh status fields to canonical node types."""
         candidates: list[str] = []
-        for key in ("adv_type", "type", "node_type", "role", "mode", "status"):
+        for key in _ADV_TYPE_KEYS:
             value = payload.get(key)
-            if isinstance(value, str) and value.strip():
-                candidates.append(value.strip().lower())
-
-        for key in ("origin", "name", "model"):
-            value = payload.get(key)
-            if isinstance(value, str) and value.strip():
-                candidates.append(value.strip().lower())
+            if isinstance(value, str):
+                value = value.strip()
+                if value:
+                    candidates.append(value.lower())
 
         if not candidates:
             return None
 
-        normalized = " ".join(candidates)
-        if any(token in normalized for token in ("room server", "roomserver", "room")):
-            return "room"
-        if any(token in normalized for token in ("repeater", "relay")):
-            return "repeater"
-        if any(token in normalized for token in ("companion", "observer")):
-            return "companion"
-        if "chat" in normalized:
-            return "chat"
-
-        # Preserve existing canonical values when they are already set.
-        for candidate in candidates:
-            if candidate in {"chat", "repeater", "room", "companion"}:
-                return candidate
+        return cls._match_adv_type_token(" ".join(candidates))
 
+    @staticmethod
+    def _match_adv_type_token(normalized: str) -> str | None:
+        """Return the adv_type of the first token found in lowercase text."""
+        # Any canonical value also matches its own token here, so no
+        # separate exact-match pass is needed.
+        for token, adv_type in _ADV_TYPE_TOKENS:
+            if token in normalized:
+                return adv_type
         return None
 
     @classmethod
@@ -1121,24 +1140,13 @@ class LetsMeshNormalizer:
             return None
 
         if isinstance(value, (int, float)):
-            numeric = int(value)
-            if numeric == 0:
-                return None
-            if numeric == 1:
-                return "chat"
-            if numeric == 2:
-                return "repeater"
-            if numeric == 3:
-                return "room"
-            if numeric == 4:
-                return "companion"
-            return None
+            return _NODE_TYPES.get(int(value))
 
         if isinstance(value, str):
             normalized = value.strip()
             if not normalized:
                 return None
-            return cls._normalize_letsmesh_adv_type({"type": normalized})
+            return cls._match_adv_type_token(normalized.lower())
 
         return None
 
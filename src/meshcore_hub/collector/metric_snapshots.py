@@ -0,0 +1,111 @@
+"""Pre-aggregated full-table totals for the Prometheus ``/metrics`` endpoint.
+
+The collector refreshes ``metric_snapshots`` on a background tick
+(:func:`run_snapshot_refresh`), so the totals are counted once per interval
+by the process that already writes to the database rather than by every
+API worker. ``collect_metrics`` in the API reads the snapshot rows and falls
+back to :func:`count_metric_totals` when the table is missing, empty or
+older than :data:`SNAPSHOT_MAX_AGE_SECONDS`.
+"""
+
+import logging
+from datetime import datetime, timezone
+from typing import Any
+
+from sqlalchemy import Insert, delete, func, select
+
+from meshcore_hub.common.database import DatabaseManager
+from meshcore_hub.common.models import (
+    Advertisement,
+    Message,
+    MetricSnapshot,
+    Node,
+    Telemetry,
+    TracePath,
+)
+
+logger = logging.getLogger(__name__)
+
+# Full-table counts stored in metric_snapshots. Per-type message totals are
+# stored as "messages_total:<type>".
+_SNAPSHOT_COUNTS = {
+    "nodes_total": select(func.count(Node.id)),
+    "advertisements_total": select(func.count(Advertisement.id)),
+    "telemetry_total": select(func.count(Telemetry.id)),
+    "trace_paths_total": select(func.count(TracePath.id)),
+}
+MESSAGES_TOTAL_PREFIX = "messages_total:"
+
+# Snapshots last refreshed longer ago than this are ignored by /metrics, so a
+# stopped collector (or one with the refresh disabled) cannot freeze the
+# exported totals. Five ticks at the default 60 s interval.
+SNAPSHOT_MAX_AGE_SECONDS = 300
+
+
+def count_metric_totals(session: Any) -> dict[str, float]:
+    """Run the full-table counts backing the snapshot metrics.
+
+    Args:
+        session: SQLAlchemy database session
+
+    Returns:
+        Mapping of snapshot metric name to value
+    """
+    totals = {
+        name: session.execute(stmt).scalar() or 0
+        for name, stmt in _SNAPSHOT_COUNTS.items()
+    }
+    msg_type_counts = session.execute(
+        select(Message.message_type, func.count(Message.id)).group_by(
+            Message.message_type
+        )
+    ).all()
+    for msg_type, count in msg_type_counts:
+        totals[f"{MESSAGES_TOTAL_PREFIX}{msg_type}"] = count
+    return totals
+
+
+def refresh_metric_snapshots(session: Any) -> None:
+    """Recompute the snapshot counts and upsert them into metric_snapshots.
+
+    Keys that no longer apply (e.g. a message type with no rows left after
+    cleanup) are removed so they stop being exported.
+
+    Args:
+        session: SQLAlchemy database session
+    """
+    totals = count_metric_totals(session)
+    now = datetime.now(timezone.utc)
+
+    session.execute(
+        delete(MetricSnapshot).where(MetricSnapshot.metric_name.not_in(totals))
+    )
+
+    rows = [
+        {"metric_name": name, "value": value, "updated_at": now}
+        for name, value in totals.items()
+    ]
+    stmt: Insert
+    if session.get_bind().dialect.name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+        pg_stmt = pg_insert(MetricSnapshot).values(rows)
+        stmt = pg_stmt.on_conflict_do_update(
+            index_elements=["metric_name"],
+            set_={"value": pg_stmt.excluded.value, "updated_at": now},
+        )
+    else:
+        from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
+        sqlite_stmt = sqlite_insert(MetricSnapshot).values(rows)
+        stmt = sqlite_stmt.on_conflict_do_update(
+            index_elements=["metric_name"],
+            set_={"value": sqlite_stmt.excluded.value, "updated_at": now},
+        )
+    session.execute(stmt)
+
+
+def run_snapshot_refresh(db: DatabaseManager) -> None:
+    """Refresh metric_snapshots in its own transaction (collector tick)."""
+    with db.session_scope() as session:
+        refresh_metric_snapshots(session)
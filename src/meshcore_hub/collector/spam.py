@@ -68,7 +68,7 @@ class SpamConfig:
         )
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class SpamScore:
     """Result of scoring a single message, with the driving component counts."""
 
@@ -11,6 +11,7 @@ The subscriber:
 
 import asyncio
 import logging
+import queue
 import signal
 import threading
 import time
@@ -21,6 +22,11 @@ from typing import Any, Callable, Optional, TYPE_CHECKING
 from meshcore_hub.common.database import DatabaseManager
 from meshcore_hub.common.health import HealthReporter
 from meshcore_hub.common.mqtt import MQTTClient, MQTTConfig
+from meshcore_hub.collector.handlers.event_log import handle_event_log
+from meshcore_hub.collector.handlers.raw_packet import (
+    store_raw_packet,
+    update_raw_packet_event_hash,
+)
 from meshcore_hub.collector.letsmesh_decoder import LetsMeshPacketDecoder
 from meshcore_hub.collector.letsmesh_normalizer import LetsMeshNormalizer
 from meshcore_hub.collector.observer_filter import ObserverFilter
@@ -36,6 +42,15 @@ logger = logging.getLogger(__name__)
 # denormalize the identity onto the captured raw packet.
 EventHandler = Callable[[str, str, dict[str, Any], DatabaseManager], Optional[str]]
 
+# Webhook events are drained and dispatched in batches of up to
+# WEBHOOK_BATCH_MAX. The processor blocks on the queue, waking as soon as an
+# event arrives and otherwise re-checking for shutdown every
+# WEBHOOK_IDLE_WAIT_SECONDS. Roughly WEBHOOK_QUEUE_MAX events are held; past
+# that the oldest are dropped.
+WEBHOOK_BATCH_MAX = 256
+WEBHOOK_IDLE_WAIT_SECONDS = 0.05
+WEBHOOK_QUEUE_MAX = 10_000
+
 
 class Subscriber(LetsMeshNormalizer):
     """MQTT Subscriber for collecting and storing MeshCore events."""
@@ -74,6 +89,8 @@ class Subscriber(LetsMeshNormalizer):
         """
         self.mqtt = mqtt_client
         self.db = db_manager
+        # Bound once: the observer filter and raw capture parse every topic.
+        self._parse_upload_topic = mqtt_client.topic_builder.parse_letsmesh_upload_topic
         self._webhook_dispatcher = webhook_dispatcher
         self._running = False
         self._shutdown_event = threading.Event()
@@ -82,9 +99,11 @@ class Subscriber(LetsMeshNormalizer):
         self._db_connected = False
         self._health_reporter: Optional[HealthReporter] = None
         # Webhook processing
-        self._webhook_queue: list[tuple[str, dict[str, Any], str]] = []
-        self._webhook_lock = threading.Lock()
+        self._webhook_queue: queue.SimpleQueue[tuple[str, dict[str, Any], str]] = (
+            queue.SimpleQueue()
+        )
         self._webhook_thread: Optional[threading.Thread] = None
+        self._webhook_events_dropped = 0
         # Data cleanup
         self._cleanup_enabled = cleanup_enabled
         self._cleanup_retention_days = cleanup_retention_days
@@ -118,6 +137,8 @@ class Subscriber(LetsMeshNormalizer):
         self._route_evaluator_thread: Optional[threading.Thread] = None
         # Background route history backfill (long tick: completed days)
         self._route_history_backfill_thread: Optional[threading.Thread] = None
+        # Background refresh of the /metrics full-table totals
+        self._metric_snapshot_thread: Optional[threading.Thread] = None
         # Load initial channel keys from database
         self._include_test_channel = self._load_channel_keys_from_db()
         self._letsmesh_decoder = LetsMeshPacketDecoder(
@@ -206,6 +227,8 @@ class Subscriber(LetsMeshNormalizer):
             "running": self._running,
             "mqtt_connected": self._mqtt_connected,
             "database_connected": self._db_connected,
+            "webhook_queue_depth": self._webhook_queue.qsize(),
+            "webhook_events_dropped": self._webhook_events_dropped,
         }
 
     def register_handler(self, event_type: str, handler: EventHandler) -> None:
@@ -216,7 +239,7 @@ class Subscriber(LetsMeshNormalizer):
             handler: Handler function
         """
         self._handlers[event_type] = handler
-        logger.debug(f"Registered handler for {event_type}")
+        logger.debug("Registered handler for %s", event_type)
 
     def _handle_mqtt_message(
         self,
@@ -237,13 +260,12 @@ class Subscriber(LetsMeshNormalizer):
         # split below runs only when the filter is active, so the default
         # (accept-all) path is unaffected.
         if self._observer_filter.active:
-            parsed_topic = self.mqtt.topic_builder.parse_letsmesh_upload_topic(topic)
+            parsed_topic = self._parse_upload_topic(topic)
             if parsed_topic:
                 observer_key, _feed = parsed_topic
                 if not self._observer_filter.is_allowed(observer_key):
                     logger.debug(
-                        "Dropping event from blocked observer %s...",
-                        observer_key[:12],
+                        "Dropping event from blocked observer %.12s...", observer_key
                     )
                     return
 
@@ -255,7 +277,7 @@ class Subscriber(LetsMeshNormalizer):
             return
 
         public_key, event_type, normalized_payload = parsed
-        logger.debug("Received event: %s from %s...", event_type, public_key[:12])
+        logger.debug("Received event: %s from %.12s...", event_type, public_key)
 
         # Capture the raw packet (packets feed only) independent of, and
         # before, structured dispatch so the raw_packets table is complete.
@@ -293,15 +315,13 @@ class Subscriber(LetsMeshNormalizer):
             id to backfill ``event_hash`` after dispatch.
         """
         try:
-            parsed_topic = self.mqtt.topic_builder.parse_letsmesh_upload_topic(topic)
+            parsed_topic = self._parse_upload_topic(topic)
             if not parsed_topic:
                 return None
             _, feed_type = parsed_topic
             if feed_type != "packets":
                 return None
 
-            from meshcore_hub.collector.handlers.raw_packet import store_raw_packet
-
             decoded_packet = self._letsmesh_decoder.decode_payload(payload)
             return store_raw_packet(
                 public_key, payload, decoded_packet, event_type, self.db
@@ -322,10 +342,6 @@ class Subscriber(LetsMeshNormalizer):
         and swallowed so they never affect subsequent ingest.
         """
         try:
-            from meshcore_hub.collector.handlers.raw_packet import (
-                update_raw_packet_event_hash,
-            )
-
             update_raw_packet_event_hash(raw_packet_id, event_hash, self.db)
         except Exception as e:
             logger.error("Error backfilling raw packet event_hash: %s", e)
@@ -345,21 +361,12 @@ class Subscriber(LetsMeshNormalizer):
         """
         event_hash: str | None = None
 
-        # Find and call handler
-        handler = self._handlers.get(event_type)
-        if handler:
-            try:
-                event_hash = handler(public_key, event_type, payload, self.db)
-            except Exception as e:
-                logger.error(f"Error handling {event_type}: {e}")
-        else:
-            # Use generic event log handler if no specific handler
-            from meshcore_hub.collector.handlers.event_log import handle_event_log
-
-            try:
-                handle_event_log(public_key, event_type, payload, self.db)
-            except Exception as e:
-                logger.error(f"Error logging event {event_type}: {e}")
+        # Find and call handler; unhandled types go to the generic event log
+        handler = self._handlers.get(event_type, handle_event_log)
+        try:
+            event_hash = handler(public_key, event_type, payload, self.db)
+        except Exception as e:
+            logger.error(f"Error handling {event_type}: {e}")
 
         # Queue event for webhook dispatch
         if self._webhook_dispatcher and self._webhook_dispatcher.webhooks:
@@ -377,8 +384,18 @@ class Subscriber(LetsMeshNormalizer):
             payload: Event payload
             public_key: Source node public key
         """
-        with self._webhook_lock:
-            self._webhook_queue.append((event_type, payload, public_key))
+        if self._webhook_queue.qsize() >= WEBHOOK_QUEUE_MAX:
+            try:
+                self._webhook_queue.get_nowait()
+            except queue.Empty:
+                pass
+            else:
+                self._webhook_events_dropped += 1
+                logger.warning(
+                    "Webhook queue full, dropped oldest event (%d dropped so far)",
+                    self._webhook_events_dropped,
+                )
+        self._webhook_queue.put_nowait((event_type, payload, public_key))
 
     def _start_webhook_processor(self) -> None:
         """Start background thread for webhook processing."""
@@ -398,24 +415,26 @@ class Subscriber(LetsMeshNormalizer):
                 logger.info("Webhook processor started")
 
                 while self._running:
-                    # Get queued events
-                    events_to_process: list[tuple[str, dict[str, Any], str]] = []
-                    with self._webhook_lock:
-                        if self._webhook_queue:
-                            events_to_process = self._webhook_queue.copy()
-                            self._webhook_queue.clear()
-
-                    # Process events
-                    for event_type, payload, public_key in events_to_process:
+                    # Block until an event is queued (or re-check shutdown)
+                    try:
+                        batch = [
+                            self._webhook_queue.get(timeout=WEBHOOK_IDLE_WAIT_SECONDS)
+                        ]
+                    except queue.Empty:
+                        continue
+
+                    # Take whatever else is already queued, up to a batch
+                    while len(batch) < WEBHOOK_BATCH_MAX:
                         try:
-                            loop.run_until_complete(
-                                dispatcher.dispatch(event_type, payload, public_key)
-                            )
-                        except Exception as e:
-                            logger.error(f"Webhook dispatch error: {e}")
+                            batch.append(self._webhook_queue.get_nowait())
+                        except queue.Empty:
+                            break
 
-                    # Small sleep to prevent busy-waiting
-                    time.sleep(0.01)
+                    # Dispatch the whole batch concurrently
+                    try:
+                        loop.run_until_complete(dispatcher.dispatch_batch(batch))
+                    except Exception as e:
+                        logger.error(f"Webhook dispatch error: {e}")
 
             finally:
                 loop.run_until_complete(dispatcher.stop())
@@ -435,6 +454,14 @@ class Subscriber(LetsMeshNormalizer):
             if self._webhook_thread.is_alive():
                 logger.warning("Webhook processor thread did not stop cleanly")
 
+    def _wait_for_shutdown(self, seconds: float) -> None:
+        """Sleep up to ``seconds``, returning early once stop() is called.
+
+        Background schedulers block here between runs instead of waking
+        every second to poll ``_running``.
+        """
+        self._shutdown_event.wait(seconds)
+
     def _start_cleanup_scheduler(self) -> None:
         """Start background thread for periodic data cleanup."""
         if not self._cleanup_enabled and not self._node_cleanup_enabled:
@@ -488,49 +515,61 @@ class Subscriber(LetsMeshNormalizer):
                                 cleanup_old_data,
                                 cleanup_inactive_nodes,
                                 cleanup_orphaned_node_relations,
+                                exclusive_cleanup,
                             )
 
                             # Get async session and run cleanup
                             async def run_cleanup() -> None:
                                 async with self.db.async_session() as session:
-                                    # Run event data cleanup if enabled
-                                    if self._cleanup_enabled:
-                                        stats = await cleanup_old_data(
-                                            session,
-                                            self._cleanup_retention_days,
-                                            dry_run=False,
-                                            raw_packet_retention_days=(
-                                                self._raw_packet_retention_days
-                                            ),
-                                        )
-                                        logger.info(
-                                            "Event cleanup completed: %s", stats
-                                        )
-
-                                    # Run node cleanup if enabled
-                                    if self._node_cleanup_enabled:
-                                        nodes_deleted = await cleanup_inactive_nodes(
-                                            session,
-                                            self._node_cleanup_days,
-                                            dry_run=False,
-                                        )
-                                        logger.info(
-                                            "Node cleanup completed: %d nodes deleted",
-                                            nodes_deleted,
-                                        )
-
-                                        orphan_counts = (
-                                            await cleanup_orphaned_node_relations(
+                                    async with exclusive_cleanup(session) as acquired:
+                                        if not acquired:
+                                            logger.info(
+                                                "Skipping scheduled cleanup: "
+                                                "another cleanup run is in progress"
+                                            )
+                                            return
+
+                                        # Run event data cleanup if enabled
+                                        if self._cleanup_enabled:
+                                            stats = await cleanup_old_data(
                                                 session,
+                                                self._cleanup_retention_days,
                                                 dry_run=False,
+                                                raw_packet_retention_days=(
+                                                    self._raw_packet_retention_days
+                                                ),
+                                                session_factory=self.db.async_session,
                                             )
-                                        )
-                                        if any(orphan_counts.values()):
                                             logger.info(
-                                                "Orphan cleanup completed: %s",
-                                                orphan_counts,
+                                                "Event cleanup completed: %s", stats
                                             )
 
+                                        # Run node cleanup if enabled
+                                        if self._node_cleanup_enabled:
+                                            nodes_deleted = (
+                                                await cleanup_inactive_nodes(
+                                                    session,
+                                                    self._node_cleanup_days,
+                                                    dry_run=False,
+                                                )
+                                            )
+                                            logger.info(
+                                                "Node cleanup completed: %d nodes deleted",
+                                                nodes_deleted,
+                                            )
+
+                                            orphan_counts = (
+                                                await cleanup_orphaned_node_relations(
+                                                    session,
+                                                    dry_run=False,
+                                                )
+                                            )
+                                            if any(orphan_counts.values()):
+                                                logger.info(
+                                                    "Orphan cleanup completed: %s",
+                                                    orphan_counts,
+                                                )
+
                             loop.run_until_complete(run_cleanup())
                             self._last_cleanup = now
 
@@ -538,10 +577,7 @@ class Subscriber(LetsMeshNormalizer):
                             logger.error(f"Cleanup error: {e}", exc_info=True)
 
                     # Sleep for 1 hour before next check
-                    for _ in range(3600):
-                        if not self._running:
-                            break
-                        time.sleep(1)
+                    self._wait_for_shutdown(3600)
 
             finally:
                 loop.close()
@@ -572,10 +608,7 @@ class Subscriber(LetsMeshNormalizer):
         def run_refresh_loop() -> None:
             """Periodically refresh channel keys from database."""
             while self._running:
-                for _ in range(interval):
-                    if not self._running:
-                        break
-                    time.sleep(1)
+                self._wait_for_shutdown(interval)
                 if self._running:
                     try:
                         self._refresh_channel_keys_from_db()
@@ -620,10 +653,7 @@ class Subscriber(LetsMeshNormalizer):
             from meshcore_hub.collector.spam import get_spam_config, rescore_recent
 
             while self._running:
-                for _ in range(interval):
-                    if not self._running:
-                        break
-                    time.sleep(1)
+                self._wait_for_shutdown(interval)
                 if self._running:
                     try:
                         sweep_cfg = get_spam_config()
@@ -668,10 +698,7 @@ class Subscriber(LetsMeshNormalizer):
             from meshcore_hub.collector.route_evaluator import run_evaluation
 
             while self._running:
-                for _ in range(interval):
-                    if not self._running:
-                        break
-                    time.sleep(1)
+                self._wait_for_shutdown(interval)
                 if self._running:
                     try:
                         updated = run_evaluation(self.db)
@@ -714,10 +741,7 @@ class Subscriber(LetsMeshNormalizer):
             from meshcore_hub.collector.route_evaluator import run_history_backfill
 
             while self._running:
-                for _ in range(interval):
-                    if not self._running:
-                        break
-                    time.sleep(1)
+                self._wait_for_shutdown(interval)
                 if self._running:
                     try:
                         updated = run_history_backfill(self.db)
@@ -746,6 +770,48 @@ class Subscriber(LetsMeshNormalizer):
             if self._route_history_backfill_thread.is_alive():
                 logger.warning("Route history backfill thread did not stop cleanly")
 
+    def _start_metric_snapshot_scheduler(self) -> None:
+        """Start background thread that refreshes the /metrics totals.
+
+        Disabled when the interval is 0. The collector is the only process
+        refreshing ``metric_snapshots``, so API workers never run the
+        full-table counts unless the table is missing or empty.
+        """
+        from meshcore_hub.common.config import CollectorSettings
+
+        interval = CollectorSettings().metric_snapshot_interval_seconds
+        if interval <= 0:
+            logger.info("Metric snapshot refresh disabled (interval=%ds)", interval)
+            return
+
+        logger.info("Starting metric snapshot refresh (interval=%ds)", interval)
+
+        def run_snapshot_loop() -> None:
+            """Periodically recount the totals into metric_snapshots."""
+            from meshcore_hub.collector.metric_snapshots import run_snapshot_refresh
+
+            while self._running:
+                self._wait_for_shutdown(interval)
+                if self._running:
+                    try:
+                        run_snapshot_refresh(self.db)
+                    except Exception as e:
+                        logger.error(
+                            "Metric snapshot refresh error: %s", e, exc_info=True
+                        )
+
+        self._metric_snapshot_thread = threading.Thread(
+            target=run_snapshot_loop, daemon=True, name="metric-snapshots"
+        )
+        self._metric_snapshot_thread.start()
+
+    def _stop_metric_snapshot_scheduler(self) -> None:
+        """Stop the metric snapshot refresh thread."""
+        if self._metric_snapshot_thread and self._metric_snapshot_thread.is_alive():
+            self._metric_snapshot_thread.join(timeout=5.0)
+            if self._metric_snapshot_thread.is_alive():
+                logger.warning("Metric snapshot thread did not stop cleanly")
+
     def start(self) -> None:
         """Start the subscriber."""
         logger.info("Starting collector subscriber")
@@ -798,11 +864,11 @@ class Subscriber(LetsMeshNormalizer):
             f"{self.mqtt.topic_builder.prefix}/+/+/status",
             f"{self.mqtt.topic_builder.prefix}/+/+/internal",
         ]
-        for letsmesh_topic in letsmesh_topics:
-            self.mqtt.subscribe(letsmesh_topic, self._handle_mqtt_message)
-            logger.info(f"Subscribed to LetsMesh upload topic: {letsmesh_topic}")
+        self.mqtt.subscribe_many(letsmesh_topics, self._handle_mqtt_message)
+        logger.info("Subscribed to LetsMesh upload topics: %s", letsmesh_topics)
 
         self._running = True
+        self._shutdown_event.clear()
 
         # Start webhook processor if configured
         self._start_webhook_processor()
@@ -822,6 +888,9 @@ class Subscriber(LetsMeshNormalizer):
         # Start route history backfill (no-op when disabled)
         self._start_route_history_backfill_scheduler()
 
+        # Start /metrics totals refresh (no-op when disabled)
+        self._start_metric_snapshot_scheduler()
+
         # Start health reporter for Docker health checks
         self._health_reporter = HealthReporter(
             component="collector",
@@ -838,8 +907,8 @@ class Subscriber(LetsMeshNormalizer):
         logger.info("Collector running. Press Ctrl+C to stop.")
 
         try:
-            while self._running and not self._shutdown_event.is_set():
-                time.sleep(0.1)
+            # stop() (signal handler or another thread) sets the event
+            self._shutdown_event.wait()
         except KeyboardInterrupt:
             logger.info("Keyboard interrupt received")
         finally:
@@ -869,6 +938,9 @@ class Subscriber(LetsMeshNormalizer):
         # Stop route history backfill
         self._stop_route_history_backfill_scheduler()
 
+        # Stop /metrics totals refresh
+        self._stop_metric_snapshot_scheduler()
+
         # Stop webhook processor
         self._stop_webhook_processor()
 
@@ -11,7 +11,7 @@ import asyncio
 import logging
 import re
 from dataclasses import dataclass, field
-from typing import TYPE_CHECKING, Any, Callable, Optional
+from typing import TYPE_CHECKING, Any, Callable, Optional, Sequence
 
 import httpx
 
@@ -20,6 +20,11 @@ if TYPE_CHECKING:
 
 logger = logging.getLogger(__name__)
 
+# Upper bound on webhook POSTs in flight at once. A drained batch fans out
+# to every matching endpoint; this keeps a large backlog from exhausting
+# the HTTP connection pool. Retry backoff sleeps do not hold a slot.
+WEBHOOK_MAX_CONCURRENCY = 32
+
 
 @dataclass
 class WebhookConfig:
@@ -164,6 +169,9 @@ class WebhookDispatcher:
         self.webhooks = webhooks or []
         self._client: Optional[httpx.AsyncClient] = None
         self._running = False
+        # Created in start() so it binds to the loop that will await it; a
+        # dispatcher restarted under a new asyncio.run() gets a fresh one.
+        self._send_slots: Optional[asyncio.Semaphore] = None
 
     @property
     def is_running(self) -> bool:
@@ -201,6 +209,7 @@ class WebhookDispatcher:
             return
 
         self._client = httpx.AsyncClient()
+        self._send_slots = asyncio.Semaphore(WEBHOOK_MAX_CONCURRENCY)
         self._running = True
         logger.info(f"Webhook dispatcher started with {len(self.webhooks)} webhooks")
 
@@ -244,23 +253,18 @@ class WebhookDispatcher:
         results: dict[str, bool] = {}
 
         # Dispatch to all matching webhooks concurrently
-        tasks = []
-        for webhook in self.webhooks:
-            if not webhook.enabled:
-                continue
-            if webhook.matches_event(event_type, payload):
-                tasks.append(self._send_webhook(webhook, event_data))
-
-        if tasks:
-            task_results = await asyncio.gather(*tasks, return_exceptions=True)
-            for webhook, result in zip(
-                [
-                    w
-                    for w in self.webhooks
-                    if w.enabled and w.matches_event(event_type, payload)
-                ],
-                task_results,
-            ):
+        matched = [
+            webhook
+            for webhook in self.webhooks
+            if webhook.enabled and webhook.matches_event(event_type, payload)
+        ]
+
+        if matched:
+            task_results = await asyncio.gather(
+                *(self._send_webhook(webhook, event_data) for webhook in matched),
+                return_exceptions=True,
+            )
+            for webhook, result in zip(matched, task_results):
                 if isinstance(result, Exception):
                     results[webhook.name] = False
                     logger.error(f"Webhook {webhook.name} failed: {result}")
@@ -272,6 +276,41 @@ class WebhookDispatcher:
 
         return results
 
+    async def dispatch_batch(
+        self,
+        events: Sequence[tuple[str, dict[str, Any], Optional[str]]],
+    ) -> list[dict[str, bool]]:
+        """Dispatch several events concurrently.
+
+        Delivery order between events is not preserved: a slow or retrying
+        endpoint no longer holds up the events queued behind it.
+
+        Args:
+            events: (event_type, payload, public_key) tuples
+
+        Returns:
+            Per-event results, in the same order as ``events``
+        """
+        if not self._running or not self.webhooks or not events:
+            return [{} for _ in events]
+
+        outcomes = await asyncio.gather(
+            *(
+                self.dispatch(event_type, payload, public_key)
+                for event_type, payload, public_key in events
+            ),
+            return_exceptions=True,
+        )
+
+        results: list[dict[str, bool]] = []
+        for (event_type, _, _), outcome in zip(events, outcomes):
+            if isinstance(outcome, BaseException):
+                logger.error(f"Webhook dispatch of {event_type} failed: {outcome}")
+                results.append({})
+            else:
+                results.append(outcome)
+        return results
+
     async def _send_webhook(
         self,
         webhook: WebhookConfig,
@@ -286,7 +325,7 @@ class WebhookDispatcher:
         Returns:
             True if the webhook was sent successfully
         """
-        if not self._client:
+        if not self._client or self._send_slots is None:
             return False
 
         headers = {
@@ -299,12 +338,13 @@ class WebhookDispatcher:
 
         for attempt in range(webhook.max_retries + 1):
             try:
-                response = await self._client.post(
-                    webhook.url,
-                    json=event_data,
-                    headers=headers,
-                    timeout=webhook.timeout,
-                )
+                async with self._send_slots:
+                    response = await self._client.post(
+                        webhook.url,
+                        json=event_data,
+                        headers=headers,
+                        timeout=webhook.timeout,
+                    )
 
                 if response.status_code >= 200 and response.status_code < 300:
                     logger.debug(
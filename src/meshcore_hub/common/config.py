@@ -346,6 +346,17 @@ class CollectorSettings(CommonSettings):
         ),
         ge=0,
     )
+    metric_snapshot_interval_seconds: int = Field(
+        default=60,
+        description=(
+            "Seconds between refreshes of the full-table totals in "
+            "metric_snapshots served by the API's /metrics endpoint. 0 disables "
+            "the refresh. /metrics ignores snapshots older than 300 s and "
+            "counts the tables on each scrape instead, so intervals of 300 or "
+            "more leave the snapshots unused."
+        ),
+        ge=0,
+    )
 
     @property
     def effective_raw_packet_retention_days(self) -> int:
@@ -11,6 +11,33 @@ from sqlalchemy.orm import Session, sessionmaker
 
 from meshcore_hub.common.models.base import Base
 
+# Applied to every new SQLite connection (sync and async engines). WAL lets
+# readers run concurrently with a single writer (the collector), and
+# busy_timeout waits instead of immediately raising "database is locked" under
+# contention. synchronous=NORMAL is safe under WAL and faster. The remaining
+# pragmas serve the read-heavy API: temp B-trees for GROUP BY/ORDER BY stay in
+# RAM instead of spilling to temp files, reads go through a shared 256 MiB
+# memory map, and each connection keeps up to 16 MiB of page cache (the pool
+# holds up to 50 connections, so this is kept well below SQLite's
+# per-connection ceiling).
+_SQLITE_PRAGMAS = (
+    "journal_mode=WAL",
+    "busy_timeout=5000",
+    "synchronous=NORMAL",
+    "foreign_keys=ON",
+    "temp_store=MEMORY",
+    "mmap_size=268435456",
+    "cache_size=-16384",
+)
+
+
+def _apply_sqlite_pragmas(dbapi_connection: Any) -> None:
+    """Apply ``_SQLITE_PRAGMAS`` to a raw DBAPI SQLite connection."""
+    cursor = dbapi_connection.cursor()
+    for pragma in _SQLITE_PRAGMAS:
+        cursor.execute(f"PRAGMA {pragma}")
+    cursor.close()
+
 
 def _resolve_pg_schema(database_url: str, schema: str | None) -> str | None:
     """Resolve the Postgres schema to scope a connection to (search_path).
@@ -105,16 +132,7 @@ def create_database_engine(
 
         @event.listens_for(engine, "connect")
         def set_sqlite_pragma(dbapi_connection, connection_record):  # type: ignore
-            cursor = dbapi_connection.cursor()
-            # WAL lets readers run concurrently with a single writer (the
-            # collector), and busy_timeout waits instead of immediately raising
-            # "database is locked" under contention. synchronous=NORMAL is safe
-            # under WAL and faster.
-            cursor.execute("PRAGMA journal_mode=WAL")
-            cursor.execute("PRAGMA busy_timeout=5000")
-            cursor.execute("PRAGMA synchronous=NORMAL")
-            cursor.execute("PRAGMA foreign_keys=ON")
-            cursor.close()
+            _apply_sqlite_pragmas(dbapi_connection)
 
     return engine
 
@@ -224,12 +242,7 @@ class DatabaseManager:
             def set_sqlite_pragma_async(
                 dbapi_connection: object, connection_record: object
             ) -> None:
-                cursor = dbapi_connection.cursor()  # type: ignore[attr-defined]
-                cursor.execute("PRAGMA journal_mode=WAL")
-                cursor.execute("PRAGMA busy_timeout=5000")
-                cursor.execute("PRAGMA synchronous=NORMAL")
-                cursor.execute("PRAGMA foreign_keys=ON")
-                cursor.close()
+                _apply_sqlite_pragmas(dbapi_connection)
 
         self._async_session_factory = async_sessionmaker(
             self._async_engine,
@@ -5,9 +5,26 @@ allowing deduplication when multiple receiver nodes report the same event.
 """
 
 import hashlib
+import json
 from datetime import datetime
+from functools import lru_cache
 from typing import Optional
 
+# Repeaters re-flood the same advert many times within one time bucket, so
+# the advertisement hash inputs repeat; cache the digest per input tuple.
+_ADVERTISEMENT_HASH_CACHE_SIZE = 8192
+
+
+def _time_bucket(when: Optional[datetime], bucket_seconds: int) -> str:
+    """Return the start of the time bucket containing ``when`` as epoch text.
+
+    Returns an empty string when ``when`` is None.
+    """
+    if when is None:
+        return ""
+    epoch = int(when.timestamp())
+    return str(epoch - epoch % bucket_seconds)
+
 
 def compute_message_hash(
     text: str,
@@ -72,12 +89,19 @@ def compute_advertisement_hash(
     """
     bucket_time = advert_timestamp if advert_timestamp is not None else received_at
 
-    time_bucket = ""
-    if bucket_time:
-        epoch = int(bucket_time.timestamp())
-        bucket_epoch = (epoch // bucket_seconds) * bucket_seconds
-        time_bucket = str(bucket_epoch)
+    time_bucket = _time_bucket(bucket_time, bucket_seconds)
+    return _advertisement_hash(public_key, name, adv_type, flags, time_bucket)
 
+
+@lru_cache(maxsize=_ADVERTISEMENT_HASH_CACHE_SIZE)
+def _advertisement_hash(
+    public_key: str,
+    name: Optional[str],
+    adv_type: Optional[str],
+    flags: Optional[int],
+    time_bucket: str,
+) -> str:
+    """Hash the bucketed advertisement fields (cached)."""
     parts = [
         public_key,
         name or "",
@@ -122,19 +146,16 @@ def compute_telemetry_hash(
     Returns:
         32-character hex hash string
     """
-    # Bucket the time
-    time_bucket = ""
-    if received_at:
-        epoch = int(received_at.timestamp())
-        bucket_epoch = (epoch // bucket_seconds) * bucket_seconds
-        time_bucket = str(bucket_epoch)
-
-    # Serialize parsed_data deterministically
+    time_bucket = _time_bucket(received_at, bucket_seconds)
+
+    # Serialize parsed_data as canonical JSON: keys are sorted at every
+    # nesting level, so nested readings (e.g. GPS) hash the same regardless
+    # of the order the decoder built them in.
     data_str = ""
     if parsed_data:
-        # Sort keys for deterministic serialization
-        sorted_items = sorted(parsed_data.items())
-        data_str = str(sorted_items)
+        data_str = json.dumps(
+            parsed_data, sort_keys=True, separators=(",", ":"), default=str
+        )
 
     parts = [
         node_public_key,
@@ -10,7 +10,6 @@ import json
 import logging
 import os
 import threading
-import time
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from pathlib import Path
@@ -227,6 +226,7 @@ class HealthReporter:
         self.status_fn = status_fn
         self.interval = interval
         self._running = False
+        self._stop_event = threading.Event()
         self._thread: Optional[threading.Thread] = None
 
     def start(self) -> None:
@@ -235,6 +235,7 @@ class HealthReporter:
             return
 
         self._running = True
+        self._stop_event.clear()
         self._thread = threading.Thread(
             target=self._report_loop,
             daemon=True,
@@ -249,6 +250,7 @@ class HealthReporter:
             return
 
         self._running = False
+        self._stop_event.set()
         if self._thread:
             self._thread.join(timeout=self.interval + 1)
             self._thread = None
@@ -271,11 +273,8 @@ class HealthReporter:
             except Exception as e:
                 logger.error(f"Health report error: {e}")
 
-            # Sleep in small increments to allow quick shutdown
-            for _ in range(int(self.interval * 10)):
-                if not self._running:
-                    break
-                time.sleep(0.1)
+            # Wait out the interval; stop() wakes this immediately
+            self._stop_event.wait(self.interval)
 
     def report_now(self) -> None:
         """Report health status immediately."""
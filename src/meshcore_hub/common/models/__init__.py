@@ -1,7 +1,7 @@
 """SQLAlchemy database models."""
 
 from meshcore_hub.common.models.base import Base, TimestampMixin
-from meshcore_hub.common.models.node import Node
+from meshcore_hub.common.models.node import Node, touch_node
 from meshcore_hub.common.models.node_tag import NodeTag
 from meshcore_hub.common.models.message import Message
 from meshcore_hub.common.models.advertisement import Advertisement
@@ -9,9 +9,14 @@ from meshcore_hub.common.models.trace_path import TracePath
 from meshcore_hub.common.models.telemetry import Telemetry
 from meshcore_hub.common.models.event_log import EventLog
 from meshcore_hub.common.models.raw_packet import RawPacket
+from meshcore_hub.common.models.metric_snapshot import MetricSnapshot
 from meshcore_hub.common.models.user_profile import UserProfile
 from meshcore_hub.common.models.user_profile_node import UserProfileNode
-from meshcore_hub.common.models.event_observer import EventObserver, add_event_observer
+from meshcore_hub.common.models.event_observer import (
+    EventObserver,
+    add_event_observer,
+    insert_event,
+)
 from meshcore_hub.common.models.channel import Channel, ChannelVisibility
 from meshcore_hub.common.models.packet_path_hop import PacketPathHop
 from meshcore_hub.common.models.route import Route, RouteVisibility
@@ -32,6 +37,7 @@ __all__ = [
     "Base",
     "TimestampMixin",
     "Node",
+    "touch_node",
     "NodeTag",
     "Message",
     "Advertisement",
@@ -39,10 +45,12 @@ __all__ = [
     "Telemetry",
     "EventLog",
     "RawPacket",
+    "MetricSnapshot",
     "UserProfile",
     "UserProfileNode",
     "EventObserver",
     "add_event_observer",
+    "insert_event",
     "Channel",
     "ChannelVisibility",
     "PacketPathHop",
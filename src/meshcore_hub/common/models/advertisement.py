@@ -6,7 +6,13 @@ from typing import Optional
 from sqlalchemy import DateTime, ForeignKey, Index, Integer, String
 from sqlalchemy.orm import Mapped, mapped_column
 
-from meshcore_hub.common.models.base import Base, TimestampMixin, UUIDMixin, utc_now
+from meshcore_hub.common.models.base import (
+    Base,
+    TimestampMixin,
+    UUIDMixin,
+    event_hash_unique_index,
+    utc_now,
+)
 
 
 class Advertisement(Base, UUIDMixin, TimestampMixin):
@@ -61,7 +67,6 @@ class Advertisement(Base, UUIDMixin, TimestampMixin):
     event_hash: Mapped[Optional[str]] = mapped_column(
         String(32),
         nullable=True,
-        unique=True,
     )
     # LetsMesh wire packet hash, links this advert to its raw_packets rows.
     packet_hash: Mapped[Optional[str]] = mapped_column(
@@ -78,7 +83,11 @@ class Advertisement(Base, UUIDMixin, TimestampMixin):
         nullable=True,
     )
 
-    __table_args__ = (Index("ix_advertisements_received_at", "received_at"),)
+    __table_args__ = (
+        Index("ix_advertisements_received_at", "received_at"),
+        Index("ix_advertisements_created_at", "created_at"),
+        event_hash_unique_index("advertisements"),
+    )
 
     def __repr__(self) -> str:
         return f"<Advertisement(id={self.id}, public_key={self.public_key[:12]}..., name={self.name})>"
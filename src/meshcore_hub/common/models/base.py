@@ -4,7 +4,7 @@ import uuid
 from datetime import datetime, timezone
 from typing import Any
 
-from sqlalchemy import DateTime, func
+from sqlalchemy import DateTime, Index, func, text
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
 
 
@@ -18,6 +18,28 @@ def utc_now() -> datetime:
     return datetime.now(timezone.utc)
 
 
+def event_hash_unique_index(table_name: str) -> Index:
+    """Build the partial unique index on an event table's ``event_hash``.
+
+    Rows without a hash are excluded, so NULLs take no index space while
+    real hashes stay unique for deduplication.
+
+    Args:
+        table_name: Name of the event table
+
+    Returns:
+        Index named ``ix_<table>_event_hash_unique``
+    """
+    predicate = text("event_hash IS NOT NULL")
+    return Index(
+        f"ix_{table_name}_event_hash_unique",
+        "event_hash",
+        unique=True,
+        sqlite_where=predicate,
+        postgresql_where=predicate,
+    )
+
+
 class Base(DeclarativeBase):
     """Base class for all SQLAlchemy models."""
 
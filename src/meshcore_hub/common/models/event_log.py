@@ -45,6 +45,7 @@ class EventLog(Base, UUIDMixin, TimestampMixin):
     __table_args__ = (
         Index("ix_events_log_event_type", "event_type"),
         Index("ix_events_log_received_at", "received_at"),
+        Index("ix_events_log_created_at", "created_at"),
     )
 
     def __repr__(self) -> str:
@@ -1,7 +1,7 @@
 """EventObserver model for tracking which observer nodes captured each event."""
 
 from datetime import datetime
-from typing import TYPE_CHECKING, Optional
+from typing import TYPE_CHECKING, Any, Optional
 from uuid import uuid4
 
 from sqlalchemy import (
@@ -13,6 +13,7 @@ from sqlalchemy import (
     Index,
     String,
     UniqueConstraint,
+    text,
     update,
 )
 from sqlalchemy.orm import Mapped, Session, mapped_column, relationship
@@ -171,3 +172,52 @@ def add_event_observer(
     )
 
     return bool(rowcount and rowcount > 0)
+
+
+def insert_event(
+    session: Session,
+    model: type[Base],
+    values: dict[str, Any],
+) -> bool:
+    """Insert an event row unless one with the same event_hash already exists.
+
+    Uses INSERT ... ON CONFLICT DO NOTHING against the partial unique index on
+    event_hash, so the database deduplicates atomically in a single statement
+    instead of a SELECT preflight plus a flush that may raise IntegrityError.
+
+    Args:
+        session: SQLAlchemy session
+        model: Event model (Message, Advertisement, TracePath or Telemetry)
+        values: Column values for the new row, including ``event_hash``
+
+    Returns:
+        True if the row was inserted, False if the event_hash already existed.
+    """
+    # The conflict target must repeat the index predicate so the database can
+    # match it to the partial unique index (see event_hash_unique_index()).
+    predicate = text("event_hash IS NOT NULL")
+    stmt: Insert
+
+    if session.get_bind().dialect.name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+        stmt = (
+            pg_insert(model)
+            .values(**values)
+            .on_conflict_do_nothing(
+                index_elements=["event_hash"], index_where=predicate
+            )
+        )
+    else:
+        from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
+        stmt = (
+            sqlite_insert(model)
+            .values(**values)
+            .on_conflict_do_nothing(
+                index_elements=["event_hash"], index_where=predicate
+            )
+        )
+    result = session.execute(stmt)
+    rowcount = getattr(result, "rowcount", 0)
+    return bool(rowcount and rowcount > 0)
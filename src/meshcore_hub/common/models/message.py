@@ -6,7 +6,13 @@ from typing import Optional
 from sqlalchemy import DateTime, Float, ForeignKey, Index, Integer, String, Text
 from sqlalchemy.orm import Mapped, mapped_column
 
-from meshcore_hub.common.models.base import Base, TimestampMixin, UUIDMixin, utc_now
+from meshcore_hub.common.models.base import (
+    Base,
+    TimestampMixin,
+    UUIDMixin,
+    event_hash_unique_index,
+    utc_now,
+)
 
 
 class Message(Base, UUIDMixin, TimestampMixin):
@@ -82,7 +88,6 @@ class Message(Base, UUIDMixin, TimestampMixin):
     event_hash: Mapped[Optional[str]] = mapped_column(
         String(32),
         nullable=True,
-        unique=True,
     )
     # LetsMesh wire packet hash, links this event to its raw_packets rows.
     packet_hash: Mapped[Optional[str]] = mapped_column(
@@ -111,14 +116,16 @@ class Message(Base, UUIDMixin, TimestampMixin):
     __table_args__ = (
         Index("ix_messages_message_type", "message_type"),
         Index("ix_messages_pubkey_prefix", "pubkey_prefix"),
-        Index("ix_messages_channel_idx", "channel_idx"),
+        Index("ix_messages_channel_idx_received_at", "channel_idx", "received_at"),
         Index("ix_messages_received_at", "received_at"),
+        Index("ix_messages_created_at", "created_at"),
         Index("ix_messages_path_prefix_received_at", "path_prefix", "received_at"),
         Index(
             "ix_messages_sender_normalized_received_at",
             "sender_normalized",
             "received_at",
         ),
+        event_hash_unique_index("messages"),
     )
 
     def __repr__(self) -> str:
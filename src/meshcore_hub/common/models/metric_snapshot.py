@@ -0,0 +1,34 @@
+"""MetricSnapshot model for pre-aggregated Prometheus counters."""
+
+from datetime import datetime
+
+from sqlalchemy import DateTime, Float, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from meshcore_hub.common.models.base import Base, utc_now
+
+
+class MetricSnapshot(Base):
+    """A periodically refreshed aggregate read by the /metrics endpoint.
+
+    Full-table counts are computed off the scrape path by a background task
+    and upserted here, so a scrape reads them in a single small query.
+
+    Attributes:
+        metric_name: Snapshot key (e.g. ``nodes_total``, ``messages_total:contact``)
+        value: Aggregate value
+        updated_at: When the value was last refreshed
+    """
+
+    __tablename__ = "metric_snapshots"
+
+    metric_name: Mapped[str] = mapped_column(String(100), primary_key=True)
+    value: Mapped[float] = mapped_column(Float, nullable=False)
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        default=utc_now,
+        nullable=False,
+    )
+
+    def __repr__(self) -> str:
+        return f"<MetricSnapshot(metric_name={self.metric_name}, value={self.value})>"
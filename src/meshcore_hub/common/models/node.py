@@ -2,9 +2,10 @@
 
 from datetime import datetime
 from typing import TYPE_CHECKING, Optional
+from uuid import uuid4
 
-from sqlalchemy import Boolean, DateTime, Float, Index, Integer, String
-from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy import Boolean, DateTime, Float, Index, Insert, Integer, String
+from sqlalchemy.orm import Mapped, Session, mapped_column, relationship
 
 from meshcore_hub.common.models.base import Base, TimestampMixin, UUIDMixin, utc_now
 
@@ -104,3 +105,51 @@ class Node(Base, UUIDMixin, TimestampMixin):
 
     def __repr__(self) -> str:
         return f"<Node(id={self.id}, public_key={self.public_key[:12]}..., name={self.name})>"
+
+
+def touch_node(session: Session, public_key: str, seen_at: datetime) -> str:
+    """Create the node for ``public_key`` or bump its ``last_seen``.
+
+    A single INSERT ... ON CONFLICT (public_key) DO UPDATE ... RETURNING id,
+    replacing the SELECT, then INSERT + flush or UPDATE that a find-or-create
+    through the ORM needs. Any ``Node`` already loaded into ``session`` is not
+    refreshed.
+
+    Args:
+        session: SQLAlchemy session
+        public_key: Node public key (stored lower-case)
+        seen_at: Observation time; sets ``first_seen`` on insert and
+            ``last_seen`` in both cases
+
+    Returns:
+        The node's id.
+    """
+    values = {
+        "id": str(uuid4()),
+        "public_key": public_key.lower(),
+        "first_seen": seen_at,
+        "last_seen": seen_at,
+        "created_at": seen_at,
+        "updated_at": seen_at,
+    }
+    refresh = {"last_seen": seen_at, "updated_at": seen_at}
+    stmt: Insert
+
+    # Dialect-specific INSERT, as in add_event_observer().
+    if session.get_bind().dialect.name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+        stmt = (
+            pg_insert(Node)
+            .values(**values)
+            .on_conflict_do_update(index_elements=["public_key"], set_=refresh)
+        )
+    else:
+        from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
+        stmt = (
+            sqlite_insert(Node)
+            .values(**values)
+            .on_conflict_do_update(index_elements=["public_key"], set_=refresh)
+        )
+    return session.execute(stmt.returning(Node.id)).scalar_one()
@@ -120,6 +120,7 @@ class RawPacket(Base, UUIDMixin, TimestampMixin):
 
     __table_args__ = (
         Index("ix_raw_packets_received_at", "received_at"),
+        Index("ix_raw_packets_created_at", "created_at"),
         # Composite indexes serve the common "filter then sort by newest" shape
         # without a full scan + filesort. See plan TR-17 for the write-cost
         # trade-off; do not add further composites speculatively.
@@ -6,7 +6,13 @@ from typing import Any, Optional
 from sqlalchemy import DateTime, ForeignKey, Index, JSON, LargeBinary, String
 from sqlalchemy.orm import Mapped, mapped_column
 
-from meshcore_hub.common.models.base import Base, TimestampMixin, UUIDMixin, utc_now
+from meshcore_hub.common.models.base import (
+    Base,
+    TimestampMixin,
+    UUIDMixin,
+    event_hash_unique_index,
+    utc_now,
+)
 
 
 class Telemetry(Base, UUIDMixin, TimestampMixin):
@@ -56,10 +62,13 @@ class Telemetry(Base, UUIDMixin, TimestampMixin):
     event_hash: Mapped[Optional[str]] = mapped_column(
         String(32),
         nullable=True,
-        unique=True,
     )
 
-    __table_args__ = (Index("ix_telemetry_received_at", "received_at"),)
+    __table_args__ = (
+        Index("ix_telemetry_received_at", "received_at"),
+        Index("ix_telemetry_created_at", "created_at"),
+        event_hash_unique_index("telemetry"),
+    )
 
     def __repr__(self) -> str:
         return (
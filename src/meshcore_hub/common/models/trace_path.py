@@ -6,7 +6,13 @@ from typing import Optional
 from sqlalchemy import BigInteger, DateTime, ForeignKey, Index, Integer, JSON, String
 from sqlalchemy.orm import Mapped, mapped_column
 
-from meshcore_hub.common.models.base import Base, TimestampMixin, UUIDMixin, utc_now
+from meshcore_hub.common.models.base import (
+    Base,
+    TimestampMixin,
+    UUIDMixin,
+    event_hash_unique_index,
+    utc_now,
+)
 
 
 class TracePath(Base, UUIDMixin, TimestampMixin):
@@ -69,12 +75,13 @@ class TracePath(Base, UUIDMixin, TimestampMixin):
     event_hash: Mapped[Optional[str]] = mapped_column(
         String(32),
         nullable=True,
-        unique=True,
     )
 
     __table_args__ = (
         Index("ix_trace_paths_initiator_tag", "initiator_tag"),
         Index("ix_trace_paths_received_at", "received_at"),
+        Index("ix_trace_paths_created_at", "created_at"),
+        event_hash_unique_index("trace_paths"),
     )
 
     def __repr__(self) -> str:
@@ -3,7 +3,8 @@
 import json
 import logging
 from dataclasses import dataclass
-from typing import Any, Callable, Optional
+from functools import lru_cache
+from typing import Any, Callable, Optional, Sequence
 
 import paho.mqtt.client as mqtt
 from paho.mqtt.enums import CallbackAPIVersion
@@ -39,10 +40,6 @@ class TopicBuilder:
         """
         self.prefix = prefix
 
-    def _prefix_parts(self) -> list[str]:
-        """Split configured prefix into path segments."""
-        return [part for part in self.prefix.strip("/").split("/") if part]
-
     def event_topic(self, public_key: str, event_name: str) -> str:
         """Build an event topic.
 
@@ -92,18 +89,7 @@ class TopicBuilder:
         Returns:
             Tuple of (public_key, event_name) or None if invalid
         """
-        parts = [part for part in topic.strip("/").split("/") if part]
-        prefix_parts = self._prefix_parts()
-        prefix_len = len(prefix_parts)
-        if (
-            len(parts) >= prefix_len + 3
-            and parts[:prefix_len] == prefix_parts
-            and parts[prefix_len + 1] == "event"
-        ):
-            public_key = parts[prefix_len]
-            event_name = "/".join(parts[prefix_len + 2 :])
-            return (public_key.lower(), event_name)
-        return None
+        return _parse_node_topic(self.prefix, topic, "event")
 
     def parse_command_topic(self, topic: str) -> tuple[str, str] | None:
         """Parse a command topic to extract public key and command name.
@@ -114,18 +100,7 @@ class TopicBuilder:
         Returns:
             Tuple of (public_key, command_name) or None if invalid
         """
-        parts = [part for part in topic.strip("/").split("/") if part]
-        prefix_parts = self._prefix_parts()
-        prefix_len = len(prefix_parts)
-        if (
-            len(parts) >= prefix_len + 3
-            and parts[:prefix_len] == prefix_parts
-            and parts[prefix_len + 1] == "command"
-        ):
-            public_key = parts[prefix_len]
-            command_name = "/".join(parts[prefix_len + 2 :])
-            return (public_key.lower(), command_name)
-        return None
+        return _parse_node_topic(self.prefix, topic, "command")
 
     def parse_letsmesh_upload_topic(self, topic: str) -> tuple[str, str] | None:
         """Parse a LetsMesh upload topic to extract public key and feed type.
@@ -133,23 +108,59 @@ class TopicBuilder:
         LetsMesh upload topics are expected in this form:
         <prefix>/<iata>/<public_key>/(packets|status|internal)
         """
-        parts = [part for part in topic.strip("/").split("/") if part]
-        prefix_parts = self._prefix_parts()
-        prefix_len = len(prefix_parts)
+        return _parse_letsmesh_upload_topic(self.prefix, topic)
+
+
+# Parsed topics are memoized: a collector sees the same few thousand
+# observer topics over and over, and each message is parsed more than once
+# (observer filter, normalizer, raw-packet capture).
+_TOPIC_CACHE_SIZE = 4096
+
+
+def _split_topic(topic: str) -> list[str]:
+    return [part for part in topic.strip("/").split("/") if part]
 
-        if len(parts) != prefix_len + 3 or parts[:prefix_len] != prefix_parts:
-            return None
 
-        public_key = parts[prefix_len + 1]
-        feed_type = parts[prefix_len + 2]
-        if feed_type not in {"packets", "status", "internal"}:
-            return None
+@lru_cache(maxsize=_TOPIC_CACHE_SIZE)
+def _parse_node_topic(prefix: str, topic: str, kind: str) -> tuple[str, str] | None:
+    """Parse ``<prefix>/<public_key>/<kind>/<name...>`` topics."""
+    parts = _split_topic(topic)
+    prefix_parts = _split_topic(prefix)
+    prefix_len = len(prefix_parts)
+    if (
+        len(parts) >= prefix_len + 3
+        and parts[:prefix_len] == prefix_parts
+        and parts[prefix_len + 1] == kind
+    ):
+        public_key = parts[prefix_len]
+        name = "/".join(parts[prefix_len + 2 :])
+        return (public_key.lower(), name)
+    return None
+
+
+@lru_cache(maxsize=_TOPIC_CACHE_SIZE)
+def _parse_letsmesh_upload_topic(prefix: str, topic: str) -> tuple[str, str] | None:
+    """Parse ``<prefix>/<iata>/<public_key>/<feed>`` topics."""
+    parts = _split_topic(topic)
+    prefix_parts = _split_topic(prefix)
+    prefix_len = len(prefix_parts)
+
+    if len(parts) != prefix_len + 3 or parts[:prefix_len] != prefix_parts:
+        return None
+
+    public_key = parts[prefix_len + 1]
+    feed_type = parts[prefix_len + 2]
+    if feed_type not in {"packets", "status", "internal"}:
+        return None
 
-        return (public_key.lower(), feed_type)
+    return (public_key.lower(), feed_type)
 
 
 MessageHandler = Callable[[str, str, dict[str, Any]], None]
 
+# Upper bound on cached topic -> handler lookups per client.
+_DISPATCH_TABLE_MAX = 4096
+
 
 class MQTTClient:
     """Wrapper for paho-mqtt client with helper methods."""
@@ -174,6 +185,9 @@ class MQTTClient:
         )
         self._connected = False
         self._message_handlers: dict[str, list[MessageHandler]] = {}
+        self._topic_qos: dict[str, int] = {}
+        # topic -> matching (pattern, handler) pairs, rebuilt on (un)subscribe
+        self._dispatch_table: dict[str, list[tuple[str, MessageHandler]]] = {}
 
         # Set WebSocket path when using MQTT over WebSockets.
         if transport == "websockets":
@@ -208,10 +222,10 @@ class MQTTClient:
             logger.info(
                 f"Connected to MQTT broker at {self.config.host}:{self.config.port}"
             )
-            # Resubscribe to topics on reconnect
-            for topic in self._message_handlers.keys():
-                self._client.subscribe(topic)
-                logger.debug(f"Resubscribed to topic: {topic}")
+            # Resubscribe to topics on reconnect, in a single SUBSCRIBE
+            if self._topic_qos:
+                self._client.subscribe(list(self._topic_qos.items()))
+                logger.debug("Resubscribed to topics: %s", list(self._topic_qos))
         else:
             logger.error(f"Failed to connect to MQTT broker: {reason_code}")
 
@@ -236,21 +250,39 @@ class MQTTClient:
         """Handle incoming message callback."""
         topic = message.topic
         try:
-            payload = json.loads(message.payload.decode("utf-8"))
+            payload = json.loads(message.payload)
         except (json.JSONDecodeError, UnicodeDecodeError) as e:
             logger.error(f"Failed to decode message payload: {e}")
             return
 
-        logger.debug(f"Received message on topic {topic}: {payload}")
+        logger.debug("Received message on topic %s: %s", topic, payload)
 
         # Call registered handlers
-        for pattern, handlers in self._message_handlers.items():
-            if self._topic_matches(pattern, topic):
-                for handler in handlers:
-                    try:
-                        handler(topic, pattern, payload)
-                    except Exception as e:
-                        logger.error(f"Error in message handler: {e}")
+        for pattern, handler in self._handlers_for(topic):
+            try:
+                handler(topic, pattern, payload)
+            except Exception as e:
+                logger.error(f"Error in message handler: {e}")
+
+    def _handlers_for(self, topic: str) -> list[tuple[str, MessageHandler]]:
+        """Return the (pattern, handler) pairs subscribed to ``topic``.
+
+        Matching every subscription pattern against every message is
+        wasted work: a collector sees the same observer topics repeatedly.
+        The result is cached per topic until the subscriptions change.
+        """
+        entries = self._dispatch_table.get(topic)
+        if entries is None:
+            entries = [
+                (pattern, handler)
+                for pattern, handlers in self._message_handlers.items()
+                if self._topic_matches(pattern, topic)
+                for handler in handlers
+            ]
+            if len(self._dispatch_table) >= _DISPATCH_TABLE_MAX:
+                self._dispatch_table.clear()
+            self._dispatch_table[topic] = entries
+        return entries
 
     def _topic_matches(self, pattern: str, topic: str) -> bool:
         """Check if a topic matches a subscription pattern.
@@ -315,13 +347,36 @@ class MQTTClient:
             handler: Message handler function
             qos: Quality of service level
         """
-        if topic not in self._message_handlers:
-            self._message_handlers[topic] = []
-            if self._connected:
-                self._client.subscribe(topic, qos)
-                logger.debug(f"Subscribed to topic: {topic}")
+        self.subscribe_many([topic], handler, qos)
+
+    def subscribe_many(
+        self,
+        topics: Sequence[str],
+        handler: MessageHandler,
+        qos: int = 1,
+    ) -> None:
+        """Subscribe several topics to one handler.
+
+        Topics not already subscribed are sent to the broker in a single
+        SUBSCRIBE packet.
 
-        self._message_handlers[topic].append(handler)
+        Args:
+            topics: MQTT topic patterns
+            handler: Message handler function
+            qos: Quality of service level
+        """
+        new_topics: list[tuple[str, int]] = []
+        for topic in topics:
+            if topic not in self._message_handlers:
+                self._message_handlers[topic] = []
+                self._topic_qos[topic] = qos
+                new_topics.append((topic, qos))
+            self._message_handlers[topic].append(handler)
+        self._dispatch_table.clear()
+
+        if new_topics and self._connected:
+            self._client.subscribe(new_topics)
+            logger.debug("Subscribed to topics: %s", [t for t, _ in new_topics])
 
     def unsubscribe(self, topic: str) -> None:
         """Unsubscribe from a topic.
@@ -331,6 +386,8 @@ class MQTTClient:
         """
         if topic in self._message_handlers:
             del self._message_handlers[topic]
+            del self._topic_qos[topic]
+            self._dispatch_table.clear()
             self._client.unsubscribe(topic)
             logger.debug(f"Unsubscribed from topic: {topic}")
 
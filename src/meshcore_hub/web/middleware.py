@@ -1,12 +1,54 @@
 """HTTP caching middleware for the web component."""
 
+import re
 from collections.abc import Awaitable, Callable
+from typing import Optional
 
 from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.requests import Request
 from starlette.responses import Response
 from starlette.types import ASGIApp
 
+_IMMUTABLE = "public, max-age=31536000, immutable"
+_ONE_HOUR = "public, max-age=3600"
+_NO_CACHE_HTML = "no-cache, public"
+
+# Path rules, tried in order; the named group that matches selects the
+# Cache-Control value from _CACHE_RULES.
+_CACHE_RULE_RE = re.compile(
+    r"(?P<health>/health)"
+    # Static dist/ files use content-hashed filenames, and vendored fonts
+    # have stable names referenced from CSS - both immutable
+    r"|(?P<static_immutable>/static/(?:dist|vendor/fonts)/)"
+    r"|(?P<static>/static/)"
+    r"|(?P<media>/media/)"
+    r"|(?P<map_data>/map/data$)"
+    r"|(?P<custom_page>/spa/pages/)"
+    r"|(?P<seo>/(?:robots\.txt|sitemap\.xml)$)"
+    r"|(?P<api>/api/)"
+)
+
+_CACHE_RULES: dict[Optional[str], Optional[str]] = {
+    # Health endpoints - never cache
+    "health": "no-cache, no-store, must-revalidate",
+    "static_immutable": _IMMUTABLE,
+    # Static files without version - short cache as fallback
+    "static": _ONE_HOUR,
+    # Media files without version - short cache (user may update)
+    "media": _ONE_HOUR,
+    # Map data - short cache (5 minutes)
+    "map_data": "public, max-age=300",
+    # Custom pages - moderate cache (1 hour)
+    "custom_page": _ONE_HOUR,
+    # SEO files - moderate cache (1 hour)
+    "seo": _ONE_HOUR,
+    # API proxy - don't add headers (pass through backend)
+    "api": None,
+}
+
+# Rules upgraded to an immutable cache when the URL carries a v= parameter.
+_VERSIONED_RULES = frozenset({"static", "static_immutable", "media"})
+
 
 class CacheControlMiddleware(BaseHTTPMiddleware):
     """Middleware to set appropriate Cache-Control headers based on resource type."""
@@ -39,55 +81,20 @@ class CacheControlMiddleware(BaseHTTPMiddleware):
         if "cache-control" in response.headers:
             return response
 
-        path = request.url.path
-        query_params = request.url.query
-
-        # Health endpoints - never cache
-        if path.startswith("/health"):
-            response.headers["cache-control"] = "no-cache, no-store, must-revalidate"
-
-        # Static files with version parameter - long-term cache
-        elif path.startswith("/static/") and "v=" in query_params:
-            response.headers["cache-control"] = "public, max-age=31536000, immutable"
-
-        # Static dist/ files use content-hashed filenames — immutable
-        elif path.startswith("/static/dist/"):
-            response.headers["cache-control"] = "public, max-age=31536000, immutable"
-
-        # Vendored font files - stable names referenced from CSS - long-term cache
-        elif path.startswith("/static/vendor/fonts/"):
-            response.headers["cache-control"] = "public, max-age=31536000, immutable"
-
-        # Static files without version - short cache as fallback
-        elif path.startswith("/static/"):
-            response.headers["cache-control"] = "public, max-age=3600"
-
-        # Media files with version parameter - long-term cache
-        elif path.startswith("/media/") and "v=" in query_params:
-            response.headers["cache-control"] = "public, max-age=31536000, immutable"
-
-        # Media files without version - short cache (user may update)
-        elif path.startswith("/media/"):
-            response.headers["cache-control"] = "public, max-age=3600"
-
-        # Map data - short cache (5 minutes)
-        elif path == "/map/data":
-            response.headers["cache-control"] = "public, max-age=300"
-
-        # Custom pages - moderate cache (1 hour)
-        elif path.startswith("/spa/pages/"):
-            response.headers["cache-control"] = "public, max-age=3600"
-
-        # SEO files - moderate cache (1 hour)
-        elif path in ("/robots.txt", "/sitemap.xml"):
-            response.headers["cache-control"] = "public, max-age=3600"
-
-        # API proxy - don't add headers (pass through backend)
-        elif path.startswith("/api/"):
-            pass
+        match = _CACHE_RULE_RE.match(request.url.path)
+        if match is None:
+            # SPA shell HTML (catch-all for client-side routes) - no cache
+            if response.headers.get("content-type", "").startswith("text/html"):
+                response.headers["cache-control"] = _NO_CACHE_HTML
+            return response
 
-        # SPA shell HTML (catch-all for client-side routes) - no cache
-        elif response.headers.get("content-type", "").startswith("text/html"):
-            response.headers["cache-control"] = "no-cache, public"
+        rule = match.lastgroup
+        # Static/media files with version parameter - long-term cache
+        if rule in _VERSIONED_RULES and "v=" in request.url.query:
+            cache_control: Optional[str] = _IMMUTABLE
+        else:
+            cache_control = _CACHE_RULES[rule]
+        if cache_control is not None:
+            response.headers["cache-control"] = cache_control
 
         return response
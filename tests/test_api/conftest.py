@@ -141,6 +141,14 @@ def _isolate_db_global(monkeypatch: pytest.MonkeyPatch, mock_db_manager) -> None
     monkeypatch.setattr(app_module, "_db_manager", mock_db_manager)
 
 
+@pytest.fixture(autouse=True)
+def _clear_stats_memo() -> None:
+    """Start every test without memoized ``/dashboard/stats`` results."""
+    from meshcore_hub.api.routes.dashboard import clear_stats_memo
+
+    clear_stats_memo()
+
+
 def _wire_overrides(app, api_db_engine, mock_mqtt, mock_db_manager) -> None:
     """Install the standard DB/MQTT dependency overrides on ``app``."""
     Session = sessionmaker(bind=api_db_engine)
@@ -3,7 +3,7 @@
 from datetime import datetime, timedelta, timezone
 
 from meshcore_hub.common.hash_utils import compute_advertisement_hash
-from meshcore_hub.common.models import Advertisement, EventObserver
+from meshcore_hub.common.models import Advertisement, EventObserver, Node
 
 
 class TestListAdvertisements:
@@ -184,6 +184,34 @@ class TestListAdvertisementsFilters:
         data = response.json()
         assert len(data["items"]) == 1
 
+    def test_filter_by_search_source_node_name(self, client_no_auth, api_db_session):
+        """Test that search matches the source node name and counts the match."""
+        node = Node(public_key="srcname1srcname1srcname1srcname1", name="Hilltop")
+        api_db_session.add(node)
+        api_db_session.flush()
+        api_db_session.add_all(
+            [
+                Advertisement(
+                    public_key=node.public_key,
+                    name=None,
+                    node_id=node.id,
+                    received_at=datetime.now(timezone.utc),
+                ),
+                Advertisement(
+                    public_key="other1other1other1other1other1ot",
+                    name="Valley",
+                    received_at=datetime.now(timezone.utc),
+                ),
+            ]
+        )
+        api_db_session.commit()
+
+        response = client_no_auth.get("/api/v1/advertisements?search=hillt")
+        assert response.status_code == 200
+        data = response.json()
+        assert data["total"] == 1
+        assert data["items"][0]["node_name"] == "Hilltop"
+
     def test_list_advertisements_filter_by_observed_by_single(
         self,
         client_no_auth,
@@ -5,7 +5,8 @@ from unittest.mock import patch
 
 import pytest
 
-from meshcore_hub.api.routes.dashboard import _date_bucket_key
+from meshcore_hub.api.routes import dashboard as dashboard_routes
+from meshcore_hub.api.routes.dashboard import _date_bucket_key, _date_range_keys
 from meshcore_hub.common.models import (
     Advertisement,
     EventObserver,
@@ -48,6 +49,24 @@ class TestDateBucketKey:
         assert _date_bucket_key(date(2026, 1, 5)) == "2026-01-05"
 
 
+class TestDateRangeKeys:
+    """Unit tests for the _date_range_keys day-series helper."""
+
+    def test_consecutive_days_across_month_end(self) -> None:
+        """Keys are zero-padded and roll over month boundaries."""
+        start = datetime(2026, 1, 30, tzinfo=timezone.utc)
+        assert _date_range_keys(start, 4) == [
+            "2026-01-30",
+            "2026-01-31",
+            "2026-02-01",
+            "2026-02-02",
+        ]
+
+    def test_zero_days(self) -> None:
+        """An empty window yields no keys."""
+        assert _date_range_keys(datetime(2026, 1, 1, tzinfo=timezone.utc), 0) == []
+
+
 class TestDashboardStats:
     """Tests for GET /dashboard/stats endpoint."""
 
@@ -68,6 +87,48 @@ class TestDashboardStats:
         assert "recent_advertisements" not in data
         assert "channel_messages" not in data
 
+    def test_get_stats_memo_tracks_new_messages(self, client_no_auth, api_db_session):
+        """Memoized stats are reused until a new message arrives."""
+        response = client_no_auth.get("/api/v1/dashboard/stats")
+        assert response.json()["total_nodes"] == 0
+
+        # A new node alone does not move the watermark, so the memo is served
+        api_db_session.add(Node(public_key="m" * 64, name="Memo"))
+        api_db_session.commit()
+        response = client_no_auth.get("/api/v1/dashboard/stats")
+        assert response.json()["total_nodes"] == 0
+
+        api_db_session.add(
+            Message(message_type="contact", text="hi", pubkey_prefix="abc")
+        )
+        api_db_session.commit()
+        data = client_no_auth.get("/api/v1/dashboard/stats").json()
+        assert data["total_nodes"] == 1
+        assert data["total_messages"] == 1
+
+    def test_get_stats_memo_miss_not_blocked_by_other_key(self, client_no_auth):
+        """A miss computing for one role does not hold up other roles."""
+        with dashboard_routes._stats_memo_key_lock("dashboard/stats:role=admin:"):
+            response = client_no_auth.get("/api/v1/dashboard/stats")
+        assert response.status_code == 200
+
+    def test_get_stats_memo_not_stored_across_invalidation(self, client_no_auth):
+        """A result computed while the memo was cleared is not memoized."""
+        compute = dashboard_routes._compute_stats
+
+        def compute_then_invalidate(session, request):
+            stats = compute(session, request)
+            dashboard_routes.clear_stats_memo()
+            return stats
+
+        with patch.object(
+            dashboard_routes, "_compute_stats", side_effect=compute_then_invalidate
+        ):
+            response = client_no_auth.get("/api/v1/dashboard/stats")
+
+        assert response.status_code == 200
+        assert dashboard_routes._stats_memo == {}
+
     def test_get_stats_with_data(
         self, client_no_auth, sample_node, sample_message, sample_advertisement
     ):
@@ -1238,6 +1299,45 @@ class TestDashboardRecentActivity:
         assert str(pub_idx) in data["channel_messages"]
         assert str(adm_idx) in data["channel_messages"]
 
+    def test_recent_activity_latest_five_per_channel(
+        self, client_no_auth, api_db_session
+    ):
+        """Each channel returns its own five newest messages, newest first."""
+        now = datetime.now(timezone.utc)
+        node = Node(public_key="abcdef123456" + "0" * 52, name="Sender")
+        api_db_session.add(node)
+        for channel_idx in (17, 18):
+            for i in range(7):
+                api_db_session.add(
+                    Message(
+                        message_type="channel",
+                        channel_idx=channel_idx,
+                        pubkey_prefix="abcdef123456",
+                        text=f"ch{channel_idx}-{i}",
+                        received_at=now - timedelta(minutes=i),
+                    )
+                )
+        api_db_session.add(
+            Channel(
+                name="Other",
+                key_hex="00" * 16,
+                channel_hash="12",
+                visibility="community",
+                enabled=True,
+            )
+        )
+        api_db_session.commit()
+
+        response = client_no_auth.get("/api/v1/dashboard/recent-activity")
+        assert response.status_code == 200
+        channel_messages = response.json()["channel_messages"]
+        for channel_idx in (17, 18):
+            msgs = channel_messages[str(channel_idx)]
+            assert [m["text"] for m in msgs] == [
+                f"ch{channel_idx}-{i}" for i in range(5)
+            ]
+            assert all(m["sender_name"] == "Sender" for m in msgs)
+
     def test_recent_activity_caches_at_default_ttl_not_dashboard(
         self, client_no_auth, api_db_session
     ):
@@ -4,6 +4,7 @@ from datetime import datetime, timedelta, timezone
 
 import pytest
 
+from meshcore_hub.api.observer_utils import _prefix_upper_bound
 from meshcore_hub.common.hash_utils import compute_message_hash
 from meshcore_hub.common.models import EventObserver, Message, Node, NodeTag, Channel
 
@@ -49,6 +50,29 @@ class TestListMessages:
         assert data["limit"] == 25
         assert data["offset"] == 10
 
+    def test_list_messages_total_spans_pages(self, client_no_auth, api_db_session):
+        """Total counts the whole filtered set, including past the last page."""
+        now = datetime.now(timezone.utc)
+        api_db_session.add_all(
+            [
+                Message(
+                    message_type="contact",
+                    text=f"msg {i}",
+                    received_at=now - timedelta(minutes=i),
+                )
+                for i in range(3)
+            ]
+        )
+        api_db_session.commit()
+
+        data = client_no_auth.get("/api/v1/messages?limit=2").json()
+        assert len(data["items"]) == 2
+        assert data["total"] == 3
+
+        data = client_no_auth.get("/api/v1/messages?limit=2&offset=5").json()
+        assert data["items"] == []
+        assert data["total"] == 3
+
     def test_list_messages_sender_name_resolution(self, client_no_auth, api_db_session):
         """Messages resolve sender name from matching pubkey_prefix."""
         sender_node = Node(
@@ -112,6 +136,82 @@ class TestListMessages:
         assert names["from alice"] == "Alice"
         assert names["from bob"] == "Bob"
 
+    def test_list_messages_resolves_short_and_uppercase_prefixes(
+        self, client_no_auth, api_db_session
+    ):
+        """Prefixes shorter than 12 chars or in upper case still resolve."""
+        api_db_session.add_all(
+            [
+                Node(public_key="cc" + "2" * 62, name="Carol"),
+                Node(public_key="dd" + "3" * 62, name="Dave"),
+            ]
+        )
+        api_db_session.commit()
+
+        now = datetime.now(timezone.utc)
+        api_db_session.add_all(
+            [
+                Message(
+                    message_type="contact",
+                    pubkey_prefix="CC" + "2" * 10,
+                    text="from carol",
+                    received_at=now,
+                ),
+                Message(
+                    message_type="contact",
+                    pubkey_prefix="dd" + "3" * 6,
+                    text="from dave",
+                    received_at=now,
+                ),
+            ]
+        )
+        api_db_session.commit()
+
+        response = client_no_auth.get("/api/v1/messages")
+        assert response.status_code == 200
+        names = {item["text"]: item["sender_name"] for item in response.json()["items"]}
+        assert names["from carol"] == "Carol"
+        assert names["from dave"] == "Dave"
+
+    def test_list_messages_resolves_prefixes_ending_in_9_and_f(
+        self, client_no_auth, api_db_session
+    ):
+        """Prefixes ending in 9 or F resolve, and neighbouring keys do not."""
+        api_db_session.add_all(
+            [
+                Node(public_key="ab9" + "0" * 61, name="Nine"),
+                Node(public_key="aba" + "0" * 61, name="NotNine"),
+                Node(public_key="cdf" + "0" * 61, name="Eff"),
+                Node(public_key="ce" + "0" * 62, name="NotEff"),
+            ]
+        )
+        api_db_session.commit()
+
+        now = datetime.now(timezone.utc)
+        api_db_session.add_all(
+            [
+                Message(
+                    message_type="contact",
+                    pubkey_prefix="ab9",
+                    text="from nine",
+                    received_at=now,
+                ),
+                Message(
+                    message_type="contact",
+                    pubkey_prefix="CDF",
+                    text="from eff",
+                    received_at=now,
+                ),
+            ]
+        )
+        api_db_session.commit()
+
+        response = client_no_auth.get("/api/v1/messages")
+        assert response.status_code == 200
+        names = {item["text"]: item["sender_name"] for item in response.json()["items"]}
+        assert names["from nine"] == "Nine"
+        assert names["from eff"] == "Eff"
+
     def test_list_messages_sender_tag_name_resolution(
         self, client_no_auth, api_db_session
     ):
@@ -900,3 +1000,22 @@ class TestSpamFiltering:
         data = client_no_auth.get("/api/v1/messages").json()
         clean = next(i for i in data["items"] if i["text"] == "clean one")
         assert clean["spam_score"] == 0.0
+
+
+class TestPrefixUpperBound:
+    """Tests for the hex-aware prefix range bound."""
+
+    @pytest.mark.parametrize(
+        ("prefix", "expected"),
+        [
+            ("ab0", "ab1"),
+            ("ab9", "aba"),
+            ("abe", "abf"),
+            ("abf", "ac"),
+            ("aff", "b"),
+            ("fff", None),
+            ("tag", "tah"),
+        ],
+    )
+    def test_upper_bound(self, prefix, expected):
+        assert _prefix_upper_bound(prefix) == expected
@@ -1,8 +1,10 @@
 """Tests for Prometheus metrics endpoint."""
 
+import asyncio
 import base64
-from datetime import datetime, timezone
-from unittest.mock import patch
+import time
+from datetime import datetime, timedelta, timezone
+from unittest.mock import MagicMock, patch
 
 from fastapi.testclient import TestClient
 from sqlalchemy.orm import sessionmaker
@@ -14,6 +16,9 @@ from meshcore_hub.api.dependencies import (
     get_mqtt_client,
 )
 from meshcore_hub.common.models import (
+    Advertisement,
+    Message,
+    MetricSnapshot,
     Node,
     Route,
     RouteResult,
@@ -33,6 +38,7 @@ def _clear_metrics_cache() -> None:
     from meshcore_hub.api.metrics import _cache
 
     _cache["output"] = b""
+    _cache["etag"] = ""
     _cache["expires_at"] = 0.0
 
 
@@ -127,6 +133,34 @@ class TestMetricsAuth:
         )
         assert response.status_code == 401
 
+    def test_fail_with_malformed_base64(self, client_with_auth):
+        """Test 401 when the Basic credentials are not valid base64."""
+        _clear_metrics_cache()
+        response = client_with_auth.get(
+            "/metrics",
+            headers={"Authorization": "Basic not*base64!"},
+        )
+        assert response.status_code == 401
+
+    def test_fail_without_separator(self, client_with_auth):
+        """Test 401 when the decoded credentials have no colon separator."""
+        _clear_metrics_cache()
+        credentials = base64.b64encode(b"metricstest-read-key").decode()
+        response = client_with_auth.get(
+            "/metrics",
+            headers={"Authorization": f"Basic {credentials}"},
+        )
+        assert response.status_code == 401
+
+    def test_fail_with_non_ascii_password(self, client_with_auth):
+        """Test 401 (not 500) for non-ASCII passwords."""
+        _clear_metrics_cache()
+        response = client_with_auth.get(
+            "/metrics",
+            headers={"Authorization": _make_basic_auth("metrics", "pässwörd")},
+        )
+        assert response.status_code == 401
+
 
 class TestMetricsData:
     """Tests for metrics data accuracy."""
@@ -178,6 +212,92 @@ class TestMetricsData:
         assert response.status_code == 200
         assert "meshcore_trace_paths_total 1.0" in response.text
 
+    def test_windowed_counts_bucket_by_age(self, api_db_session, client_no_auth):
+        """Test that windowed gauges count each row into every window it falls in."""
+        now = datetime.now(timezone.utc)
+        for age in (timedelta(minutes=5), timedelta(hours=3), timedelta(days=10)):
+            api_db_session.add(
+                Message(
+                    message_type="channel",
+                    channel_idx=0,
+                    text="windowed",
+                    received_at=now - age,
+                )
+            )
+            api_db_session.add(
+                Advertisement(
+                    public_key="window1234window1234window1234wi",
+                    received_at=now - age,
+                )
+            )
+        api_db_session.commit()
+
+        _clear_metrics_cache()
+        text = client_no_auth.get("/metrics").text
+        assert 'meshcore_messages_received{type="channel",window="1h"} 1.0' in text
+        assert 'meshcore_messages_received{type="channel",window="24h"} 2.0' in text
+        assert 'meshcore_messages_received{type="channel",window="30d"} 3.0' in text
+        assert 'meshcore_advertisements_received{window="1h"} 1.0' in text
+        assert 'meshcore_advertisements_received{window="7d"} 2.0' in text
+        assert 'meshcore_advertisements_received{window="30d"} 3.0' in text
+
+    def test_totals_served_from_snapshots(self, api_db_session, client_no_auth):
+        """Test that full-table totals are read from metric_snapshots when present."""
+        api_db_session.add(Node(public_key="snap" * 16))
+        api_db_session.add(MetricSnapshot(metric_name="nodes_total", value=42))
+        api_db_session.add(
+            MetricSnapshot(metric_name="messages_total:contact", value=7)
+        )
+        api_db_session.commit()
+
+        _clear_metrics_cache()
+        text = client_no_auth.get("/metrics").text
+        assert "meshcore_nodes_total 42.0" in text
+        assert 'meshcore_messages_total{type="contact"} 7.0' in text
+
+    def test_stale_snapshots_fall_back_to_live_counts(
+        self, api_db_session, client_no_auth
+    ):
+        """Test that snapshots older than the max age are ignored."""
+        from meshcore_hub.collector.metric_snapshots import SNAPSHOT_MAX_AGE_SECONDS
+
+        stale = datetime.now(timezone.utc) - timedelta(
+            seconds=SNAPSHOT_MAX_AGE_SECONDS + 60
+        )
+        api_db_session.add(Node(public_key="stale" * 12 + "abcd"))
+        api_db_session.add(
+            MetricSnapshot(metric_name="nodes_total", value=42, updated_at=stale)
+        )
+        api_db_session.commit()
+
+        _clear_metrics_cache()
+        text = client_no_auth.get("/metrics").text
+        assert "meshcore_nodes_total 1.0" in text
+
+    def test_totals_counted_without_snapshot_table(self):
+        """Test that totals fall back to live counts before the migration runs."""
+        from sqlalchemy import create_engine
+
+        from meshcore_hub.api.metrics import collect_metrics
+        from meshcore_hub.common.models import Base
+
+        engine = create_engine("sqlite://")
+        Base.metadata.create_all(engine)
+        MetricSnapshot.__table__.drop(engine)
+        session = sessionmaker(bind=engine)()
+        try:
+            session.add(Node(public_key="nosnap" * 10 + "abcd"))
+            session.add(Message(message_type="contact", text="hi"))
+            session.commit()
+
+            text = collect_metrics(session).decode()
+        finally:
+            session.close()
+            engine.dispose()
+
+        assert "meshcore_nodes_total 1.0" in text
+        assert 'meshcore_messages_total{type="contact"} 1.0' in text
+
     def test_node_last_seen_timestamp_no_adoption(self, api_db_session, client_no_auth):
         """Test that node_last_seen_timestamp includes adopted=false for unadopted nodes."""
         seen_at = datetime(2025, 6, 15, 12, 0, 0, tzinfo=timezone.utc)
@@ -402,6 +522,66 @@ class TestMetricsCache:
         response2 = client_no_auth.get("/metrics")
         assert response1.text == response2.text
 
+    def test_conditional_get_returns_304(self, client_no_auth):
+        """Test that a matching If-None-Match gets an empty 304."""
+        _clear_metrics_cache()
+        response1 = client_no_auth.get("/metrics")
+        etag = response1.headers["ETag"]
+
+        response2 = client_no_auth.get("/metrics", headers={"If-None-Match": etag})
+        assert response2.status_code == 304
+        assert response2.content == b""
+        assert response2.headers["ETag"] == etag
+
+        response3 = client_no_auth.get("/metrics", headers={"If-None-Match": '"stale"'})
+        assert response3.status_code == 200
+        assert response3.text == response1.text
+
+    async def test_stale_output_served_while_refresh_in_flight(self):
+        """Test that recently expired output is served while another scrape refreshes."""
+        from meshcore_hub.api.metrics import (
+            MetricsConfig,
+            _cache,
+            _get_refresh_lock,
+            metrics,
+        )
+
+        request = MagicMock()
+        request.app.state.metrics_config = MetricsConfig(cache_ttl=60, password=None)
+        _cache["output"] = b"# stale\n"
+        _cache["expires_at"] = time.time() - 1
+
+        async with _get_refresh_lock():
+            with patch("meshcore_hub.api.metrics.collect_metrics") as collect:
+                response = await metrics(request)
+
+        collect.assert_not_called()
+        assert response.body == b"# stale\n"
+        _clear_metrics_cache()
+
+    def test_refresh_lock_recreated_per_event_loop(self):
+        """Test that each event loop gets its own refresh lock."""
+        from meshcore_hub.api.metrics import _get_refresh_lock
+
+        async def hold_lock_contended() -> asyncio.Lock:
+            lock = _get_refresh_lock()
+            assert _get_refresh_lock() is lock
+
+            async def waiter() -> None:
+                async with lock:
+                    pass
+
+            # A waiter on a held lock binds the lock to this loop
+            async with lock:
+                task = asyncio.create_task(waiter())
+                await asyncio.sleep(0)
+            await task
+            return lock
+
+        first = asyncio.run(hold_lock_contended())
+        second = asyncio.run(hold_lock_contended())
+        assert first is not second
+
 
 class TestRouteMetrics:
     """Tests for route health metrics."""
@@ -443,3 +623,20 @@ class TestRouteMetrics:
         _clear_metrics_cache()
         response = client_no_auth.get("/metrics")
         assert 'route="Off -> Off"' not in response.text
+
+
+class TestFormatValue:
+    """Tests for sample value formatting."""
+
+    def test_formats(self):
+        """Test the exposition format for ints, large floats and non-finite values."""
+        from meshcore_hub.api.metrics import _format_value
+
+        assert _format_value(0) == "0.0"
+        assert _format_value(42) == "42.0"
+        assert _format_value(0.5) == "0.5"
+        assert _format_value(1749988800) == "1749988800.0"
+        assert _format_value(1e22) == "1e+22"
+        assert _format_value(float("nan")) == "NaN"
+        assert _format_value(float("inf")) == "+Inf"
+        assert _format_value(float("-inf")) == "-Inf"
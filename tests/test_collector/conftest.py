@@ -18,6 +18,16 @@ from meshcore_hub.common.database import DatabaseManager
 from meshcore_hub.common.models.base import Base
 
 
+@pytest.fixture(autouse=True)
+def _clear_recent_traces():
+    """Each test gets a fresh database, so forget traces stored by others."""
+    from meshcore_hub.collector.handlers.trace import clear_recent_traces
+
+    clear_recent_traces()
+    yield
+    clear_recent_traces()
+
+
 def _truncate_all(engine) -> None:
     """Delete rows from every table in child-first order (FK-safe)."""
     with engine.begin() as conn:
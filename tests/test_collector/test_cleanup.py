@@ -261,6 +261,134 @@ async def test_cleanup_stats_repr() -> None:
     assert "messages=5" in repr_str
 
 
+@pytest.mark.asyncio
+async def test_cleanup_old_data_deletes_in_chunks(
+    async_db_session: AsyncSession,
+) -> None:
+    """Expired rows are removed across several small batches."""
+    old_date = datetime.now(timezone.utc) - timedelta(days=60)
+    async_db_session.add_all(
+        [
+            EventLog(event_type="test_event", created_at=old_date, updated_at=old_date)
+            for _ in range(5)
+        ]
+    )
+    await async_db_session.commit()
+
+    stats = await cleanup_old_data(
+        async_db_session, retention_days=30, dry_run=False, chunk_size=2
+    )
+
+    assert stats.event_logs_deleted == 5
+    remaining = await async_db_session.execute(
+        select(func.count()).select_from(EventLog)
+    )
+    assert remaining.scalar() == 0
+
+
+@pytest.mark.asyncio
+async def test_cleanup_skips_tables_with_nothing_expired(
+    async_db_session: AsyncSession, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Without expired rows, neither the count nor the DELETE is issued."""
+    from meshcore_hub.collector import cleanup as cleanup_module
+
+    async def fail(*args: object, **kwargs: object) -> None:
+        raise AssertionError("should not be called")
+
+    monkeypatch.setattr(cleanup_module, "_estimate_rows", fail)
+    monkeypatch.setattr(cleanup_module, "_delete_in_chunks", fail)
+    now = datetime.now(timezone.utc)
+    async_db_session.add(EventLog(event_type="fresh", created_at=now, updated_at=now))
+    await async_db_session.commit()
+
+    for dry_run in (True, False):
+        stats = await cleanup_old_data(
+            async_db_session, retention_days=30, dry_run=dry_run
+        )
+        assert stats.total_deleted == 0
+
+
+@pytest.mark.asyncio
+async def test_cleanup_old_data_max_batches_leaves_remainder(
+    async_db_session: AsyncSession,
+) -> None:
+    """max_batches caps the work done per run; the rest waits for the next."""
+    old_date = datetime.now(timezone.utc) - timedelta(days=60)
+    async_db_session.add_all(
+        [
+            EventLog(event_type="test_event", created_at=old_date, updated_at=old_date)
+            for _ in range(5)
+        ]
+    )
+    await async_db_session.commit()
+
+    stats = await cleanup_old_data(
+        async_db_session,
+        retention_days=30,
+        dry_run=False,
+        chunk_size=2,
+        max_batches=2,
+    )
+
+    assert stats.event_logs_deleted == 4
+    remaining = await async_db_session.execute(
+        select(func.count()).select_from(EventLog)
+    )
+    assert remaining.scalar() == 1
+
+
+@pytest.mark.asyncio
+async def test_cleanup_old_data_concurrent_sessions(
+    tmp_path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """With a session factory on a multi-writer backend, each table is
+    cleaned in its own session and every count is still reported."""
+    from meshcore_hub.collector import cleanup as cleanup_module
+    from meshcore_hub.common.database import DatabaseManager
+
+    monkeypatch.setattr(cleanup_module, "_supports_concurrent_cleanup", lambda db: True)
+    manager = DatabaseManager(f"sqlite:///{tmp_path / 'cleanup.db'}")
+    manager.create_tables()
+    try:
+        old_date = datetime.now(timezone.utc) - timedelta(days=60)
+        async with manager.async_session() as session:
+            session.add_all(
+                [
+                    EventLog(
+                        event_type="test_event",
+                        created_at=old_date,
+                        updated_at=old_date,
+                    ),
+                    Message(
+                        message_type="contact",
+                        text="old",
+                        created_at=old_date,
+                        updated_at=old_date,
+                    ),
+                ]
+            )
+            await session.commit()
+
+        async with manager.async_session() as session:
+            stats = await cleanup_old_data(
+                session,
+                retention_days=30,
+                dry_run=False,
+                session_factory=manager.async_session,
+            )
+
+        assert stats.event_logs_deleted == 1
+        assert stats.messages_deleted == 1
+        assert stats.total_deleted == 2
+        async with manager.async_session() as session:
+            for model in (EventLog, Message):
+                result = await session.execute(select(func.count()).select_from(model))
+                assert result.scalar() == 0
+    finally:
+        manager.dispose()
+
+
 @pytest.mark.asyncio
 async def test_cleanup_inactive_nodes_cascades(async_db_session: AsyncSession) -> None:
     """Test that deleting inactive nodes cascades to dependent tables."""
@@ -548,3 +676,45 @@ async def test_raw_packet_only_observer_keeps_flag(
         select(Node.is_observer).where(Node.id == node.id)
     )
     assert flag is True
+
+
+def test_dry_run_estimate_uses_explain_json_on_postgres() -> None:
+    """The Postgres dry-run estimate wraps the SELECT in EXPLAIN (FORMAT JSON)."""
+    from sqlalchemy.dialects import postgresql
+
+    from meshcore_hub.collector.cleanup import _ExplainJson
+
+    stmt = select(EventLog.id).where(EventLog.created_at < datetime.now(timezone.utc))
+    sql = str(_ExplainJson(stmt).compile(dialect=postgresql.dialect()))
+
+    assert sql.startswith("EXPLAIN (FORMAT JSON) SELECT events_log.id")
+
+
+@pytest.mark.parametrize(
+    "plan",
+    [
+        [{"Plan": {"Node Type": "Index Scan", "Plan Rows": 1234}}],
+        '[{"Plan": {"Node Type": "Index Scan", "Plan Rows": 1234}}]',
+    ],
+)
+def test_plan_rows_reads_top_node_estimate(plan: object) -> None:
+    """Plan Rows is read from decoded (psycopg) or raw (asyncpg) JSON."""
+    from meshcore_hub.collector.cleanup import _plan_rows
+
+    assert _plan_rows(plan) == 1234
+
+
+@pytest.mark.asyncio
+async def test_exclusive_cleanup_rejects_overlapping_runs(
+    async_db_session: AsyncSession,
+) -> None:
+    """A second run is refused while one holds the lock, and allowed after."""
+    from meshcore_hub.collector.cleanup import exclusive_cleanup
+
+    async with exclusive_cleanup(async_db_session) as first:
+        assert first is True
+        async with exclusive_cleanup(async_db_session) as second:
+            assert second is False
+
+    async with exclusive_cleanup(async_db_session) as again:
+        assert again is True
@@ -1,5 +1,7 @@
 """Tests for trace data handler."""
 
+from unittest.mock import patch
+
 from sqlalchemy import select
 
 from meshcore_hub.common.models import EventObserver, Node, TracePath
@@ -61,6 +63,18 @@ class TestHandleTraceData:
         observers = db_session.execute(select(EventObserver)).scalars().all()
         assert len(observers) == 2
 
+    def test_recent_duplicate_skips_insert(self, db_manager, db_session):
+        """A trace stored moments ago is not re-inserted; its observer is."""
+        payload = {"initiator_tag": 424242, "hop_count": 1}
+        handle_trace_data("a" * 64, "trace_data", payload, db_manager)
+
+        with patch("meshcore_hub.collector.handlers.trace.insert_event") as mock_insert:
+            handle_trace_data("b" * 64, "trace_data", payload, db_manager)
+
+        mock_insert.assert_not_called()
+        observers = db_session.execute(select(EventObserver)).scalars().all()
+        assert len(observers) == 2
+
     def test_creates_receiver_node(self, db_manager, db_session):
         """Receiver node is created if it does not exist."""
         payload = {
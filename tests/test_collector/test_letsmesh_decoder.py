@@ -2,6 +2,8 @@
 
 from unittest.mock import MagicMock, patch
 
+import pytest
+
 from meshcore_hub.collector.letsmesh_decoder import LetsMeshPacketDecoder
 
 
@@ -21,6 +23,16 @@ def test_decode_payload_rejects_non_hex_raw_without_invoking_decoder() -> None:
     mock_lib.decode.assert_not_called()
 
 
+def test_decode_payload_rejects_odd_length_hex_without_invoking_decoder() -> None:
+    """A truncated (odd-length) hex payload cannot be a packet."""
+    decoder = LetsMeshPacketDecoder()
+
+    with patch("meshcore_hub.collector.letsmesh_decoder.MeshCoreDecoder") as mock_lib:
+        assert decoder.decode_payload({"raw": "AABBC"}) is None
+
+    mock_lib.decode.assert_not_called()
+
+
 def test_decode_payload_calls_native_decoder() -> None:
     """Decoder calls MeshCoreDecoder.decode and returns dict output."""
     decoder = LetsMeshPacketDecoder(
@@ -142,6 +154,31 @@ def test_decode_payload_caches_results() -> None:
     mock_decode.assert_called_once()
 
 
+def test_decode_cache_evicts_least_recently_used() -> None:
+    """A cache hit refreshes recency, so the oldest untouched entry is evicted."""
+    decoder = LetsMeshPacketDecoder()
+    decoder._decode_cache_maxsize = 2
+
+    mock_result = MagicMock()
+    mock_result.is_valid = True
+    mock_result.to_dict.return_value = {"payloadType": 4}
+
+    with patch(
+        "meshcore_hub.collector.letsmesh_decoder.MeshCoreDecoder.decode",
+        return_value=mock_result,
+    ) as mock_decode:
+        decoder.decode_payload({"raw": "AA"})
+        decoder.decode_payload({"raw": "BB"})
+        decoder.decode_payload({"raw": "aa"})  # hit, case-insensitive
+        decoder.decode_payload({"raw": "CC"})  # evicts BB
+        assert mock_decode.call_count == 3
+
+        decoder.decode_payload({"raw": "AA"})
+        assert mock_decode.call_count == 3
+        decoder.decode_payload({"raw": "BB"})
+        assert mock_decode.call_count == 4
+
+
 def test_flatten_control_parsed_merges_parsed_into_decoded() -> None:
     """Control payload parsed fields are flattened into decoded dict."""
     decoded_dict = {
@@ -274,3 +311,19 @@ def test_channel_name_from_decoded_returns_none_for_non_dict() -> None:
         )
         is None
     )
+
+
+@pytest.mark.parametrize(
+    ("value", "expected"),
+    [
+        ("8B3387E9C5CDEA6AC9E5EDBAA115CD72", True),
+        ("abc", True),
+        ("", False),
+        ("AB CD", False),
+        ("0xAB", False),
+        ("AB\n", False),
+    ],
+)
+def test_is_hex(value: str, expected: bool) -> None:
+    """Only non-empty strings of hex digits qualify, with no separators."""
+    assert LetsMeshPacketDecoder._is_hex(value) is expected
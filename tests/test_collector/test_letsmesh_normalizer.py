@@ -2,6 +2,8 @@
 
 from unittest.mock import MagicMock
 
+import pytest
+
 from meshcore_hub.collector.letsmesh_normalizer import LetsMeshNormalizer
 
 
@@ -70,6 +72,167 @@ class TestNormalizeHashList:
         assert result == ["4A"]
 
 
+class TestHexValidation:
+    """Tests for the hex checks in key and channel-hash normalizers."""
+
+    def test_pubkey_prefix_strips_0x_and_truncates(self) -> None:
+        """Prefixes drop a 0x marker, uppercase, and keep 12 characters."""
+        result = LetsMeshNormalizer._normalize_pubkey_prefix(" 0xabcdef0123456789 ")
+        assert result == "ABCDEF012345"
+
+    def test_pubkey_prefix_rejects_non_hex(self) -> None:
+        """Non-hex characters anywhere in the prefix reject it."""
+        assert LetsMeshNormalizer._normalize_pubkey_prefix("abcdef01234g") is None
+        assert LetsMeshNormalizer._normalize_pubkey_prefix("0xabc123") is None
+        # Non-ASCII letters that upper-case into hex digits are rejected.
+        assert LetsMeshNormalizer._normalize_pubkey_prefix("\ufb00" * 6) is None
+
+    def test_full_public_key_requires_64_hex_chars(self) -> None:
+        """Full keys are lowercased; wrong length or non-hex is rejected."""
+        key = "AB" * 32
+        assert LetsMeshNormalizer._normalize_full_public_key(key) == key.lower()
+        assert LetsMeshNormalizer._normalize_full_public_key(key[:-1] + "z") is None
+        assert LetsMeshNormalizer._normalize_full_public_key(key[:-2]) is None
+
+    def test_channel_hash_idx(self) -> None:
+        """One-byte channel hashes parse to ints; anything else is None."""
+        assert LetsMeshNormalizer._parse_channel_hash_idx("fe") == 254
+        assert LetsMeshNormalizer._parse_channel_hash_idx("g1") is None
+        assert LetsMeshNormalizer._parse_channel_hash_idx("abc") is None
+
+    def test_decoder_channel_hash_uppercased(self) -> None:
+        """Decoded channel hashes are validated and returned uppercase."""
+
+        def decoded(channel_hash: object) -> dict[str, object]:
+            return {"payload": {"decoded": {"channelHash": channel_hash}}}
+
+        extract = LetsMeshNormalizer._extract_letsmesh_decoder_channel_hash
+        assert extract(decoded(" a1 ")) == "A1"
+        assert extract(decoded("zz")) is None
+        assert extract(decoded("a1b2")) is None
+        assert extract(decoded(17)) is None
+
+    def test_parse_hex_or_int_accepts_mixed_case_hex(self) -> None:
+        """Hex strings with or without 0x parse regardless of case."""
+        assert LetsMeshNormalizer._parse_hex_or_int("0xFf") == 255
+        assert LetsMeshNormalizer._parse_hex_or_int("xyz") is None
+
+
+class TestExtractLetsMeshText:
+    """Tests for _extract_letsmesh_text nested payload search."""
+
+    def test_top_level_key_wins(self) -> None:
+        """Text keys on the payload itself are checked before nested dicts."""
+        payload = {"decoded": {"text": "nested"}, "message": "  top  "}
+        assert LetsMeshNormalizer._extract_letsmesh_text(payload) == "top"
+
+    def test_nested_dicts_searched_depth_first(self) -> None:
+        """The first nested dict is exhausted before later siblings."""
+        payload = {
+            "a": {"inner": {"body": "deep first"}},
+            "b": {"text": "shallow second"},
+        }
+        assert LetsMeshNormalizer._extract_letsmesh_text(payload) == "deep first"
+
+    def test_depth_limit(self) -> None:
+        """Text nested more than three levels below the payload is ignored."""
+        payload = {"a": {"b": {"c": {"text": "level 3"}}}}
+        assert LetsMeshNormalizer._extract_letsmesh_text(payload) == "level 3"
+        assert LetsMeshNormalizer._extract_letsmesh_text({"x": payload}) is None
+
+
+class TestNormalizeAdvType:
+    """Tests for _normalize_letsmesh_adv_type status-field mapping."""
+
+    @pytest.mark.parametrize(
+        ("payload", "expected"),
+        [
+            ({"type": "Room Server"}, "room"),
+            ({"role": " RELAY "}, "repeater"),
+            ({"mode": "observer"}, "companion"),
+            ({"adv_type": "chat"}, "chat"),
+            ({"type": "chat", "name": "Hilltop Repeater"}, "repeater"),
+            ({"type": "sensor"}, None),
+            ({"type": "  ", "name": 3}, None),
+            ({}, None),
+        ],
+    )
+    def test_maps_status_fields(
+        self, payload: dict[str, object], expected: str | None
+    ) -> None:
+        """Substring tokens map to adv types in precedence order."""
+        assert LetsMeshNormalizer._normalize_letsmesh_adv_type(payload) == expected
+
+    @pytest.mark.parametrize(
+        ("value", "expected"),
+        [
+            (1, "chat"),
+            (2.0, "repeater"),
+            (3, "room"),
+            (4, "companion"),
+            (0, None),
+            (9, None),
+            (" Room Server ", "room"),
+            ("Repeater", "repeater"),
+            ("", None),
+            (None, None),
+        ],
+    )
+    def test_maps_node_type_values(self, value: object, expected: str | None) -> None:
+        """Numeric node types use the fixed table; strings use the tokens."""
+        assert LetsMeshNormalizer._normalize_letsmesh_node_type(value) == expected
+
+
+class TestNormalizePacketDecodesOnce:
+    """The packets feed decodes each payload once, even when decoding fails."""
+
+    def test_undecodable_packet_is_decoded_once(self) -> None:
+        """A failed decode is not retried by the individual builders."""
+        from meshcore_hub.common.mqtt import TopicBuilder
+
+        norm = LetsMeshNormalizer()
+        norm.mqtt = MagicMock()
+        norm.mqtt.topic_builder = TopicBuilder(prefix="meshcore")
+        norm._letsmesh_decoder = MagicMock()
+        norm._letsmesh_decoder.decode_payload.return_value = None
+        norm._include_test_channel = False
+
+        result = norm._normalize_letsmesh_event(
+            "meshcore/STN/" + "a" * 64 + "/packets",
+            {"packet_type": "4", "raw": "zz", "hash": "ABCD"},
+        )
+
+        assert result is not None
+        assert result[1] == "advert"
+        norm._letsmesh_decoder.decode_payload.assert_called_once()
+
+
+class TestNestedDict:
+    """Tests for the _nested_dict decoder-output accessor."""
+
+    def test_walks_dict_path(self) -> None:
+        """The dict at the end of the path is returned."""
+        decrypted = {"timestamp": 1700000000}
+        packet = {"payload": {"decoded": {"decrypted": decrypted}}}
+        assert (
+            LetsMeshNormalizer._nested_dict(packet, "payload", "decoded", "decrypted")
+            is decrypted
+        )
+        assert (
+            LetsMeshNormalizer._extract_letsmesh_decoder_sender_timestamp(packet)
+            == 1700000000
+        )
+
+    @pytest.mark.parametrize(
+        "packet",
+        [None, "raw", {"payload": "x"}, {"payload": {"decoded": None}}, {}],
+    )
+    def test_non_dict_step_returns_none(self, packet: object) -> None:
+        """Any missing or non-dict step short-circuits to None."""
+        assert LetsMeshNormalizer._nested_dict(packet, "payload", "decoded") is None
+        assert LetsMeshNormalizer._extract_letsmesh_decoder_payload(packet) is None
+
+
 class TestAdvertisementSnrAndPath:
     """Tests for SNR and path_len extraction in advertisement payloads."""
 
@@ -0,0 +1,34 @@
+"""Tests for the collector-side /metrics snapshot refresh."""
+
+from sqlalchemy import select
+
+from meshcore_hub.collector.metric_snapshots import run_snapshot_refresh
+from meshcore_hub.common.models import Message, MetricSnapshot, Node
+
+
+class TestRunSnapshotRefresh:
+    """Tests for run_snapshot_refresh."""
+
+    def test_upserts_totals_and_drops_stale_keys(self, db_manager):
+        """Refreshing upserts current totals and removes keys that no longer apply."""
+        with db_manager.session_scope() as session:
+            session.add(MetricSnapshot(metric_name="nodes_total", value=99))
+            session.add(MetricSnapshot(metric_name="messages_total:contact", value=5))
+            session.add(Node(public_key="snap" * 16))
+            session.add(Message(message_type="channel", channel_idx=0, text="snap"))
+
+        run_snapshot_refresh(db_manager)
+
+        with db_manager.session_scope() as session:
+            snapshots = dict(
+                session.execute(
+                    select(MetricSnapshot.metric_name, MetricSnapshot.value)
+                ).all()
+            )
+        assert snapshots == {
+            "nodes_total": 1.0,
+            "advertisements_total": 0.0,
+            "telemetry_total": 0.0,
+            "trace_paths_total": 0.0,
+            "messages_total:channel": 1.0,
+        }
@@ -1,7 +1,7 @@
 """Tests for the collector subscriber."""
 
 import pytest
-from unittest.mock import MagicMock, call, patch
+from unittest.mock import MagicMock, patch
 
 from meshcore_hub.collector.observer_filter import ObserverFilter
 from meshcore_hub.collector.subscriber import Subscriber, create_subscriber
@@ -46,7 +46,7 @@ class TestSubscriber:
 
         mock_mqtt_client.connect.assert_called_once()
         mock_mqtt_client.start_background.assert_called_once()
-        assert mock_mqtt_client.subscribe.call_count == 3
+        mock_mqtt_client.subscribe_many.assert_called_once()
 
     def test_stop_disconnects_mqtt(self, subscriber, mock_mqtt_client):
         """Test that stop disconnects MQTT."""
@@ -323,13 +323,14 @@ class TestSubscriber:
 
         subscriber.start()
 
-        expected_calls = [
-            call("meshcore/+/+/packets", subscriber._handle_mqtt_message),
-            call("meshcore/+/+/status", subscriber._handle_mqtt_message),
-            call("meshcore/+/+/internal", subscriber._handle_mqtt_message),
-        ]
-        mock_mqtt_client.subscribe.assert_has_calls(expected_calls, any_order=False)
-        assert mock_mqtt_client.subscribe.call_count == 3
+        mock_mqtt_client.subscribe_many.assert_called_once_with(
+            [
+                "meshcore/+/+/packets",
+                "meshcore/+/+/status",
+                "meshcore/+/+/internal",
+            ],
+            subscriber._handle_mqtt_message,
+        )
 
     def test_blocked_observer_is_dropped_no_dispatch(
         self, mock_mqtt_client, db_manager
@@ -1240,9 +1241,7 @@ class TestSubscriberDispatch:
 
     def test_dispatch_event_with_no_handler_falls_back_to_event_log(self, subscriber):
         """Unregistered event types fall back to event_log handler."""
-        with patch(
-            "meshcore_hub.collector.handlers.event_log.handle_event_log"
-        ) as mock_log:
+        with patch("meshcore_hub.collector.subscriber.handle_event_log") as mock_log:
             subscriber._dispatch_event("a" * 64, "unknown_type", {"data": 1})
             mock_log.assert_called_once()
 
@@ -1258,7 +1257,7 @@ class TestSubscriberDispatch:
     def test_dispatch_event_event_log_exception_logged(self, subscriber):
         """Event log handler exceptions are caught and logged."""
         with patch(
-            "meshcore_hub.collector.handlers.event_log.handle_event_log",
+            "meshcore_hub.collector.subscriber.handle_event_log",
             side_effect=RuntimeError("log boom"),
         ):
             subscriber._dispatch_event("a" * 64, "unknown_type", {"data": 1})
@@ -1274,8 +1273,19 @@ class TestSubscriberDispatch:
 
         subscriber._dispatch_event("a" * 64, "test_event", {"data": 1})
 
-        assert len(subscriber._webhook_queue) == 1
-        assert subscriber._webhook_queue[0][0] == "test_event"
+        assert subscriber._webhook_queue.qsize() == 1
+        assert subscriber._webhook_queue.get_nowait()[0] == "test_event"
+
+    def test_webhook_queue_drops_oldest_when_full(self, subscriber, monkeypatch):
+        """A full webhook queue keeps the newest events."""
+        monkeypatch.setattr("meshcore_hub.collector.subscriber.WEBHOOK_QUEUE_MAX", 2)
+
+        for i in range(3):
+            subscriber._queue_webhook_event(f"event_{i}", {}, "a" * 64)
+
+        assert subscriber._webhook_queue.qsize() == 2
+        assert subscriber._webhook_queue.get_nowait()[0] == "event_1"
+        assert subscriber.get_health_status()["webhook_events_dropped"] == 1
 
     def test_dispatch_event_no_webhook_without_dispatcher(self, subscriber):
         """No webhook queued when dispatcher is not configured."""
@@ -1284,7 +1294,7 @@ class TestSubscriberDispatch:
 
         subscriber._dispatch_event("a" * 64, "test_event", {"data": 1})
 
-        assert len(subscriber._webhook_queue) == 0
+        assert subscriber._webhook_queue.empty()
 
     def test_start_with_mqtt_retry(self, mock_mqtt_client, db_manager):
         """MQTT connection is retried on failure."""
@@ -1335,6 +1345,8 @@ class TestSubscriberDispatch:
         assert status["mqtt_connected"] is False
         assert status["database_connected"] is False
         assert status["healthy"] is False
+        assert status["webhook_queue_depth"] == 0
+        assert status["webhook_events_dropped"] == 0
 
 
 class TestCreateSubscriber:
@@ -1494,14 +1506,14 @@ class TestChannelKeyRefresh:
             mock_mqtt_client, db_manager, channel_refresh_interval_seconds=300
         )
         subscriber._running = True
-        with patch("meshcore_hub.collector.subscriber.time.sleep"):
-            subscriber._start_channel_refresh_scheduler()
+        subscriber._start_channel_refresh_scheduler()
 
-            assert subscriber._channel_refresh_thread is not None
-            assert subscriber._channel_refresh_thread.daemon is True
+        assert subscriber._channel_refresh_thread is not None
+        assert subscriber._channel_refresh_thread.daemon is True
 
-            subscriber._running = False
-            subscriber._channel_refresh_thread.join(timeout=2.0)
+        subscriber._running = False
+        subscriber._shutdown_event.set()
+        subscriber._channel_refresh_thread.join(timeout=2.0)
 
     def test_channel_refresh_scheduler_disabled(self, mock_mqtt_client, db_manager):
         """Test channel refresh scheduler is disabled when interval is 0."""
@@ -1521,14 +1533,29 @@ class TestChannelKeyRefresh:
             mock_mqtt_client, db_manager, channel_refresh_interval_seconds=300
         )
         subscriber._running = True
-        with patch("meshcore_hub.collector.subscriber.time.sleep"):
-            subscriber._start_channel_refresh_scheduler()
-            subscriber._running = False
+        subscriber._start_channel_refresh_scheduler()
+        # Mirrors stop(): the scheduler wakes from its wait immediately.
+        subscriber._running = False
+        subscriber._shutdown_event.set()
 
-            subscriber._stop_channel_refresh_scheduler()
+        subscriber._stop_channel_refresh_scheduler()
         assert subscriber._channel_refresh_thread is not None
         assert not subscriber._channel_refresh_thread.is_alive()
 
+    def test_stop_wakes_waiting_scheduler(self, mock_mqtt_client, db_manager):
+        """stop() interrupts a scheduler's wait instead of letting it run out."""
+        import threading
+
+        subscriber = Subscriber(mock_mqtt_client, db_manager)
+        subscriber._running = True
+        waiter = threading.Thread(target=subscriber._wait_for_shutdown, args=(60,))
+        waiter.start()
+
+        subscriber.stop()
+        waiter.join(timeout=2.0)
+
+        assert not waiter.is_alive()
+
     def test_load_channel_keys_empty_db(self, mock_mqtt_client, db_manager):
         """Test loading channel keys from empty database."""
         subscriber = Subscriber(mock_mqtt_client, db_manager)
@@ -1585,10 +1612,8 @@ class TestSpamRescoreScheduler:
 
         cfg = SpamConfig(enabled=True, rescore_interval_seconds=1)
         monkeypatch.setattr(spam_mod, "get_spam_config", lambda: cfg)
-        # Avoid the real 1s-per-tick sleep in the inner loop.
-        monkeypatch.setattr(
-            "meshcore_hub.collector.subscriber.time.sleep", lambda *_: None
-        )
+        # Skip the real wait between sweeps.
+        monkeypatch.setattr(Subscriber, "_wait_for_shutdown", lambda self, s: None)
 
         sub = Subscriber(mock_mqtt_client, db_manager)
         called = threading.Event()
@@ -1617,9 +1642,7 @@ class TestSpamRescoreScheduler:
 
         cfg = SpamConfig(enabled=True, rescore_interval_seconds=1)
         monkeypatch.setattr(spam_mod, "get_spam_config", lambda: cfg)
-        monkeypatch.setattr(
-            "meshcore_hub.collector.subscriber.time.sleep", lambda *_: None
-        )
+        monkeypatch.setattr(Subscriber, "_wait_for_shutdown", lambda self, s: None)
 
         sub = Subscriber(mock_mqtt_client, db_manager)
         called = threading.Event()
@@ -1683,9 +1706,7 @@ class TestRouteEvaluatorScheduler:
             self.route_evaluator_interval_seconds = 1
 
         monkeypatch.setattr(CollectorSettings, "__init__", patched_init)
-        monkeypatch.setattr(
-            "meshcore_hub.collector.subscriber.time.sleep", lambda *_: None
-        )
+        monkeypatch.setattr(Subscriber, "_wait_for_shutdown", lambda self, s: None)
 
         sub = Subscriber(mock_mqtt_client, db_manager)
         called = threading.Event()
@@ -1721,9 +1742,7 @@ class TestRouteEvaluatorScheduler:
             self.route_evaluator_interval_seconds = 1
 
         monkeypatch.setattr(CollectorSettings, "__init__", patched_init)
-        monkeypatch.setattr(
-            "meshcore_hub.collector.subscriber.time.sleep", lambda *_: None
-        )
+        monkeypatch.setattr(Subscriber, "_wait_for_shutdown", lambda self, s: None)
 
         sub = Subscriber(mock_mqtt_client, db_manager)
         called = threading.Event()
@@ -1743,3 +1762,66 @@ class TestRouteEvaluatorScheduler:
         sub._stop_route_evaluator_scheduler()
         assert sub._route_evaluator_thread is not None
         assert not sub._route_evaluator_thread.is_alive()
+
+
+class TestMetricSnapshotScheduler:
+    """Tests for the background /metrics snapshot refresh scheduler."""
+
+    @pytest.fixture
+    def mock_mqtt_client(self):
+        client = MagicMock()
+        client.topic_builder = MagicMock()
+        client.topic_builder.prefix = "meshcore"
+        return client
+
+    @staticmethod
+    def _set_interval(monkeypatch, interval: int) -> None:
+        from meshcore_hub.common.config import CollectorSettings
+
+        real_init = CollectorSettings.__init__
+
+        def patched_init(self, *args, **kwargs):
+            real_init(self, *args, _env_file=None, **kwargs)
+            self.metric_snapshot_interval_seconds = interval
+
+        monkeypatch.setattr(CollectorSettings, "__init__", patched_init)
+
+    def test_disabled_does_not_start_thread(
+        self, mock_mqtt_client, db_manager, monkeypatch
+    ):
+        """With interval=0, no snapshot thread is created."""
+        self._set_interval(monkeypatch, 0)
+
+        sub = Subscriber(mock_mqtt_client, db_manager)
+        sub._start_metric_snapshot_scheduler()
+        assert sub._metric_snapshot_thread is None
+        sub._stop_metric_snapshot_scheduler()
+
+    def test_enabled_refreshes_and_stops(
+        self, mock_mqtt_client, db_manager, monkeypatch
+    ):
+        """Enabled scheduler spawns a thread, refreshes snapshots, joins on stop."""
+        import threading
+
+        self._set_interval(monkeypatch, 1)
+        monkeypatch.setattr(Subscriber, "_wait_for_shutdown", lambda self, s: None)
+
+        sub = Subscriber(mock_mqtt_client, db_manager)
+        called = threading.Event()
+
+        def fake_refresh(db):
+            called.set()
+            sub._running = False
+
+        monkeypatch.setattr(
+            "meshcore_hub.collector.metric_snapshots.run_snapshot_refresh",
+            fake_refresh,
+        )
+
+        sub._running = True
+        sub._start_metric_snapshot_scheduler()
+        assert called.wait(timeout=5.0)
+        sub._stop_metric_snapshot_scheduler()
+
+        assert sub._metric_snapshot_thread is not None
+        assert not sub._metric_snapshot_thread.is_alive()
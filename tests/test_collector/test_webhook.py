@@ -1,5 +1,6 @@
 """Tests for the webhook dispatcher module."""
 
+import asyncio
 from typing import Any
 from unittest.mock import AsyncMock, patch
 
@@ -7,6 +8,7 @@ import httpx
 import pytest
 
 from meshcore_hub.collector.webhook import (
+    WEBHOOK_MAX_CONCURRENCY,
     WebhookConfig,
     WebhookDispatcher,
     create_webhook_dispatcher_from_config,
@@ -395,6 +397,101 @@ class TestWebhookDispatcher:
 
         await dispatcher.stop()
 
+    @pytest.mark.asyncio
+    async def test_dispatch_batch(self, dispatcher):
+        """Batched events are all sent and results keep the input order."""
+        dispatcher.add_webhook(
+            WebhookConfig(
+                url="https://example.com/webhook",
+                name="ads-only",
+                event_types=["advertisement"],
+            )
+        )
+        await dispatcher.start()
+
+        mock_response = AsyncMock()
+        mock_response.status_code = 200
+
+        with patch.object(
+            dispatcher._client, "post", return_value=mock_response
+        ) as mock_post:
+            result = await dispatcher.dispatch_batch(
+                [
+                    ("advertisement", {"name": "Node1"}, "abc"),
+                    ("contact_msg_recv", {"text": "hi"}, "def"),
+                    ("advertisement", {"name": "Node2"}, None),
+                ]
+            )
+
+        assert result == [{"ads-only": True}, {}, {"ads-only": True}]
+        assert mock_post.call_count == 2
+
+        await dispatcher.stop()
+
+    @pytest.mark.asyncio
+    async def test_dispatch_batch_bounds_concurrent_posts(self, dispatcher):
+        """No more than WEBHOOK_MAX_CONCURRENCY posts are in flight at once."""
+        dispatcher.add_webhook(WebhookConfig(url="https://example.com", name="w"))
+        await dispatcher.start()
+
+        in_flight = 0
+        peak = 0
+
+        async def slow_post(*args, **kwargs):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0)
+            in_flight -= 1
+            response = AsyncMock()
+            response.status_code = 200
+            return response
+
+        with patch.object(dispatcher._client, "post", side_effect=slow_post):
+            result = await dispatcher.dispatch_batch(
+                [("event", {}, None)] * (WEBHOOK_MAX_CONCURRENCY * 2)
+            )
+
+        assert all(r == {"w": True} for r in result)
+        assert peak == WEBHOOK_MAX_CONCURRENCY
+
+        await dispatcher.stop()
+
+    def test_restart_under_new_event_loop(self, dispatcher):
+        """A dispatcher restarted under a new asyncio.run() still sends."""
+        dispatcher.add_webhook(
+            WebhookConfig(url="https://example.com", name="w", max_retries=0)
+        )
+
+        async def slow_post(*args, **kwargs):
+            await asyncio.sleep(0)
+            response = AsyncMock()
+            response.status_code = 200
+            return response
+
+        async def run_once():
+            await dispatcher.start()
+            try:
+                with patch.object(dispatcher._client, "post", side_effect=slow_post):
+                    # Enough events to contend for the semaphore, which binds
+                    # it to the running loop.
+                    return await dispatcher.dispatch_batch(
+                        [("event", {}, None)] * (WEBHOOK_MAX_CONCURRENCY * 2)
+                    )
+            finally:
+                await dispatcher.stop()
+
+        for _ in range(2):
+            result = asyncio.run(run_once())
+            assert all(r == {"w": True} for r in result)
+
+    @pytest.mark.asyncio
+    async def test_dispatch_batch_not_running(self, dispatcher):
+        """A stopped dispatcher returns an empty result per event."""
+        dispatcher.add_webhook(WebhookConfig(url="https://example.com", name="w"))
+        result = await dispatcher.dispatch_batch([("event", {}, None)] * 2)
+        assert result == [{}, {}]
+
 
 class TestWebhookDispatcherFactory:
     """Tests for create_webhook_dispatcher_from_config."""
@@ -33,6 +33,21 @@ class TestSqlitePragmas:
         finally:
             engine.dispose()
 
+    def test_read_tuning_pragmas_enabled(self, tmp_path: Path) -> None:
+        """Temp B-trees stay in memory and reads use mmap plus a larger cache."""
+        engine = create_database_engine(f"sqlite:///{tmp_path / 'tuning.db'}")
+        try:
+            with engine.connect() as conn:
+                temp_store = conn.execute(text("PRAGMA temp_store")).scalar()
+                mmap_size = conn.execute(text("PRAGMA mmap_size")).scalar()
+                cache_size = conn.execute(text("PRAGMA cache_size")).scalar()
+
+            assert temp_store == 2  # MEMORY
+            assert mmap_size is not None and int(mmap_size) > 0
+            assert cache_size == -16384
+        finally:
+            engine.dispose()
+
     def test_in_memory_engine_builds(self) -> None:
         """In-memory SQLite must still build (no overflow-pool kwargs)."""
         engine = create_database_engine("sqlite:///:memory:")
@@ -3,6 +3,7 @@
 from datetime import datetime, timezone
 
 from meshcore_hub.common.hash_utils import (
+    _advertisement_hash,
     compute_advertisement_hash,
     compute_message_hash,
     compute_telemetry_hash,
@@ -184,6 +185,22 @@ class TestComputeAdvertisementHash:
         )
         assert hash1_10min == hash2_10min
 
+    def test_repeated_adverts_in_bucket_hit_cache(self) -> None:
+        """A re-flooded advert in the same bucket reuses the cached digest."""
+        time1 = datetime(2024, 1, 15, 10, 31, 0, tzinfo=timezone.utc)
+        time2 = datetime(2024, 1, 15, 10, 33, 0, tzinfo=timezone.utc)
+
+        hash1 = compute_advertisement_hash(
+            public_key="c" * 64, name="Cached", received_at=time1
+        )
+        hits = _advertisement_hash.cache_info().hits
+        hash2 = compute_advertisement_hash(
+            public_key="c" * 64, name="Cached", received_at=time2
+        )
+
+        assert hash1 == hash2
+        assert _advertisement_hash.cache_info().hits == hits + 1
+
 
 class TestComputeTraceHash:
     """Tests for compute_trace_hash function."""
@@ -265,6 +282,23 @@ class TestComputeTelemetryHash:
 
         assert hash1 == hash2
 
+    def test_nested_dict_serialization_is_deterministic(self) -> None:
+        """Nested readings should hash the same regardless of key order."""
+        time = datetime(2024, 1, 15, 10, 30, 0, tzinfo=timezone.utc)
+
+        hash1 = compute_telemetry_hash(
+            node_public_key="a" * 64,
+            parsed_data={"gps": {"lat": 51.5, "lon": -0.1}, "temp": 22.5},
+            received_at=time,
+        )
+        hash2 = compute_telemetry_hash(
+            node_public_key="a" * 64,
+            parsed_data={"temp": 22.5, "gps": {"lon": -0.1, "lat": 51.5}},
+            received_at=time,
+        )
+
+        assert hash1 == hash2
+
     def test_default_bucket_is_300s(self) -> None:
         """Default bucket_seconds should be 300 (5 minutes)."""
         time1 = datetime(2024, 1, 15, 10, 31, 0, tzinfo=timezone.utc)
@@ -1,5 +1,7 @@
 """Tests for database models."""
 
+from datetime import datetime, timedelta, timezone
+
 import pytest
 from sqlalchemy import create_engine, select
 from sqlalchemy.orm import sessionmaker
@@ -16,6 +18,8 @@ from meshcore_hub.common.models import (
     EventObserver,
     RawPacket,
     add_event_observer,
+    insert_event,
+    touch_node,
 )
 
 
@@ -67,6 +71,21 @@ class TestNodeModel:
         assert len(node.tags) == 1
         assert node.tags[0].key == "altitude"
 
+    def test_touch_node_creates_then_refreshes(self, db_session) -> None:
+        """touch_node inserts once, then only moves last_seen forward."""
+        first = datetime(2026, 1, 1, tzinfo=timezone.utc)
+        later = first + timedelta(hours=1)
+
+        node_id = touch_node(db_session, "C" * 64, first)
+        assert touch_node(db_session, "c" * 64, later) == node_id
+        db_session.commit()
+
+        node = db_session.execute(select(Node)).scalar_one()
+        assert node.id == node_id
+        assert node.public_key == "c" * 64
+        assert node.first_seen.replace(tzinfo=timezone.utc) == first
+        assert node.last_seen.replace(tzinfo=timezone.utc) == later
+
 
 class TestRawPacketModel:
     """Tests for RawPacket model."""
@@ -117,6 +136,7 @@ class TestRawPacketModel:
         index_names = {idx.name for idx in RawPacket.__table__.indexes}  # type: ignore[attr-defined]
         for expected in (
             "ix_raw_packets_received_at",
+            "ix_raw_packets_created_at",
             "ix_raw_packets_event_type",
             "ix_raw_packets_packet_hash",
             "ix_raw_packets_channel_idx",
@@ -340,3 +360,27 @@ class TestEventObserverModel:
 
         db_session.refresh(node)
         assert node.is_observer is True
+
+    def test_insert_event_skips_duplicate_hash(self, db_session) -> None:
+        """insert_event inserts once per event_hash and reports duplicates."""
+        values = {
+            "message_type": "channel",
+            "channel_idx": 0,
+            "text": "hello",
+            "event_hash": "a" * 32,
+        }
+
+        assert insert_event(db_session, Message, values) is True
+        assert insert_event(db_session, Message, {**values, "text": "x"}) is False
+        db_session.commit()
+
+        rows = db_session.execute(select(Message)).scalars().all()
+        assert len(rows) == 1
+        assert rows[0].text == "hello"
+
+    def test_insert_event_allows_null_hashes(self, db_session) -> None:
+        """Rows without an event_hash are never treated as duplicates."""
+        values = {"message_type": "channel", "text": "hi", "event_hash": None}
+
+        assert insert_event(db_session, Message, values) is True
+        assert insert_event(db_session, Message, values) is True
@@ -1,6 +1,10 @@
 """Tests for MQTT topic parsing utilities."""
 
-from meshcore_hub.common.mqtt import TopicBuilder
+from types import SimpleNamespace
+from typing import Any
+from unittest.mock import MagicMock
+
+from meshcore_hub.common.mqtt import MQTTClient, MQTTConfig, TopicBuilder
 
 
 class TestTopicBuilder:
@@ -55,3 +59,120 @@ class TestTopicBuilder:
         )
 
         assert parsed is None
+
+    def test_parsed_topics_are_cached_per_prefix(self) -> None:
+        """Repeated topics hit the parse cache; the prefix is part of the key."""
+        from meshcore_hub.common.mqtt import _parse_letsmesh_upload_topic
+
+        topic = "meshcore/STN/ABCDEF1234567890/packets"
+        builder = TopicBuilder(prefix="meshcore")
+        builder.parse_letsmesh_upload_topic(topic)
+        hits = _parse_letsmesh_upload_topic.cache_info().hits
+
+        assert builder.parse_letsmesh_upload_topic(topic) == (
+            "abcdef1234567890",
+            "packets",
+        )
+        assert _parse_letsmesh_upload_topic.cache_info().hits == hits + 1
+        assert TopicBuilder(prefix="other").parse_letsmesh_upload_topic(topic) is None
+
+
+class TestOnMessage:
+    """Tests for MQTTClient._on_message payload parsing."""
+
+    def _dispatch(self, payload: bytes) -> list[dict[str, Any]]:
+        client = MQTTClient(MQTTConfig())
+        received: list[dict[str, Any]] = []
+        client.subscribe(
+            "meshcore/#", lambda topic, pattern, data: received.append(data)
+        )
+        message = SimpleNamespace(topic="meshcore/abc/event/trace", payload=payload)
+        client._on_message(client._client, None, message)  # type: ignore[arg-type]
+        return received
+
+    def test_json_bytes_are_parsed(self) -> None:
+        """Raw UTF-8 payload bytes are parsed without a separate decode."""
+        assert self._dispatch('{"text": "héllo"}'.encode()) == [{"text": "héllo"}]
+
+    def test_invalid_payload_is_dropped(self) -> None:
+        """Malformed JSON and invalid UTF-8 never reach handlers."""
+        assert self._dispatch(b"{not json") == []
+        assert self._dispatch(b'{"text": "\xff"}') == []
+
+
+class TestDispatchTable:
+    """Tests for MQTTClient's cached topic -> handler lookup."""
+
+    def _message(self, topic: str) -> SimpleNamespace:
+        return SimpleNamespace(topic=topic, payload=b"{}")
+
+    def test_handlers_resolved_once_per_topic(self) -> None:
+        """Pattern matching runs once per topic, not once per message."""
+        client = MQTTClient(MQTTConfig())
+        calls: list[str] = []
+        client.subscribe("meshcore/+/+/packets", lambda t, p, d: calls.append(p))
+        client.subscribe("other/#", lambda t, p, d: calls.append(p))
+
+        matches: list[tuple[str, str]] = []
+        original = client._topic_matches
+
+        def counting(pattern: str, topic: str) -> bool:
+            matches.append((pattern, topic))
+            return original(pattern, topic)
+
+        client._topic_matches = counting  # type: ignore[method-assign]
+        message = self._message("meshcore/STN/abc/packets")
+        for _ in range(3):
+            client._on_message(client._client, None, message)  # type: ignore[arg-type]
+
+        assert calls == ["meshcore/+/+/packets"] * 3
+        assert len(matches) == 2
+
+    def test_subscribe_invalidates_cached_lookup(self) -> None:
+        """A later subscription is seen by topics already dispatched."""
+        client = MQTTClient(MQTTConfig())
+        calls: list[str] = []
+        client.subscribe("meshcore/#", lambda t, p, d: calls.append("first"))
+        message = self._message("meshcore/STN/abc/status")
+        client._on_message(client._client, None, message)  # type: ignore[arg-type]
+
+        client.subscribe("meshcore/+/+/status", lambda t, p, d: calls.append("second"))
+        client._on_message(client._client, None, message)  # type: ignore[arg-type]
+        client.unsubscribe("meshcore/#")
+        client._on_message(client._client, None, message)  # type: ignore[arg-type]
+
+        assert calls == ["first", "first", "second", "second"]
+
+
+class TestSubscribeMany:
+    """Tests for batched MQTT subscriptions."""
+
+    def test_new_topics_sent_in_one_subscribe(self) -> None:
+        """Only topics not yet subscribed go out, in a single SUBSCRIBE."""
+        client = MQTTClient(MQTTConfig())
+        client._client = MagicMock()
+        client._connected = True
+        client.subscribe("meshcore/+/+/packets", lambda t, p, d: None)
+        client._client.subscribe.reset_mock()
+
+        client.subscribe_many(
+            ["meshcore/+/+/packets", "meshcore/+/+/status", "meshcore/+/+/internal"],
+            lambda t, p, d: None,
+        )
+
+        client._client.subscribe.assert_called_once_with(
+            [("meshcore/+/+/status", 1), ("meshcore/+/+/internal", 1)]
+        )
+
+    def test_reconnect_resubscribes_with_original_qos(self) -> None:
+        """On reconnect every topic is resubscribed at once with its QoS."""
+        client = MQTTClient(MQTTConfig())
+        client._client = MagicMock()
+        client.subscribe_many(["a/#", "b/#"], lambda t, p, d: None)
+        client.subscribe("c/#", lambda t, p, d: None, qos=0)
+        client.unsubscribe("b/#")
+        client._client.subscribe.assert_not_called()
+
+        client._on_connect(client._client, None, None, 0)
+
+        client._client.subscribe.assert_called_once_with([("a/#", 1), ("c/#", 0)])